@@ -1,9 +1,49 @@
+"""Fabgame: a two-player Flesh and Blood style card game engine.
+
+Only the pure engine (models, engine, action enumeration/execution) is imported
+eagerly. Deck helpers, the UI loop and the ``agents``/``rl``/``ui`` sub-packages
+are resolved on first attribute access, so worker processes that only simulate
+games do not pay for the UI, agent or RL/YAML stack.
+"""
 from __future__ import annotations
 
+import importlib
+from typing import Any, Dict, List
+
 from . import config
-from .deck import discover_deck_files, load_deck_from_json, prompt_pick_deck
-from .engine import apply_action, current_actor_index, enumerate_legal_actions, new_game
-from .ui import play_loop
+from .engine import (
+    apply_action,
+    apply_action_inplace,
+    current_actor_index,
+    enumerate_legal_actions,
+    new_game,
+    undo_action,
+)
+
+# Public name -> module that defines it, imported on first access.
+_LAZY_ATTRIBUTES: Dict[str, str] = {
+    "discover_deck_files": ".deck",
+    "load_deck_from_json": ".deck",
+    "prompt_pick_deck": ".deck",
+    "play_loop": ".ui",
+}
+_LAZY_SUBMODULES = ("agents", "rl", "ui")
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | set(_LAZY_SUBMODULES))
+
 
 __all__ = [
     "config",
@@ -11,9 +51,10 @@ __all__ = [
     "load_deck_from_json",
     "prompt_pick_deck",
     "apply_action",
+    "apply_action_inplace",
+    "undo_action",
     "current_actor_index",
     "enumerate_legal_actions",
     "new_game",
     "play_loop",
 ]
-
@@ -1,17 +1,148 @@
 """Action execution module - applies actions to game state.
 
 This module contains the ActionExecutor class which takes a game state and an action,
-validates it, and returns a new game state with the action applied.
+validates it, and returns a new game state with the action applied. The executor can
+optionally journal everything it touches into an UndoRecord so that in-place search
+code can roll the state back without copying it.
 """
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
 
 from .config import DEFEND_MAX, INTELLECT
-from .models import Action, ActType, CombatStep, GameState, Phase, PlayerState
+from .models import Action, ActType, Card, CombatStep, GameState, Phase, PlayerState
 from .rules.abilities import apply_on_declare_attack_modifiers
 
 
+ZONE_NAMES: Tuple[str, ...] = ("deck", "hand", "grave", "pitched", "arsenal")
+
+
+class StateChanges(NamedTuple):
+    """Parts of a game state an in-place action changed.
+
+    Attributes:
+        zones: (player index, zone name) of every zone the action mutated
+        players: Indices of players whose life, attack count or weapon state changed
+        fields: Names of the GameState attributes whose value changed
+    """
+
+    zones: FrozenSet[Tuple[int, str]]
+    players: FrozenSet[int]
+    fields: FrozenSet[str]
+
+
+class UndoRecord:
+    """Journal of the state an in-place action touched.
+
+    Scalar fields of the game state and of both players are captured eagerly
+    (they are cheap to snapshot), while card zones are saved lazily the first
+    time the executor mutates them.
+
+    Attributes:
+        state_fields: Shallow snapshot of the GameState attributes
+        floating_resources: Contents of the floating resource pool
+        reaction_arsenal_cards: Contents of the reaction arsenal card list
+        players: Per-player (life, attacks_this_turn, weapon.used_this_turn)
+        zones: (zone list, saved contents) pairs for every mutated zone
+    """
+
+    __slots__ = ("state_fields", "floating_resources", "reaction_arsenal_cards", "players", "zones")
+
+    def __init__(self, state: GameState) -> None:
+        """Capture the scalar parts of the state before an action is applied.
+
+        Args:
+            state: Game state about to be mutated
+        """
+        self.state_fields: Dict[str, Any] = dict(vars(state))
+        self.floating_resources: List[int] = list(state.floating_resources)
+        self.reaction_arsenal_cards: List[str] = list(state.reaction_arsenal_cards)
+        self.players: List[Tuple[int, int, Optional[bool]]] = [
+            (player.life, player.attacks_this_turn, player.weapon.used_this_turn if player.weapon else None)
+            for player in state.players
+        ]
+        self.zones: List[Tuple[List[Card], List[Card]]] = []
+
+    def save_zone(self, zone: List[Card]) -> None:
+        """Remember the contents of a zone before its first mutation.
+
+        Args:
+            zone: Card list about to be mutated in place
+        """
+        for saved, _ in self.zones:
+            if saved is zone:
+                return
+        self.zones.append((zone, list(zone)))
+
+    def changes(self, state: GameState) -> StateChanges:
+        """Describe how ``state`` differs from the moment this record was created.
+
+        Zones are reported when they were mutated, even if their final contents
+        happen to be equal to the saved ones.
+
+        Args:
+            state: The same game state object the record was taken from
+
+        Returns:
+            The zones, players and state attributes that changed
+        """
+        zones: FrozenSet[Tuple[int, str]] = frozenset()
+        if self.zones:
+            saved = {id(zone) for zone, _ in self.zones}
+            zones = frozenset(
+                (idx, name)
+                for idx, player in enumerate(state.players)
+                for name in ZONE_NAMES
+                if id(getattr(player, name)) in saved
+            )
+        players = frozenset(
+            idx
+            for idx, (player, before) in enumerate(zip(state.players, self.players))
+            if (player.life, player.attacks_this_turn, player.weapon.used_this_turn if player.weapon else None)
+            != before
+        )
+        fields = set()
+        for name, value in vars(state).items():
+            before = self.state_fields.get(name)
+            if name != "players" and value is not before and value != before:
+                fields.add(name)
+        # These lists are mutated in place, so compare them with the copies taken up front.
+        for name, before in (
+            ("floating_resources", self.floating_resources),
+            ("reaction_arsenal_cards", self.reaction_arsenal_cards),
+        ):
+            if getattr(state, name) != before:
+                fields.add(name)
+            else:
+                fields.discard(name)
+        return StateChanges(zones, players, frozenset(fields))
+
+    def restore(self, state: GameState) -> None:
+        """Roll the state back to the moment this record was created.
+
+        Args:
+            state: The same game state object the record was taken from
+        """
+        for zone, contents in reversed(self.zones):
+            zone[:] = contents
+        for player, (life, attacks, weapon_used) in zip(state.players, self.players):
+            player.life = life
+            player.attacks_this_turn = attacks
+            if player.weapon is not None and weapon_used is not None:
+                player.weapon.used_this_turn = weapon_used
+        vars(state).update(self.state_fields)
+        state.floating_resources[:] = self.floating_resources
+        state.reaction_arsenal_cards[:] = self.reaction_arsenal_cards
+
+
+def _save_zones(undo: Optional[UndoRecord], *zones: List[Card]) -> None:
+    """Journal zones into an undo record when one is being kept."""
+    if undo is None:
+        return
+    for zone in zones:
+        undo.save_zone(zone)
+
+
 def _begin_arsenal_step(state: GameState) -> bool:
     """Begin the arsenal setting phase if conditions are met.
 
@@ -44,7 +175,13 @@ def _clear_arsenal_step(state: GameState) -> None:
     state.phase = Phase.ACTION
 
 
-def _consume_resources(state: GameState, player: PlayerState, pitch_indices: List[int], cost: int) -> int:
+def _consume_resources(
+    state: GameState,
+    player: PlayerState,
+    pitch_indices: List[int],
+    cost: int,
+    undo: Optional[UndoRecord] = None,
+) -> int:
     """Consume resources by pitching cards and using floating resources.
 
     Args:
@@ -52,6 +189,7 @@ def _consume_resources(state: GameState, player: PlayerState, pitch_indices: Lis
         player: Player consuming resources
         pitch_indices: Indices of cards to pitch from hand
         cost: Total cost to pay
+        undo: Optional undo record journaling touched zones
 
     Returns:
         Total pitch value of cards pitched
@@ -73,6 +211,8 @@ def _consume_resources(state: GameState, player: PlayerState, pitch_indices: Lis
     if remaining_cost > 0 and pitch_sum < remaining_cost:
         raise ValueError("Pitch insufficient for cost")
 
+    if indices_sorted:
+        _save_zones(undo, player.hand, player.pitched)
     for idx in indices_sorted:
         player.pitched.append(player.hand.pop(idx))
 
@@ -82,17 +222,19 @@ def _consume_resources(state: GameState, player: PlayerState, pitch_indices: Lis
     return pitch_sum
 
 
-def _end_and_pass_turn(state: GameState) -> GameState:
+def _end_and_pass_turn(state: GameState, undo: Optional[UndoRecord] = None) -> GameState:
     """End the current player's turn and pass to the opponent.
 
     Args:
         state: Current game state
+        undo: Optional undo record journaling touched zones
 
     Returns:
         Updated game state with turn passed
     """
     current = state.turn
     turn_player = state.players[current]
+    _save_zones(undo, turn_player.pitched, turn_player.deck, turn_player.hand)
     turn_player.bottom_pitched_to_deck()
     turn_player.draw_up_to(INTELLECT)
     turn_player.attacks_this_turn = 0
@@ -140,19 +282,22 @@ class ActionExecutor:
     Attributes:
         state: The current game state
         action: The action to execute
+        undo: Optional undo record journaling every mutation
         turn_player: The player whose turn it is
         defending_player: The defending player
     """
 
-    def __init__(self, state: GameState, action: Action) -> None:
+    def __init__(self, state: GameState, action: Action, undo: Optional[UndoRecord] = None) -> None:
         """Initialize the action executor.
 
         Args:
             state: Current game state
             action: Action to execute
+            undo: Optional undo record; when given, touched zones are journaled
         """
         self.state = state
         self.action = action
+        self.undo = undo
         self.turn_player = state.players[state.turn]
         self.defending_player = state.players[1 - state.turn]
 
@@ -202,17 +347,18 @@ class ActionExecutor:
         if act.typ == ActType.SET_ARSENAL and act.play_idx is not None:
             if not (0 <= act.play_idx < len(arsenal_player.hand)):
                 raise ValueError("Arsenal set index out of range")
+            _save_zones(self.undo, arsenal_player.hand, arsenal_player.arsenal)
             card = arsenal_player.hand.pop(act.play_idx)
             arsenal_player.arsenal.append(card)
             events = {"type": "set_arsenal", "player": player_index, "card": card.name}
             _clear_arsenal_step(self.state)
-            self.state = _end_and_pass_turn(self.state)
+            self.state = _end_and_pass_turn(self.state, self.undo)
             return self._result(events)
 
         if act.typ == ActType.PASS:
             events = {"type": "skip_arsenal", "player": player_index}
             _clear_arsenal_step(self.state)
-            self.state = _end_and_pass_turn(self.state)
+            self.state = _end_and_pass_turn(self.state, self.undo)
             return self._result(events)
 
         raise ValueError("Invalid action while awaiting arsenal")
@@ -322,6 +468,7 @@ class ActionExecutor:
         else:
             arsenal_card = None
 
+        _save_zones(self.undo, defending_player.hand, defending_player.arsenal, defending_player.grave)
         played_cards: List[str] = []
         added_block = 0
         for idx in sorted(defend_indices, reverse=True):
@@ -384,7 +531,8 @@ class ActionExecutor:
             if not reaction_card.is_attack_reaction():
                 raise ValueError("Card is not an attack reaction")
             offset = sum(1 for i in pitch_indices if i < reaction_idx)
-            pitch_sum = _consume_resources(self.state, self.turn_player, pitch_indices, reaction_card.cost)
+            pitch_sum = _consume_resources(self.state, self.turn_player, pitch_indices, reaction_card.cost, self.undo)
+            _save_zones(self.undo, self.turn_player.hand, self.turn_player.grave)
             card = self.turn_player.hand.pop(reaction_idx - offset)
         else:
             arsenal_idx = -act.play_idx - 1
@@ -393,7 +541,8 @@ class ActionExecutor:
             reaction_card = self.turn_player.arsenal[arsenal_idx]
             if not reaction_card.is_attack_reaction():
                 raise ValueError("Card is not an attack reaction")
-            pitch_sum = _consume_resources(self.state, self.turn_player, pitch_indices, reaction_card.cost)
+            pitch_sum = _consume_resources(self.state, self.turn_player, pitch_indices, reaction_card.cost, self.undo)
+            _save_zones(self.undo, self.turn_player.arsenal, self.turn_player.grave)
             card = self.turn_player.arsenal.pop(arsenal_idx)
             source = "arsenal"
 
@@ -495,6 +644,7 @@ class ActionExecutor:
                 raise ValueError("No cards selected to defend")
             if len(defend_indices) > DEFEND_MAX:
                 raise ValueError(f"At most {DEFEND_MAX} cards to defend")
+            _save_zones(self.undo, self.defending_player.hand, self.defending_player.grave)
             block_cards: List[str] = []
             total_block = 0
             for idx in sorted(defend_indices, reverse=True):
@@ -551,7 +701,7 @@ class ActionExecutor:
         if act.typ == ActType.PASS:
             if _begin_arsenal_step(self.state):
                 return self._result({"type": "end_phase_prompt"})
-            self.state = _end_and_pass_turn(self.state)
+            self.state = _end_and_pass_turn(self.state, self.undo)
             return self._result({"type": "pass_action"})
         if act.typ == ActType.WEAPON_ATTACK:
             return self._handle_weapon_attack()
@@ -578,7 +728,7 @@ class ActionExecutor:
         if self.state.action_points <= 0:
             raise ValueError("No action points remaining")
         pitch_indices = [i for i in range(len(self.turn_player.hand)) if (self.action.pitch_mask >> i) & 1]
-        pitch_sum = _consume_resources(self.state, self.turn_player, pitch_indices, weapon.cost)
+        pitch_sum = _consume_resources(self.state, self.turn_player, pitch_indices, weapon.cost, self.undo)
         weapon.used_this_turn = True
         self.state.action_points -= 1
         self.state.last_pitch_sum = pitch_sum
@@ -619,10 +769,11 @@ class ActionExecutor:
             raise ValueError("No action points remaining")
         pitch_indices = [i for i in range(len(self.turn_player.hand)) if (act.pitch_mask >> i) & 1]
         offset = sum(1 for i in pitch_indices if i < act.play_idx)
-        pitch_sum = _consume_resources(self.state, self.turn_player, pitch_indices, attack_card.cost)
+        pitch_sum = _consume_resources(self.state, self.turn_player, pitch_indices, attack_card.cost, self.undo)
         adjusted_idx = act.play_idx - offset
         if not (0 <= adjusted_idx < len(self.turn_player.hand)):
             raise ValueError("Adjusted play_idx out of range after resource consumption")
+        _save_zones(self.undo, self.turn_player.hand, self.turn_player.grave)
         card = self.turn_player.hand.pop(adjusted_idx)
         self.turn_player.grave.append(card)
         self.state.action_points -= 1
@@ -663,7 +814,8 @@ class ActionExecutor:
         if self.state.action_points <= 0:
             raise ValueError("No action points remaining")
         pitch_indices = [i for i in range(len(self.turn_player.hand)) if (act.pitch_mask >> i) & 1]
-        pitch_sum = _consume_resources(self.state, self.turn_player, pitch_indices, attack_card.cost)
+        pitch_sum = _consume_resources(self.state, self.turn_player, pitch_indices, attack_card.cost, self.undo)
+        _save_zones(self.undo, self.turn_player.arsenal, self.turn_player.grave)
         card = self.turn_player.arsenal.pop(act.play_idx)
         self.turn_player.grave.append(card)
         self.state.action_points -= 1
@@ -5,6 +5,8 @@ This package provides different agent types that can play the game:
 - HumanAgent: Agent that prompts human players via CLI
 - HeuristicAgent: Rule-based bot using simple heuristics
 - MLAgent: Agent using trained ML policies (PyTorch or SB3)
+- ISMCTSAgent: Information-set Monte Carlo tree search over the engine API
+- ParallelISMCTSAgent: Root-parallel ISMCTS across a process pool
 
 All agents implement the Agent protocol and can be used interchangeably.
 
@@ -12,21 +14,42 @@ For backward compatibility, legacy functions are also exported:
 - bot_choose_action: Heuristic bot decision function
 - current_human_action: Human CLI prompt function
 - HumanActionPrompter: Human prompt class
+
+MLAgent, the search agents and the legacy functions are imported on first access.
 """
 from __future__ import annotations
 
+import importlib
+from typing import Any, Dict, List
+
 from .base import Agent
 from .heuristic import HeuristicAgent
 from .human import HumanAgent
-from .ml import MLAgent
 
-# Import legacy functions for backward compatibility
-from ..legacy_agents import (
-    HumanActionPrompter,
-    bot_choose_action,
-    current_human_action,
-    render_hand,
-)
+# Public name -> module that defines it, imported on first access.
+_LAZY_ATTRIBUTES: Dict[str, str] = {
+    "MLAgent": ".ml",
+    "ISMCTSAgent": ".ismcts",
+    "ParallelISMCTSAgent": ".parallel_ismcts",
+    # Legacy functions kept for backward compatibility
+    "HumanActionPrompter": "..legacy_agents",
+    "bot_choose_action": "..legacy_agents",
+    "current_human_action": "..legacy_agents",
+    "render_hand": "..legacy_agents",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
 
 __all__ = [
     # New agent classes
@@ -34,6 +57,8 @@ __all__ = [
     "HumanAgent",
     "HeuristicAgent",
     "MLAgent",
+    "ISMCTSAgent",
+    "ParallelISMCTSAgent",
     # Legacy compatibility
     "bot_choose_action",
     "current_human_action",
@@ -0,0 +1,343 @@
+"""Information-set Monte Carlo tree search agent.
+
+``ISMCTSAgent`` runs single-observer ISMCTS: every iteration samples a
+determinization of the hidden information (the opponent's hand and the order of
+both decks), walks one shared tree restricted to the actions legal in that
+determinization, and finishes with a rollout. Rollouts mutate a private clone
+through ``apply_action_inplace``, so a step costs no state copy.
+
+The rollout policy is pluggable: uniform random, ``HeuristicAgent``, or any
+``Agent`` (e.g. an ``MLAgent`` wrapping a trained network or an
+``InferenceServer``). Rollouts stop after ``rollout_depth`` actions and are
+then scored by the life totals.
+
+With a ``TranspositionTable``, leaf values are shared by every path and every
+determinization that reaches the same information set of the searching player
+(see ``fabgame.state_hash.view_hasher``). A leaf whose information set already
+has ``tt_min_visits`` stored evaluations reuses their mean instead of running
+another rollout.
+"""
+from __future__ import annotations
+
+import math
+import random
+import time
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from ..config import STARTING_LIFE
+from ..engine import apply_action, apply_action_inplace, current_actor_index, enumerate_legal_actions
+from ..exceptions import AgentError
+from ..models import Action, GameState
+from ..state_hash import StateHasher, TranspositionTable, view_hasher
+from .base import Agent
+
+RolloutPolicy = Union[str, Agent]
+
+
+class _Node:
+    """Tree node reached by ``action``; statistics are from ``player``'s point of view."""
+
+    __slots__ = ("action", "player", "parent", "children", "visits", "reward", "availability")
+
+    def __init__(self, action: Optional[Action] = None, player: int = -1, parent: Optional["_Node"] = None) -> None:
+        self.action = action
+        self.player = player
+        self.parent = parent
+        self.children: Dict[Action, _Node] = {}
+        self.visits = 0
+        self.reward = 0.0
+        self.availability = 0
+
+    def select(self, legal: Sequence[Action], exploration: float) -> "_Node":
+        best: Optional[_Node] = None
+        best_score = -math.inf
+        for action in legal:
+            child = self.children[action]
+            child.availability += 1
+            score = child.reward / child.visits + exploration * math.sqrt(
+                math.log(child.availability) / child.visits
+            )
+            if score > best_score:
+                best, best_score = child, score
+        assert best is not None
+        return best
+
+
+def determinize(state: GameState, observer: int, rng: random.Random) -> GameState:
+    """Sample a state consistent with what ``observer`` can see.
+
+    The cards ``observer`` cannot see are their own deck and the opponent's hand
+    and deck. Given the known deck lists, the opponent's unseen multiset is
+    exactly their hand plus deck, so those cards are pooled and re-dealt at the
+    original sizes; both decks are reshuffled.
+
+    Args:
+        state: True game state
+        observer: Index of the player whose information set is sampled
+        rng: Random generator
+
+    Returns:
+        A clone of ``state`` with the hidden zones resampled
+    """
+    sample = state.clone()
+    own = sample.players[observer]
+    rng.shuffle(own.deck)
+    opponent = sample.players[1 - observer]
+    unseen = opponent.hand + opponent.deck
+    rng.shuffle(unseen)
+    hand_size = len(opponent.hand)
+    opponent.hand = unseen[:hand_size]
+    opponent.deck = unseen[hand_size:]
+    return sample
+
+
+def _life_score(state: GameState, player: int) -> float:
+    """Score ``state`` for ``player`` in [0, 1]: 1 for a win, 0 for a loss."""
+    own = state.players[player].life
+    other = state.players[1 - player].life
+    if own <= 0 or other <= 0:
+        if own == other or (own <= 0 and other <= 0):
+            return 0.5
+        return 1.0 if other <= 0 else 0.0
+    return min(1.0, max(0.0, 0.5 + (own - other) / (2.0 * STARTING_LIFE)))
+
+
+class ISMCTSAgent:
+    """Search-based agent using single-observer information-set MCTS.
+
+    Attributes:
+        name: Display name of the agent
+        iterations: Maximum iterations per decision (None = limited by time only)
+        time_limit: Maximum seconds per decision (None = limited by iterations only)
+        exploration: UCB exploration constant
+        rollout_depth: Actions simulated after the tree before scoring by life totals
+        reuse_tree: Whether to keep the subtree of the chosen action for the next decision
+        transposition_table: Optional table of leaf values shared between transpositions
+        tt_min_visits: Stored evaluations needed before a leaf skips its rollout
+        last_iterations: Iterations run for the most recent search
+        last_reused: Whether the most recent search started from a kept subtree
+    """
+
+    def __init__(
+        self,
+        name: str = "ISMCTS Agent",
+        *,
+        iterations: Optional[int] = 500,
+        time_limit: Optional[float] = None,
+        exploration: float = 0.7,
+        rollout_policy: RolloutPolicy = "random",
+        rollout_depth: int = 40,
+        reuse_tree: bool = True,
+        transposition_table: Optional[TranspositionTable] = None,
+        tt_min_visits: int = 4,
+        seed: Optional[int] = None,
+    ):
+        """Initialize the agent.
+
+        Args:
+            name: Display name for this agent
+            iterations: Iteration budget per decision
+            time_limit: Time budget per decision in seconds
+            exploration: UCB exploration constant
+            rollout_policy: ``"random"``, ``"heuristic"``, ``"ml"`` (default
+                ``MLAgent``) or any ``Agent`` instance
+            rollout_depth: Maximum rollout length in actions
+            reuse_tree: Keep the chosen subtree between moves
+            transposition_table: Table of leaf values, possibly shared with other agents
+            tt_min_visits: Stored evaluations needed before a leaf skips its rollout
+            seed: Random seed for determinizations and random rollouts
+
+        Raises:
+            ValueError: If neither budget is set or the rollout policy is unknown
+        """
+        if iterations is None and time_limit is None:
+            raise ValueError("ISMCTSAgent needs an iteration or time budget")
+        self._name = name
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.rollout_depth = rollout_depth
+        self.reuse_tree = reuse_tree
+        self.transposition_table = transposition_table
+        self.tt_min_visits = tt_min_visits
+        self.last_iterations = 0
+        self.last_reused = False
+        self._rng = random.Random(seed)
+        self._rollout_agent = self._make_rollout_agent(rollout_policy, seed)
+        self._tree: Optional[Tuple[_Node, GameState]] = None
+
+    @staticmethod
+    def _make_rollout_agent(policy: RolloutPolicy, seed: Optional[int]) -> Optional[Agent]:
+        if not isinstance(policy, str):
+            return policy
+        if policy == "random":
+            return None
+        if policy == "heuristic":
+            from .heuristic import HeuristicAgent
+
+            return HeuristicAgent(name="ISMCTS Rollout", seed=seed)
+        if policy == "ml":
+            from .ml import MLAgent
+
+            return MLAgent(name="ISMCTS Rollout")
+        raise ValueError(f"Unknown rollout policy: {policy!r}")
+
+    @property
+    def name(self) -> str:
+        """Get the agent's display name."""
+        return self._name
+
+    def reset(self) -> None:
+        """Drop the search tree kept from the previous game."""
+        self._tree = None
+
+    def choose_action(self, state: GameState) -> Action:
+        """Search from ``state`` within the budget and return the most visited action.
+
+        Args:
+            state: Current game state
+
+        Returns:
+            Selected action
+
+        Raises:
+            AgentError: If no legal actions are available
+        """
+        legal = enumerate_legal_actions(state)
+        if not legal:
+            raise AgentError("No legal actions available")
+        if len(legal) == 1:
+            # Forced move: no search; a kept subtree can still be found on the next call.
+            self.last_iterations = 0
+            self.last_reused = False
+            return legal[0]
+
+        reused = self._reused_root(state)
+        self.last_reused = reused is not None
+        root = self._search(state, reused or _Node())
+
+        candidates = [root.children[action] for action in legal if action in root.children]
+        if not candidates:
+            return self._rng.choice(legal)
+        best = max(candidates, key=lambda child: (child.visits, child.reward))
+        if self.reuse_tree:
+            self._tree = (best, apply_action(state, best.action)[0])
+        return best.action
+
+    def search(self, state: GameState) -> Dict[Action, Tuple[int, float]]:
+        """Run one fresh search from ``state`` and report the root statistics.
+
+        Args:
+            state: Current game state
+
+        Returns:
+            Mapping of each explored root action to its (visits, total reward)
+        """
+        root = self._search(state, _Node())
+        return {action: (child.visits, child.reward) for action, child in root.children.items()}
+
+    def _search(self, state: GameState, root: _Node) -> _Node:
+        root.parent = None
+        observer = current_actor_index(state)
+        hasher = view_hasher(observer)
+        root_key = None
+        if self.transposition_table is not None:
+            self.transposition_table.new_search()
+            # Every determinization belongs to the same information set, so they share this hash.
+            root_key = hasher.hash_state(state)
+        deadline = time.perf_counter() + self.time_limit if self.time_limit is not None else math.inf
+        count = 0
+        while (self.iterations is None or count < self.iterations) and time.perf_counter() < deadline:
+            self._iterate(root, determinize(state, observer, self._rng), hasher, root_key)
+            count += 1
+        self.last_iterations = count
+        return root
+
+    def _reused_root(self, state: GameState, max_depth: int = 8) -> Optional[_Node]:
+        """Find the node for ``state`` below the action chosen last time.
+
+        The actions taken since then are not reported to agents, so the tree's
+        own edges are replayed on the true state after our previous action,
+        up to ``max_depth`` actions deep, until the resulting state equals ``state``.
+        """
+        if self._tree is None:
+            return None
+        node, after = self._tree
+        self._tree = None
+        frontier: List[Tuple[_Node, GameState]] = [(node, after)]
+        for _ in range(max_depth + 1):
+            next_frontier: List[Tuple[_Node, GameState]] = []
+            for candidate, candidate_state in frontier:
+                if candidate_state == state:
+                    return candidate
+                for action, child in candidate.children.items():
+                    child_state, done, events = apply_action(candidate_state, action)
+                    if not done and events.get("type") != "illegal_action":
+                        next_frontier.append((child, child_state))
+            frontier = next_frontier
+        return None
+
+    def _iterate(self, root: _Node, state: GameState, hasher: StateHasher, key: Optional[int]) -> None:
+        """Run one iteration on the determinized ``state``, whose hash is ``key`` when a table is used."""
+        node = root
+        done = False
+        # Selection: descend while every action legal in this determinization has a child.
+        while True:
+            legal = enumerate_legal_actions(state)
+            untried = [action for action in legal if action not in node.children]
+            if untried or not legal:
+                for action in legal:
+                    if action in node.children:
+                        node.children[action].availability += 1
+                break
+            node = node.select(legal, self.exploration)
+            done, _, undo = apply_action_inplace(state, node.action)
+            if key is not None:
+                key = hasher.update(key, state, undo)
+            if done:
+                break
+
+        # Expansion
+        if not done and untried:
+            action = self._rng.choice(untried)
+            child = _Node(action, current_actor_index(state), node)
+            child.availability = 1
+            node.children[action] = child
+            node = child
+            done, _, undo = apply_action_inplace(state, action)
+            if key is not None:
+                key = hasher.update(key, state, undo)
+
+        # Rollout, unless the table already knows this state well enough
+        stored = None
+        if key is not None and self.transposition_table is not None:
+            stored = self.transposition_table.probe(key)
+            if stored is not None and stored.visits < self.tt_min_visits:
+                stored = None
+        steps = 0
+        while stored is None and not done and steps < self.rollout_depth:
+            legal = enumerate_legal_actions(state)
+            if not legal:
+                break
+            if self._rollout_agent is None:
+                action = self._rng.choice(legal)
+            else:
+                action = self._rollout_agent.choose_action(state)
+            done = apply_action_inplace(state, action)[0]
+            steps += 1
+
+        # Backpropagation
+        if stored is not None:
+            scores = (stored.mean, 1.0 - stored.mean)
+        else:
+            scores = (_life_score(state, 0), _life_score(state, 1))
+            if key is not None and self.transposition_table is not None:
+                self.transposition_table.add(key, scores[0])
+        while node is not None:
+            node.visits += 1
+            if node.player >= 0:
+                node.reward += scores[node.player]
+            node = node.parent
+
+
+__all__ = ["ISMCTSAgent", "determinize"]
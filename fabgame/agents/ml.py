@@ -8,7 +8,7 @@ from __future__ import annotations
 import logging
 import time
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 from ..exceptions import AgentTimeoutError, MLPolicyError, PolicyLoadError
 from ..models import Action, GameState
@@ -38,6 +38,7 @@ class MLAgent:
         use_fallback: bool = True,
         timeout_seconds: float = 0.05,
         deterministic: bool = True,
+        policy: Optional[Any] = None,
     ):
         """Initialize the ML agent.
 
@@ -47,6 +48,8 @@ class MLAgent:
             use_fallback: Whether to use heuristic fallback on errors
             timeout_seconds: Maximum time for action selection
             deterministic: Whether to use deterministic policy
+            policy: Already loaded policy, or a ``fabgame.inference.InferenceServer``
+                shared between agents; ``policy_path`` is ignored when given
         """
         self._name = name
         self.policy_path = policy_path
@@ -55,7 +58,7 @@ class MLAgent:
         self.deterministic = deterministic
 
         # Lazy-loaded policy objects
-        self._policy = None
+        self._policy = policy
         self._sb3_policy = None
         self._fallback_agent = None
 
@@ -80,16 +83,16 @@ class MLAgent:
 
         # Import here to avoid circular dependency and optional ML dependencies
         try:
-            from ..agents_ml import load_policy, load_sb3_policy
+            from ..agents_ml import load_policy_cached, load_sb3_policy_cached
         except ImportError as e:
             raise PolicyLoadError(f"ML dependencies not available: {e}") from e
 
         # Try to load policy
         if self.policy_path:
             try:
-                self._policy = load_policy(self.policy_path)
+                self._policy = load_policy_cached(str(self.policy_path))
                 if self._policy is None:
-                    self._sb3_policy = load_sb3_policy(self.policy_path)
+                    self._sb3_policy = load_sb3_policy_cached(str(self.policy_path))
             except Exception as e:
                 raise PolicyLoadError(f"Failed to load policy from {self.policy_path}: {e}") from e
         else:
@@ -98,12 +101,12 @@ class MLAgent:
 
             default_path = _default_policy_path()
             if default_path:
-                self._policy = load_policy(default_path)
+                self._policy = load_policy_cached(default_path)
 
             if self._policy is None:
                 sb3_path = _default_sb3_policy_path()
                 if sb3_path:
-                    self._sb3_policy = load_sb3_policy(sb3_path)
+                    self._sb3_policy = load_sb3_policy_cached(sb3_path)
 
         if self._policy is None and self._sb3_policy is None:
             raise PolicyLoadError("No policy could be loaded from default paths")
@@ -0,0 +1,264 @@
+"""Root-parallel ISMCTS across a process pool.
+
+``ParallelISMCTSAgent`` sends the current state to ``workers`` processes. Each
+process runs an independent ``ISMCTSAgent`` search over its own
+determinizations, and the parent adds up the root visit counts before it picks
+the most visited action.
+
+States travel as ``CompactGameState`` buffers rather than pickled object graphs.
+Card ids in those buffers index the parent's ``CARD_CATALOG``, so the catalog is
+sent once when the pool starts; each task then carries only the cards interned
+since. Searches are bounded by a wall-clock ``timeout_seconds``, like
+``MLAgent``; results that arrive too late are ignored.
+"""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:  # pragma: no cover - dependency guard
+    import numpy as np
+except ImportError as exc:  # pragma: no cover
+    raise RuntimeError("fabgame.agents.parallel_ismcts requires numpy to be installed") from exc
+
+from ..catalog import CARD_CATALOG, CardCatalog
+from ..compact_state import CompactGameState, CompactLayout, CompactStatic
+from ..engine import enumerate_legal_actions
+from ..exceptions import AgentError
+from ..models import Action, Card, GameState
+from .ismcts import ISMCTSAgent, RolloutPolicy
+
+logger = logging.getLogger(__name__)
+
+RootStats = Dict[Action, Tuple[int, float]]
+
+# Worker-process copy of the parent's card catalog, in the same id order.
+_worker_catalog: Optional[CardCatalog] = None
+
+
+def _init_worker(cards: Sequence[Card]) -> None:
+    global _worker_catalog
+    _worker_catalog = CardCatalog()
+    for card in cards:
+        _worker_catalog.card_id(card)
+
+
+def _worker_search(
+    buffer: bytes,
+    static: CompactStatic,
+    layout: CompactLayout,
+    base: int,
+    new_cards: Sequence[Card],
+    search_options: Dict[str, Any],
+) -> RootStats:
+    catalog = _worker_catalog
+    assert catalog is not None, "worker was not initialized"
+    for card in new_cards[len(catalog) - base :]:
+        catalog.card_id(card)
+    compact = CompactGameState(np.frombuffer(buffer, dtype=np.int16).copy(), static, layout, catalog)
+    return ISMCTSAgent(reuse_tree=False, **search_options).search(compact.to_state())
+
+
+class ParallelISMCTSAgent:
+    """ISMCTS agent that searches with several processes at once.
+
+    Attributes:
+        name: Display name of the agent
+        workers: Number of worker processes
+        timeout_seconds: Wall-clock budget per decision
+        iterations: Optional per-worker iteration cap
+        use_fallback: Whether to fall back to the heuristic agent when no worker finishes in time
+        last_results: Number of worker searches merged into the last decision
+        last_visits: Merged root visit counts of the last decision
+    """
+
+    def __init__(
+        self,
+        name: str = "Parallel ISMCTS Agent",
+        *,
+        workers: Optional[int] = None,
+        timeout_seconds: float = 1.0,
+        iterations: Optional[int] = None,
+        exploration: float = 0.7,
+        rollout_policy: RolloutPolicy = "random",
+        rollout_depth: int = 40,
+        use_fallback: bool = True,
+        seed: Optional[int] = None,
+        mp_context: Optional[Any] = None,
+        layout: Optional[CompactLayout] = None,
+    ):
+        """Initialize the agent; worker processes start on first use or ``start()``.
+
+        Args:
+            name: Display name for this agent
+            workers: Number of worker processes (default: one per CPU)
+            timeout_seconds: Wall-clock budget per decision
+            iterations: Optional per-worker iteration cap
+            exploration: UCB exploration constant
+            rollout_policy: Rollout policy passed to each worker's ``ISMCTSAgent``;
+                it is pickled, so prefer ``"random"``, ``"heuristic"`` or ``"ml"``
+            rollout_depth: Maximum rollout length in actions
+            use_fallback: Use the heuristic agent if no worker finishes in time
+            seed: Random seed for the per-worker seeds
+            mp_context: ``multiprocessing`` context for the pool (default context when None)
+            layout: Compact state layout used to ship states
+
+        Raises:
+            ValueError: If ``workers`` is below 1 or ``timeout_seconds`` is not positive
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if timeout_seconds <= 0:
+            raise ValueError("timeout_seconds must be positive")
+        self._name = name
+        self.workers = workers
+        self.timeout_seconds = timeout_seconds
+        self.iterations = iterations
+        self.use_fallback = use_fallback
+        self.last_results = 0
+        self.last_visits: Dict[Action, int] = {}
+        self._search_options: Dict[str, Any] = {
+            "exploration": exploration,
+            "rollout_policy": rollout_policy,
+            "rollout_depth": rollout_depth,
+        }
+        self._rng = random.Random(seed)
+        self._mp_context = mp_context
+        self._layout = layout or CompactLayout()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._catalog_base = 0
+        self._fallback_agent = None
+
+    @property
+    def name(self) -> str:
+        """Get the agent's display name."""
+        return self._name
+
+    def __enter__(self) -> "ParallelISMCTSAgent":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def reset(self) -> None:
+        """Reset per-game statistics; the worker pool is kept."""
+        self.last_results = 0
+        self.last_visits = {}
+
+    def start(self) -> "ParallelISMCTSAgent":
+        """Start the worker processes and wait until all of them are ready."""
+        if self._pool is None:
+            cards = CARD_CATALOG.cards
+            self._catalog_base = len(cards)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=self._mp_context or multiprocessing.get_context(),
+                initializer=_init_worker,
+                initargs=(cards,),
+            )
+            for future in [self._pool.submit(len, ()) for _ in range(self.workers)]:
+                future.result()
+        return self
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _get_fallback_agent(self):
+        if self._fallback_agent is None:
+            from .heuristic import HeuristicAgent
+
+            self._fallback_agent = HeuristicAgent(name=f"{self.name} (Fallback)")
+        return self._fallback_agent
+
+    def _fallback(self, state: GameState, message: str) -> Action:
+        if not self.use_fallback:
+            raise AgentError(message)
+        logger.warning(message)
+        return self._get_fallback_agent().choose_action(state)
+
+    def choose_action(self, state: GameState) -> Action:
+        """Search ``state`` in every worker and return the action with the most merged visits.
+
+        Args:
+            state: Current game state
+
+        Returns:
+            Selected action
+
+        Raises:
+            AgentError: If no legal actions are available, or fallback is disabled
+                and the state cannot be packed or no worker finished in time
+        """
+        deadline = time.perf_counter() + self.timeout_seconds
+        legal = enumerate_legal_actions(state)
+        if not legal:
+            raise AgentError("No legal actions available")
+        self.last_results = 0
+        self.last_visits = {}
+        if len(legal) == 1:
+            return legal[0]
+
+        try:
+            compact = CompactGameState.from_state(state, self._layout)
+        except ValueError as exc:
+            return self._fallback(state, f"Cannot ship state to ISMCTS workers: {exc}")
+        self.start()
+        assert self._pool is not None
+        payload = (
+            compact.buffer.tobytes(),
+            compact.static,
+            compact.layout,
+            self._catalog_base,
+            CARD_CATALOG.cards[self._catalog_base :],
+        )
+        # Leave a slice of the budget for shipping results back and merging them.
+        time_limit = max(0.0, (deadline - time.perf_counter()) * 0.9)
+        futures: List[Future] = []
+        for _ in range(self.workers):
+            options = dict(
+                self._search_options,
+                iterations=self.iterations,
+                time_limit=time_limit,
+                seed=self._rng.randrange(2**32),
+            )
+            futures.append(self._pool.submit(_worker_search, *payload, options))
+
+        totals: Dict[Action, List[float]] = {}
+        pending = set(futures)
+        while pending:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    stats = future.result()
+                except Exception as exc:  # a failed worker only loses its share of the search
+                    logger.error(f"ISMCTS worker failed: {exc}")
+                    continue
+                self.last_results += 1
+                for action, (visits, reward) in stats.items():
+                    entry = totals.setdefault(action, [0, 0.0])
+                    entry[0] += visits
+                    entry[1] += reward
+        for future in pending:
+            future.cancel()
+
+        candidates = [action for action in legal if action in totals]
+        if not candidates:
+            return self._fallback(state, f"No ISMCTS worker finished within {self.timeout_seconds}s")
+        self.last_visits = {action: int(totals[action][0]) for action in candidates}
+        return max(candidates, key=lambda action: (totals[action][0], totals[action][1]))
+
+
+__all__ = ["ParallelISMCTSAgent"]
@@ -3,10 +3,12 @@ from __future__ import annotations
 import json
 import os
 import random
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, Optional, Sequence
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple, Union
 
 try:  # pragma: no cover - dependency guard
     import numpy as np
@@ -36,15 +38,32 @@ class SB3Policy:
         action, _ = self.model.predict(obs, action_masks=mask, deterministic=deterministic)
         return int(action)
 
+    def select_actions(
+        self,
+        observations: Sequence[Union[np.ndarray, Dict[str, np.ndarray]]],
+        masks: np.ndarray,
+        deterministic: bool = True,
+    ) -> np.ndarray:
+        """Select one action per observation with a single batched ``predict`` call."""
+        if isinstance(observations[0], dict):
+            batch: Any = {key: np.stack([obs[key] for obs in observations]) for key in observations[0]}
+        else:
+            batch = np.stack(observations)
+        actions, _ = self.model.predict(batch, action_masks=masks, deterministic=deterministic)
+        return np.asarray(actions, dtype=np.int64).reshape(-1)
+
 from .agents import bot_choose_action
 from .engine import current_actor_index, enumerate_legal_actions
 from .models import Action, GameState
 from .rl import ACTION_VOCAB, EncoderConfig, encode_observation, legal_action_mask
 
 
-def flatten_observation(obs: Dict[str, np.ndarray]) -> "torch.Tensor":
+def flatten_observation(obs: Union[np.ndarray, Dict[str, np.ndarray]]) -> "torch.Tensor":
     if torch is None:  # pragma: no cover - guarded import
         raise RuntimeError("Torch is required for ML inference.")
+    if isinstance(obs, np.ndarray):
+        # Already flat (``FabgameEnv(flat_observation=True)``); same layout as below.
+        return torch.from_numpy(np.ascontiguousarray(obs, dtype=np.float32).reshape(-1))
     tensors = []
     for key in sorted(obs.keys()):
         value = np.asarray(obs[key], dtype=np.float32).reshape(-1)
@@ -74,17 +93,36 @@ class TorchPolicy:
     device: "torch.device"
 
     def select_action(self, obs: Dict[str, np.ndarray], mask: np.ndarray, deterministic: bool = True) -> int:
+        return int(self.select_actions([obs], np.asarray(mask)[None], deterministic=deterministic)[0])
+
+    def select_actions(
+        self,
+        observations: Sequence[Union[np.ndarray, Dict[str, np.ndarray]]],
+        masks: np.ndarray,
+        deterministic: bool = True,
+    ) -> np.ndarray:
+        """Select one action per observation with a single batched forward pass.
+
+        Args:
+            observations: Dict or flat observations
+            masks: ``(len(observations), action_dim)`` legal action masks
+            deterministic: Take the arg-max instead of sampling
+
+        Returns:
+            Action indices, one per observation
+        """
         if torch is None:
             raise RuntimeError("Torch is required for ML inference.")
-        obs_tensor = flatten_observation(obs).to(self.device).unsqueeze(0)
-        mask_tensor = torch.from_numpy(mask.astype(np.float32)).to(self.device)
+        obs_tensor = torch.stack([flatten_observation(obs) for obs in observations]).to(self.device)
+        mask_tensor = torch.from_numpy(np.asarray(masks, dtype=np.float32)).to(self.device)
         with torch.no_grad():
-            logits = self.network(obs_tensor).squeeze(0)
+            logits = self.network(obs_tensor)
             masked = logits + torch.log(mask_tensor.clamp(min=1e-6))
             if deterministic:
-                return int(masked.argmax().item())
-            distribution = Categorical(logits=masked)
-            return int(distribution.sample().item())
+                actions = masked.argmax(dim=1)
+            else:
+                actions = Categorical(logits=masked).sample()
+        return actions.cpu().numpy()
 
 
 def load_policy(path: str, device: str = "cpu") -> Optional[TorchPolicy]:
@@ -134,6 +172,98 @@ def _default_sb3_policy_path() -> Optional[str]:
     return None
 
 
+PolicyKey = Tuple[str, str, str]
+
+
+class PolicyRegistry:
+    """Process-wide cache of loaded policies shared by every agent and evaluator.
+
+    Entries are keyed by absolute path, policy kind (``"torch"`` or ``"sb3"``) and
+    device, and revalidated against the file's mtime and size on every lookup, so
+    a retrained checkpoint written to the same path is picked up. At most
+    ``max_entries`` policies stay loaded; the least recently used one is evicted.
+    """
+
+    def __init__(self, max_entries: int = 8) -> None:
+        """Create an empty registry.
+
+        Args:
+            max_entries: Number of loaded policies kept in memory
+
+        Raises:
+            ValueError: If ``max_entries`` is below 1
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[PolicyKey, Tuple[int, int, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, path: str, kind: str = "torch", device: str = "cpu") -> Any:
+        """Return the loaded policy at ``path``, loading it on first use or after it changed.
+
+        Args:
+            path: Checkpoint path (torch ``.pt`` or SB3 ``.zip``)
+            kind: ``"torch"`` for ``load_policy`` or ``"sb3"`` for ``load_sb3_policy``
+            device: Torch device (ignored for SB3 policies)
+
+        Returns:
+            The policy, or None if the file is missing or the loader returned None
+
+        Raises:
+            ValueError: If ``kind`` is unknown
+        """
+        if kind not in ("torch", "sb3"):
+            raise ValueError(f"Unknown policy kind: {kind!r}")
+        key = (os.path.abspath(path), kind, device if kind == "torch" else "")
+        try:
+            stat = os.stat(key[0])
+        except OSError:
+            return None
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                self._entries.move_to_end(key)
+                return cached[2]
+            policy = load_policy(key[0], device=device) if kind == "torch" else load_sb3_policy(key[0])
+            self._entries[key] = (stat.st_mtime_ns, stat.st_size, policy)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return policy
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+POLICY_REGISTRY = PolicyRegistry()
+
+
+def load_policy_cached(path: str, device: str = "cpu") -> Optional[TorchPolicy]:
+    """Load a torch policy through the shared ``POLICY_REGISTRY``."""
+    return POLICY_REGISTRY.get(path, "torch", device)
+
+
+def load_sb3_policy_cached(path: str) -> Optional[SB3Policy]:
+    """Load an SB3 policy through the shared ``POLICY_REGISTRY``."""
+    return POLICY_REGISTRY.get(path, "sb3")
+
+
+def _default_policies() -> Tuple[Optional[TorchPolicy], Optional[SB3Policy]]:
+    """Resolve the default policies through the shared registry."""
+    path = _default_policy_path()
+    policy = load_policy_cached(path) if path else None
+    sb3_policy = None
+    if policy is None:
+        sb3_path = _default_sb3_policy_path()
+        sb3_policy = load_sb3_policy_cached(sb3_path) if sb3_path else None
+    return policy, sb3_policy
+
+
 def ml_bot_choose_action(
     gs: GameState,
     *,
@@ -146,6 +276,9 @@ def ml_bot_choose_action(
 ) -> Action:
     """
     Choose an action for the current actor using an ML policy with heuristic fallback.
+
+    ``policy`` may be any object with a ``select_action(obs, mask, deterministic)``
+    method, such as a shared ``fabgame.inference.InferenceServer``.
     """
 
     legal = list(legal_actions) if legal_actions is not None else enumerate_legal_actions(gs)
@@ -158,13 +291,7 @@ def ml_bot_choose_action(
     obs = encode_observation(gs, acting_player=actor, config=encoder_config)
 
     if policy is None and sb3_policy is None:
-        path = _default_policy_path()
-        if path:
-            policy = load_policy(path)
-        if policy is None:
-            sb3_path = _default_sb3_policy_path()
-            if sb3_path:
-                sb3_policy = load_sb3_policy(sb3_path)
+        policy, sb3_policy = _default_policies()
     if policy is None and sb3_policy is None:
         return bot_choose_action(gs, random.Random())
 
@@ -189,4 +316,14 @@ def ml_bot_choose_action(
     return chosen
 
 
-__all__ = ["TorchPolicy", "SB3Policy", "load_policy", "load_sb3_policy", "ml_bot_choose_action"]
+__all__ = [
+    "POLICY_REGISTRY",
+    "PolicyRegistry",
+    "SB3Policy",
+    "TorchPolicy",
+    "load_policy",
+    "load_policy_cached",
+    "load_sb3_policy",
+    "load_sb3_policy_cached",
+    "ml_bot_choose_action",
+]
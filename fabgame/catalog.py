@@ -0,0 +1,129 @@
+"""Card catalog - interns immutable card definitions and assigns integer ids.
+
+Every distinct card definition is stored once; decks and zones hold shared
+references to the interned instance, and each instance gets a small, stable
+integer id that encoders and compact state layouts can index by.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple
+
+from .models import Card
+
+CardKey = Tuple[Any, ...]
+
+
+def card_key(card: Card) -> CardKey:
+    """Build the identity key used to intern a card.
+
+    Name and pitch identify a card printing; the remaining stats are part of
+    the key so that ad-hoc test or random cards sharing a name never collide.
+
+    Args:
+        card: Card to build the key for
+
+    Returns:
+        Hashable tuple identifying the card definition
+    """
+    return (
+        card.name,
+        card.pitch,
+        card.cost,
+        card.attack,
+        card.defense,
+        card.keywords,
+        card.text,
+        repr(card.abilities) if card.abilities else "",
+    )
+
+
+class CardCatalog:
+    """Registry of interned cards addressed by integer id.
+
+    Ids are assigned in insertion order starting at 0 and never change for the
+    lifetime of the catalog.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty catalog."""
+        self._cards: List[Card] = []
+        self._ids_by_key: Dict[CardKey, int] = {}
+        # Interned instances are kept alive by ``_cards``, so their id() is stable.
+        self._ids_by_identity: Dict[int, int] = {}
+        self._ids_by_name: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def __contains__(self, card: object) -> bool:
+        return isinstance(card, Card) and card_key(card) in self._ids_by_key
+
+    @property
+    def cards(self) -> List[Card]:
+        """All interned cards, indexed by card id."""
+        return list(self._cards)
+
+    def intern(self, card: Card) -> Card:
+        """Return the shared instance for ``card``, registering it if new.
+
+        Args:
+            card: Card definition to intern
+
+        Returns:
+            Canonical Card instance equal to ``card``
+        """
+        return self._cards[self.card_id(card)]
+
+    def card_id(self, card: Card) -> int:
+        """Return the integer id of ``card``, interning it if necessary.
+
+        Args:
+            card: Card to look up
+
+        Returns:
+            Stable integer id of the card definition
+        """
+        card_id = self._ids_by_identity.get(id(card))
+        if card_id is not None:
+            return card_id
+        key = card_key(card)
+        card_id = self._ids_by_key.get(key)
+        if card_id is None:
+            card_id = len(self._cards)
+            self._cards.append(card)
+            self._ids_by_key[key] = card_id
+            self._ids_by_identity[id(card)] = card_id
+            self._ids_by_name.setdefault(card.name, card_id)
+        return card_id
+
+    def id_for_name(self, name: str) -> int:
+        """Return the id of the first interned card called ``name``.
+
+        Raises:
+            KeyError: If no card with that name has been interned
+        """
+        return self._ids_by_name[name]
+
+    def card(self, card_id: int) -> Card:
+        """Return the interned card for ``card_id``.
+
+        Raises:
+            IndexError: If the id was never assigned
+        """
+        return self._cards[card_id]
+
+
+CARD_CATALOG = CardCatalog()
+
+
+def intern_card(card: Card) -> Card:
+    """Intern ``card`` in the process-wide catalog."""
+    return CARD_CATALOG.intern(card)
+
+
+def card_id(card: Card) -> int:
+    """Return the process-wide integer id for ``card``."""
+    return CARD_CATALOG.card_id(card)
+
+
+__all__ = ["CARD_CATALOG", "CardCatalog", "card_id", "card_key", "intern_card"]
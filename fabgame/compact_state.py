@@ -0,0 +1,319 @@
+"""Compact, array-backed game state representation.
+
+This module packs the dynamic part of a ``GameState`` into a single small
+integer buffer: one block of global scalars followed by one block per player
+holding that player's scalars and fixed-capacity zones of card ids (see
+``fabgame.catalog``). Data that never changes during a game (hero metadata,
+weapon definitions, the RNG seed) lives in a shared ``CompactStatic`` object,
+so copying a compact state is a single buffer copy.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+try:  # pragma: no cover - dependency guard
+    import numpy as np
+except ImportError as exc:  # pragma: no cover
+    raise RuntimeError("fabgame.compact_state requires numpy to be installed") from exc
+
+from .catalog import CARD_CATALOG, CardCatalog
+from .models import Card, CombatStep, GameState, Phase, PlayerState, Weapon
+
+PHASES: Tuple[Phase, ...] = tuple(Phase)
+PHASE_INDEX = {phase: idx for idx, phase in enumerate(PHASES)}
+COMBAT_STEPS: Tuple[CombatStep, ...] = tuple(CombatStep)
+COMBAT_STEP_INDEX = {step: idx for idx, step in enumerate(COMBAT_STEPS)}
+
+NONE = -1  # Sentinel for optional integer fields and empty card slots.
+
+GLOBAL_FIELDS: Tuple[str, ...] = (
+    "turn",
+    "phase",
+    "awaiting_defense",
+    "awaiting_arsenal",
+    "arsenal_player",
+    "pending_attack",
+    "last_attack_card",
+    "last_pitch_sum",
+    "action_points",
+    "last_attack_had_go_again",
+    "floating_0",
+    "floating_1",
+    "reaction_actor",
+    "reaction_block",
+    "combat_step",
+    "combat_priority",
+    "combat_passes",
+    "combat_block_total",
+    "pending_damage",
+    "reaction_arsenal_count",
+)
+PLAYER_FIELDS: Tuple[str, ...] = ("life", "attacks_this_turn", "weapon_used")
+ZONES: Tuple[str, ...] = ("deck", "hand", "grave", "pitched", "arsenal")
+GLOBAL_OFFSETS: Dict[str, int] = {name: idx for idx, name in enumerate(GLOBAL_FIELDS)}
+
+
+@dataclass(frozen=True)
+class CompactLayout:
+    """Field offsets and zone capacities of the compact buffer."""
+
+    deck_capacity: int = 80
+    hand_capacity: int = 16
+    grave_capacity: int = 80
+    pitched_capacity: int = 16
+    arsenal_capacity: int = 4
+    reaction_arsenal_capacity: int = 4
+
+    def capacity(self, zone: str) -> int:
+        return int(getattr(self, f"{zone}_capacity"))
+
+    @property
+    def reaction_arsenal_offset(self) -> int:
+        return len(GLOBAL_FIELDS)
+
+    @property
+    def player_offset(self) -> int:
+        return self.reaction_arsenal_offset + self.reaction_arsenal_capacity
+
+    @property
+    def player_block_size(self) -> int:
+        return len(PLAYER_FIELDS) + len(ZONES) + sum(self.capacity(zone) for zone in ZONES)
+
+    def player_field_offset(self, player: int, name: str) -> int:
+        return self.player_offset + player * self.player_block_size + PLAYER_FIELDS.index(name)
+
+    def zone_count_offset(self, player: int, zone: str) -> int:
+        return self.player_offset + player * self.player_block_size + len(PLAYER_FIELDS) + ZONES.index(zone)
+
+    def zone_offset(self, player: int, zone: str) -> int:
+        base = self.player_offset + player * self.player_block_size + len(PLAYER_FIELDS) + len(ZONES)
+        for name in ZONES:
+            if name == zone:
+                return base
+            base += self.capacity(name)
+        raise KeyError(zone)
+
+    @property
+    def size(self) -> int:
+        return self.player_offset + 2 * self.player_block_size
+
+
+DEFAULT_LAYOUT = CompactLayout()
+
+
+@dataclass(frozen=True)
+class CompactStatic:
+    """Per-game data that does not change between steps."""
+
+    heroes: Tuple[str, str]
+    hero_texts: Tuple[str, str]
+    hero_modifiers: Tuple[Dict[str, List[dict]], Dict[str, List[dict]]]
+    weapons: Tuple[Optional[Weapon], Optional[Weapon]]
+    rng_seed: int = 0
+
+
+def _opt(value: Optional[int]) -> int:
+    return NONE if value is None else int(value)
+
+
+def _from_opt(value: int) -> Optional[int]:
+    return None if value == NONE else int(value)
+
+
+class CompactGameState:
+    """A ``GameState`` packed into one ``int16`` NumPy buffer.
+
+    Attributes:
+        buffer: Flat integer buffer holding all dynamic fields
+        static: Shared per-game data
+        layout: Buffer layout
+        catalog: Catalog resolving card ids
+    """
+
+    __slots__ = ("buffer", "static", "layout", "catalog")
+
+    def __init__(
+        self,
+        buffer: np.ndarray,
+        static: CompactStatic,
+        layout: CompactLayout = DEFAULT_LAYOUT,
+        catalog: CardCatalog = CARD_CATALOG,
+    ) -> None:
+        self.buffer = buffer
+        self.static = static
+        self.layout = layout
+        self.catalog = catalog
+
+    @classmethod
+    def from_state(
+        cls,
+        state: GameState,
+        layout: CompactLayout = DEFAULT_LAYOUT,
+        catalog: CardCatalog = CARD_CATALOG,
+    ) -> "CompactGameState":
+        """Pack a ``GameState`` into a compact buffer.
+
+        Args:
+            state: State to convert
+            layout: Buffer layout to use
+            catalog: Catalog used to assign card ids
+
+        Returns:
+            Compact representation of ``state``
+
+        Raises:
+            ValueError: If a zone exceeds the layout capacity, or a reaction-arsenal
+                name matches no card in the catalog or in the state's zones
+        """
+        buf = np.full(layout.size, NONE, dtype=np.int16)
+        offsets = GLOBAL_OFFSETS
+
+        def put(name: str, value: int) -> None:
+            buf[offsets[name]] = value
+
+        put("turn", state.turn)
+        put("phase", PHASE_INDEX[state.phase])
+        put("awaiting_defense", int(state.awaiting_defense))
+        put("awaiting_arsenal", int(state.awaiting_arsenal))
+        put("arsenal_player", _opt(state.arsenal_player))
+        put("pending_attack", state.pending_attack)
+        put(
+            "last_attack_card",
+            NONE if state.last_attack_card is None else catalog.card_id(state.last_attack_card),
+        )
+        put("last_pitch_sum", state.last_pitch_sum)
+        put("action_points", state.action_points)
+        put("last_attack_had_go_again", int(state.last_attack_had_go_again))
+        put("floating_0", state.floating_resources[0])
+        put("floating_1", state.floating_resources[1])
+        put("reaction_actor", _opt(state.reaction_actor))
+        put("reaction_block", state.reaction_block)
+        put("combat_step", COMBAT_STEP_INDEX[state.combat_step])
+        put("combat_priority", _opt(state.combat_priority))
+        put("combat_passes", state.combat_passes)
+        put("combat_block_total", state.combat_block_total)
+        put("pending_damage", state.pending_damage)
+
+        for player_idx, player in enumerate(state.players):
+            buf[layout.player_field_offset(player_idx, "life")] = player.life
+            buf[layout.player_field_offset(player_idx, "attacks_this_turn")] = player.attacks_this_turn
+            buf[layout.player_field_offset(player_idx, "weapon_used")] = (
+                int(player.weapon.used_this_turn) if player.weapon is not None else NONE
+            )
+            for zone in ZONES:
+                cards: List[Card] = getattr(player, zone)
+                if len(cards) > layout.capacity(zone):
+                    raise ValueError(f"{zone} of player {player_idx} exceeds compact layout capacity")
+                buf[layout.zone_count_offset(player_idx, zone)] = len(cards)
+                start = layout.zone_offset(player_idx, zone)
+                buf[start:start + len(cards)] = [catalog.card_id(card) for card in cards]
+
+        # Zones are packed first: a reaction-arsenal card sits in its owner's grave, so
+        # the name lookup below then finds it interned.
+        names = state.reaction_arsenal_cards
+        if len(names) > layout.reaction_arsenal_capacity:
+            raise ValueError("reaction_arsenal_cards exceeds compact layout capacity")
+        put("reaction_arsenal_count", len(names))
+        start = layout.reaction_arsenal_offset
+        for idx, name in enumerate(names):
+            try:
+                buf[start + idx] = catalog.id_for_name(name)
+            except KeyError:
+                raise ValueError(f"reaction arsenal card {name!r} is not a known card") from None
+
+        p0, p1 = state.players
+        static = CompactStatic(
+            heroes=(p0.hero, p1.hero),
+            hero_texts=(p0.hero_text, p1.hero_text),
+            hero_modifiers=(p0.hero_modifiers, p1.hero_modifiers),
+            weapons=(p0.weapon, p1.weapon),
+            rng_seed=state.rng_seed,
+        )
+        return cls(buf, static, layout, catalog)
+
+    def copy(self) -> "CompactGameState":
+        """Return an independent copy (one buffer copy, static data shared)."""
+        return CompactGameState(self.buffer.copy(), self.static, self.layout, self.catalog)
+
+    def scalar(self, name: str) -> int:
+        """Read a global scalar field by name."""
+        return int(self.buffer[GLOBAL_OFFSETS[name]])
+
+    def player_scalar(self, player: int, name: str) -> int:
+        """Read a per-player scalar field (``life``, ``attacks_this_turn``, ``weapon_used``)."""
+        return int(self.buffer[self.layout.player_field_offset(player, name)])
+
+    def zone_ids(self, player: int, zone: str) -> np.ndarray:
+        """Return a view of the card ids currently in a player's zone."""
+        count = int(self.buffer[self.layout.zone_count_offset(player, zone)])
+        start = self.layout.zone_offset(player, zone)
+        return self.buffer[start:start + count]
+
+    def _cards(self, player: int, zone: str) -> List[Card]:
+        card = self.catalog.card
+        return [card(int(card_id)) for card_id in self.zone_ids(player, zone)]
+
+    def to_state(self) -> GameState:
+        """Unpack into a regular ``GameState``.
+
+        Returns:
+            A new GameState sharing the interned Card objects
+        """
+        scalar = self.scalar
+        players: List[PlayerState] = []
+        for player_idx in range(2):
+            weapon = self.static.weapons[player_idx]
+            if weapon is not None:
+                weapon = weapon.clone()
+                weapon.used_this_turn = bool(self.player_scalar(player_idx, "weapon_used"))
+            players.append(
+                PlayerState(
+                    life=self.player_scalar(player_idx, "life"),
+                    deck=self._cards(player_idx, "deck"),
+                    hand=self._cards(player_idx, "hand"),
+                    grave=self._cards(player_idx, "grave"),
+                    pitched=self._cards(player_idx, "pitched"),
+                    arsenal=self._cards(player_idx, "arsenal"),
+                    hero=self.static.heroes[player_idx],
+                    weapon=weapon,
+                    attacks_this_turn=self.player_scalar(player_idx, "attacks_this_turn"),
+                    hero_text=self.static.hero_texts[player_idx],
+                    hero_modifiers=self.static.hero_modifiers[player_idx],
+                )
+            )
+
+        last_attack_id = scalar("last_attack_card")
+        start = self.layout.reaction_arsenal_offset
+        reaction_ids = self.buffer[start:start + scalar("reaction_arsenal_count")]
+        return GameState(
+            players=players,
+            turn=scalar("turn"),
+            phase=PHASES[scalar("phase")],
+            awaiting_defense=bool(scalar("awaiting_defense")),
+            awaiting_arsenal=bool(scalar("awaiting_arsenal")),
+            arsenal_player=_from_opt(scalar("arsenal_player")),
+            pending_attack=scalar("pending_attack"),
+            last_attack_card=None if last_attack_id == NONE else self.catalog.card(last_attack_id),
+            last_pitch_sum=scalar("last_pitch_sum"),
+            action_points=scalar("action_points"),
+            last_attack_had_go_again=bool(scalar("last_attack_had_go_again")),
+            floating_resources=[scalar("floating_0"), scalar("floating_1")],
+            rng_seed=self.static.rng_seed,
+            reaction_actor=_from_opt(scalar("reaction_actor")),
+            reaction_block=scalar("reaction_block"),
+            reaction_arsenal_cards=[self.catalog.card(int(card_id)).name for card_id in reaction_ids],
+            combat_step=COMBAT_STEPS[scalar("combat_step")],
+            combat_priority=_from_opt(scalar("combat_priority")),
+            combat_passes=scalar("combat_passes"),
+            combat_block_total=scalar("combat_block_total"),
+            pending_damage=scalar("pending_damage"),
+        )
+
+
+__all__ = [
+    "CompactGameState",
+    "CompactLayout",
+    "CompactStatic",
+    "DEFAULT_LAYOUT",
+]
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
+import copy
 import json
 import os
 import random
-import copy
-from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+from .catalog import intern_card
 from .config import DEFAULT_DECK_DIR
 from .models import Card
+from .io.card_bundle import reset_active_bundle
 from .io.card_yaml import (
     YAML_AVAILABLE,
+    card_yaml_path,
     extract_abilities,
     load_card_from_yaml,
     normalize_abilities,
@@ -17,6 +21,7 @@ from .io.card_yaml import (
 )
 
 DeckLoadResult = Tuple[List[Card], Dict[str, Any]]
+FileStamp = Optional[Tuple[int, int]]
 _yaml_hint_emitted = False
 
 
@@ -33,8 +38,7 @@ def _emit_yaml_hint_once() -> None:
     print("Install pyyaml to use YAML card library")
 
 
-def hydrate_card_entry(entry: Dict[str, Any]) -> Card:
-    name = str(entry.get("name", "Card"))
+def _entry_color(entry: Dict[str, Any]) -> Optional[str]:
     color_value = entry.get("color")
     color = str(color_value).lower() if color_value else None
 
@@ -44,6 +48,12 @@ def hydrate_card_entry(entry: Dict[str, Any]) -> Card:
             color = pitch_to_color(int(pitch_value))
         except Exception:
             color = None
+    return color
+
+
+def hydrate_card_entry(entry: Dict[str, Any]) -> Card:
+    name = str(entry.get("name", "Card"))
+    color = _entry_color(entry)
 
     yaml_data = load_card_from_yaml(name, color)
     if yaml_data is None and not YAML_AVAILABLE:
@@ -99,38 +109,26 @@ def hydrate_card_entry(entry: Dict[str, Any]) -> Card:
     if yaml_data:
         name = yaml_data.get("name", name)
 
-    return Card(
-        name=name,
-        cost=cost,
-        attack=attack,
-        defense=defense,
-        pitch=pitch,
-        keywords=_keywords_list(),
-        text=text,
-        abilities=_abilities_dict(),
+    return intern_card(
+        Card(
+            name=name,
+            cost=cost,
+            attack=attack,
+            defense=defense,
+            pitch=pitch,
+            keywords=_keywords_list(),
+            text=text,
+            abilities=_abilities_dict(),
+        )
     )
 
 
-def load_deck_from_json(path: str) -> DeckLoadResult:
-    data = _read_deck_json(path)
+def _hydrate_deck_data(data: dict) -> DeckLoadResult:
     deck: List[Card] = []
     for entry in data.get("cards", []):
         count = int(entry.get("count", 1))
-        template = hydrate_card_entry(entry)
-        for _ in range(count):
-            deck.append(
-                Card(
-                    name=template.name,
-                    cost=template.cost,
-                    attack=template.attack,
-                    defense=template.defense,
-                    pitch=template.pitch,
-                    keywords=list(template.keywords),
-                    text=template.text,
-                    abilities=copy.deepcopy(template.abilities),
-                )
-            )
-    random.shuffle(deck)
+        # Cards are immutable and interned, so every copy shares one instance.
+        deck.extend([hydrate_card_entry(entry)] * count)
     meta = {
         "name": data.get("name"),
         "format": data.get("format"),
@@ -141,6 +139,126 @@ def load_deck_from_json(path: str) -> DeckLoadResult:
     return deck, meta
 
 
+def load_deck_from_json(path: str, rng: Optional[random.Random] = None) -> DeckLoadResult:
+    deck, meta = _hydrate_deck_data(_read_deck_json(path))
+    (rng or random).shuffle(deck)
+    return deck, meta
+
+
+def _file_stamp(path: str) -> FileStamp:
+    """Return (mtime_ns, size) of ``path``, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _card_sources(data: dict) -> Tuple[Tuple[str, FileStamp], ...]:
+    """Stamp every card YAML path that hydrating ``data`` consults, present or not."""
+    paths = set()
+    for entry in data.get("cards", []):
+        color = _entry_color(entry)
+        if color:
+            paths.add(card_yaml_path(str(entry.get("name", "Card")), color))
+    return tuple((path, _file_stamp(path)) for path in sorted(paths))
+
+
+@dataclass(frozen=True)
+class DeckTemplate:
+    """A deck file hydrated once, in file order.
+
+    Attributes:
+        path: Deck JSON path
+        mtime_ns: Modification time of the file when it was hydrated
+        size: File size when it was hydrated
+        cards: Interned cards in file order (unshuffled)
+        meta: Deck metadata as returned by ``load_deck_from_json``
+        sources: Card YAML paths consulted during hydration with their
+            (mtime_ns, size), or None for paths that did not exist
+    """
+
+    path: str
+    mtime_ns: int
+    size: int
+    cards: Tuple[Card, ...]
+    meta: Dict[str, Any]
+    sources: Tuple[Tuple[str, FileStamp], ...] = ()
+
+    def sources_current(self) -> bool:
+        """Whether every card YAML file still has the stamp it had at hydration."""
+        return all(_file_stamp(path) == stamp for path, stamp in self.sources)
+
+    def instantiate(self, rng: Optional[random.Random] = None) -> DeckLoadResult:
+        """Return a shuffled deck list and a private copy of the metadata.
+
+        Shuffling consumes ``rng`` exactly like ``load_deck_from_json`` does.
+        """
+        deck = list(self.cards)
+        (rng or random).shuffle(deck)
+        return deck, copy.deepcopy(self.meta)
+
+
+class DeckCache:
+    """Hydrates each deck file once and revalidates it against the mtime and size
+    of the deck file and of every card YAML file it was hydrated from."""
+
+    def __init__(self) -> None:
+        self._templates: Dict[str, DeckTemplate] = {}
+
+    def template(self, path: str) -> DeckTemplate:
+        """Return the template for ``path``, rehydrating it if the file changed.
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        key = os.path.abspath(path)
+        stat = os.stat(key)
+        cached = self._templates.get(key)
+        if cached is not None and cached.mtime_ns == stat.st_mtime_ns and cached.size == stat.st_size:
+            if cached.sources_current():
+                return cached
+            # A card file changed, so the process-wide bundle may be stale as well.
+            reset_active_bundle()
+        data = _read_deck_json(key)
+        # Stamped before hydrating: an edit made meanwhile is caught by the next call.
+        sources = _card_sources(data)
+        cards, meta = _hydrate_deck_data(data)
+        template = DeckTemplate(key, stat.st_mtime_ns, stat.st_size, tuple(cards), meta, sources)
+        self._templates[key] = template
+        return template
+
+    def load(self, path: str, rng: Optional[random.Random] = None) -> DeckLoadResult:
+        """Cached equivalent of ``load_deck_from_json``."""
+        return self.template(path).instantiate(rng)
+
+    def preload(self, paths: Iterable[str]) -> List[DeckTemplate]:
+        """Hydrate every deck in ``paths`` up front (e.g. before forking workers)."""
+        return [self.template(path) for path in paths]
+
+    def clear(self) -> None:
+        self._templates.clear()
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+
+DECK_CACHE = DeckCache()
+
+
+def load_deck_cached(path: str, rng: Optional[random.Random] = None) -> DeckLoadResult:
+    """Load a deck through the shared ``DECK_CACHE``.
+
+    Args:
+        path: Deck JSON path
+        rng: RNG used to shuffle the deck (module ``random`` when omitted)
+
+    Returns:
+        Tuple of (shuffled card list, metadata)
+    """
+    return DECK_CACHE.load(path, rng)
+
+
 def get_hero_ability(path: str) -> Optional[str]:
     data = _read_deck_json(path)
     ability = data.get("hero_ability")
@@ -228,7 +346,11 @@ def prompt_pick_deck(player_label: str, discovered: List[str]) -> Optional[DeckL
 
 
 __all__ = [
+    "DECK_CACHE",
+    "DeckCache",
     "DeckLoadResult",
+    "DeckTemplate",
+    "load_deck_cached",
     "load_deck_from_json",
     "hydrate_card_entry",
     "get_hero_ability",
@@ -5,7 +5,7 @@ import random
 from typing import Any, Dict, List, Optional, Set, Tuple
 
 from .action_enumeration import ActionEnumerator
-from .action_execution import ActionExecutor, _check_term, _end_and_pass_turn
+from .action_execution import ActionExecutor, UndoRecord, _check_term, _end_and_pass_turn
 from .game_initialization import new_game
 from .config import DEFEND_MAX, INTELLECT, MAX_PITCH_ENUM
 from .models import Action, ActType, Card, CombatStep, Game, GameState, Phase, PlayerState, Weapon
@@ -44,24 +44,50 @@ def enumerate_legal_actions(gs: GameState) -> List[Action]:
 def _apply_action_impl(state: GameState, act: Action) -> Tuple[GameState, bool, dict]:
     return ActionExecutor(state, act).execute()
 
+def _illegal_action_event(gs: GameState, act: Action, exc: ValueError, original_ap: int) -> dict:
+    action_label = act.typ.name if isinstance(act.typ, ActType) else str(act.typ)
+    return {
+        "type": "illegal_action",
+        "action": action_label,
+        "reason": str(exc),
+        "phase": gs.phase.name,
+        "combat_step": gs.combat_step.name,
+        "awaiting_defense": gs.awaiting_defense,
+        "refunded_action_points": original_ap,
+    }
+
+
 def apply_action(gs: GameState, act: Action) -> Tuple[GameState, bool, dict]:
-    state = gs.copy()
+    state = gs.clone()
     original_ap = gs.action_points
     try:
         return _apply_action_impl(state, act)
     except ValueError as exc:
-        action_label = act.typ.name if isinstance(act.typ, ActType) else str(act.typ)
-        reverted = gs.copy()
+        reverted = gs.clone()
         reverted.action_points = original_ap
-        return reverted, _check_term(reverted), {
-            "type": "illegal_action",
-            "action": action_label,
-            "reason": str(exc),
-            "phase": gs.phase.name,
-            "combat_step": gs.combat_step.name,
-            "awaiting_defense": gs.awaiting_defense,
-            "refunded_action_points": original_ap,
-        }
+        return reverted, _check_term(reverted), _illegal_action_event(gs, act, exc, original_ap)
+
+
+def apply_action_inplace(gs: GameState, act: Action) -> Tuple[bool, dict, UndoRecord]:
+    """Apply ``act`` directly to ``gs`` and return a record that can undo it.
+
+    This is the mutating counterpart of ``apply_action`` for search and rollouts:
+    no state copy is made, and ``undo_action(gs, record)`` restores ``gs`` exactly.
+    Illegal actions leave ``gs`` unchanged and report an ``illegal_action`` event.
+    """
+    undo = UndoRecord(gs)
+    original_ap = gs.action_points
+    try:
+        _, done, events = ActionExecutor(gs, act, undo).execute()
+    except ValueError as exc:
+        undo.restore(gs)
+        return _check_term(gs), _illegal_action_event(gs, act, exc, original_ap), undo
+    return done, events, undo
+
+
+def undo_action(gs: GameState, undo: UndoRecord) -> None:
+    """Roll back an action previously applied with ``apply_action_inplace``."""
+    undo.restore(gs)
 
 
 # Helper functions moved to action_execution.py
@@ -72,4 +98,6 @@ __all__ = [
     "current_actor_index",
     "enumerate_legal_actions",
     "apply_action",
+    "apply_action_inplace",
+    "undo_action",
 ]
@@ -17,6 +17,7 @@ from .config import (
     RANDOM_CARD_DEFENSES,
     RANDOM_CARD_PITCH_VALUES,
 )
+from .catalog import intern_card
 from .models import Card, Game, GameState, Phase, PlayerState, Weapon
 from .io.hero_yaml import load_hero_from_yaml
 from .io.weapon_yaml import load_weapon_from_arena
@@ -43,12 +44,14 @@ def make_random_deck(rng: random.Random) -> List[Card]:
         defense = rng.choice(RANDOM_CARD_DEFENSES)
         pitch = rng.choice(RANDOM_CARD_PITCH_VALUES)
         deck.append(
-            Card(
-                name=f"Strike{cost}-{attack}-{pitch}",
-                cost=cost,
-                attack=attack,
-                defense=defense,
-                pitch=pitch,
+            intern_card(
+                Card(
+                    name=f"Strike{cost}-{attack}-{pitch}",
+                    cost=cost,
+                    attack=attack,
+                    defense=defense,
+                    pitch=pitch,
+                )
             )
         )
 
@@ -57,12 +60,14 @@ def make_random_deck(rng: random.Random) -> List[Card]:
         defense = rng.choice(RANDOM_CARD_DEFENSES)
         pitch = rng.choice(RANDOM_CARD_PITCH_VALUES)
         deck.append(
-            Card(
-                name=f"BlockRes{i + 1}-{pitch}",
-                cost=0,
-                attack=0,
-                defense=defense,
-                pitch=pitch,
+            intern_card(
+                Card(
+                    name=f"BlockRes{i + 1}-{pitch}",
+                    cost=0,
+                    attack=0,
+                    defense=defense,
+                    pitch=pitch,
+                )
             )
         )
 
@@ -0,0 +1,232 @@
+"""Batched policy inference shared by many concurrent games.
+
+``InferenceServer`` owns one loaded policy and a worker thread. Games submit
+(observation, legal mask) requests from any thread, or await them from asyncio,
+and the worker coalesces whatever is pending into one batched forward pass. It
+waits at most ``max_latency`` seconds after the first request of a batch for
+more requests to arrive.
+
+The server has the same ``select_action`` method as the policies in
+``fabgame.agents_ml``, so it can be passed wherever a policy is accepted, e.g.
+``MLAgent(policy=server)`` or ``ml_bot_choose_action(state, policy=server)``.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from typing import Any, Dict, List, NamedTuple, Optional, Protocol, Sequence, Union
+
+try:  # pragma: no cover - dependency guard
+    import numpy as np
+except ImportError as exc:  # pragma: no cover
+    raise RuntimeError("fabgame.inference requires numpy to be installed") from exc
+
+logger = logging.getLogger(__name__)
+
+Observation = Union[np.ndarray, Dict[str, np.ndarray]]
+
+
+class BatchPolicy(Protocol):
+    """A policy that can score several observations at once (``TorchPolicy``, ``SB3Policy``)."""
+
+    def select_actions(
+        self, observations: Sequence[Observation], masks: np.ndarray, deterministic: bool = True
+    ) -> np.ndarray:
+        ...
+
+
+class _Request(NamedTuple):
+    obs: Observation
+    mask: np.ndarray
+    deterministic: bool
+    future: "Future[int]"
+
+
+def _fail(future: "Future[int]", exc: BaseException) -> None:
+    """Resolve ``future`` with ``exc`` unless it already finished or was cancelled."""
+    if not future.done():
+        try:
+            future.set_exception(exc)
+        except InvalidStateError:  # resolved concurrently
+            pass
+
+
+class InferenceServer:
+    """Serves action requests from many games with micro-batched inference.
+
+    Attributes:
+        policy: Policy used for every batch
+        max_batch_size: Largest number of requests evaluated together
+        max_latency: Seconds a batch waits for more requests after its first one
+        batches: Number of forward passes run so far
+        requests: Number of requests served so far
+    """
+
+    def __init__(self, policy: BatchPolicy, *, max_batch_size: int = 64, max_latency: float = 0.002) -> None:
+        """Create the server; its worker thread starts on the first request.
+
+        Args:
+            policy: Loaded policy implementing ``select_actions``
+            max_batch_size: Largest batch passed to the policy
+            max_latency: Seconds to wait for a batch to fill up
+
+        Raises:
+            ValueError: If ``max_batch_size`` is below 1 or ``max_latency`` is negative
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_latency < 0:
+            raise ValueError("max_latency must not be negative")
+        self.policy = policy
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.batches = 0
+        self.requests = 0
+        self._queue: "queue.SimpleQueue[Optional[_Request]]" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def __enter__(self) -> "InferenceServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def start(self) -> "InferenceServer":
+        """Start the worker thread if it is not running yet.
+
+        Raises:
+            RuntimeError: If the server was closed
+        """
+        with self._lock:
+            self._start_locked()
+        return self
+
+    def _start_locked(self) -> None:
+        if self._closed:
+            raise RuntimeError("InferenceServer is closed")
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="fabgame-inference", daemon=True)
+            self._thread.start()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Serve the requests already submitted, then stop the worker thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+            self._queue.put(None)
+        if thread is not None:
+            thread.join(timeout)
+
+    def submit(self, obs: Observation, mask: np.ndarray, deterministic: bool = True) -> "Future[int]":
+        """Queue one request.
+
+        Args:
+            obs: Dict or flat observation of the acting player; it is read by the
+                worker thread, so do not overwrite it before the future resolves
+            mask: Legal action mask
+            deterministic: Take the arg-max action instead of sampling
+
+        Returns:
+            Future resolving to the selected action index
+
+        Raises:
+            RuntimeError: If the server was closed
+        """
+        future: "Future[int]" = Future()
+        with self._lock:
+            self._start_locked()
+            self._queue.put(_Request(obs, np.asarray(mask), bool(deterministic), future))
+        return future
+
+    def select_action(self, obs: Observation, mask: np.ndarray, deterministic: bool = True) -> int:
+        """Blocking form of ``submit``, matching ``TorchPolicy.select_action``."""
+        return self.submit(obs, mask, deterministic).result()
+
+    async def select_action_async(self, obs: Observation, mask: np.ndarray, deterministic: bool = True) -> int:
+        """Awaitable form of ``submit`` for asyncio game loops."""
+        return await asyncio.wrap_future(self.submit(obs, mask, deterministic))
+
+    def _run(self) -> None:
+        batch: List[_Request] = []
+        try:
+            stopping = False
+            while not stopping:
+                first = self._queue.get()
+                if first is None:
+                    break
+                batch = [first]
+                deadline = time.perf_counter() + self.max_latency
+                while len(batch) < self.max_batch_size:
+                    remaining = deadline - time.perf_counter()
+                    try:
+                        item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stopping = True
+                        break
+                    batch.append(item)
+                self._serve(batch)
+                batch = []
+        except BaseException as exc:
+            # Nobody would serve later requests, so close the server and fail everything queued.
+            logger.exception("InferenceServer worker stopped unexpectedly")
+            error = RuntimeError("InferenceServer worker stopped unexpectedly")
+            error.__cause__ = exc
+            with self._lock:
+                self._closed = True
+            for request in batch:
+                _fail(request.future, error)
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    _fail(item.future, error)
+
+    def _serve(self, batch: List[_Request]) -> None:
+        """Answer every request in ``batch``; failures are delivered to the callers' futures."""
+        try:
+            live = [request for request in batch if request.future.set_running_or_notify_cancel()]
+            for deterministic in (True, False):
+                group = [request for request in live if request.deterministic is deterministic]
+                if group:
+                    self._serve_group(group, deterministic)
+        except Exception as exc:
+            for request in batch:
+                _fail(request.future, exc)
+
+    def _serve_group(self, group: List[_Request], deterministic: bool) -> None:
+        try:
+            actions = self.policy.select_actions(
+                [request.obs for request in group],
+                np.stack([request.mask for request in group]),
+                deterministic=deterministic,
+            )
+            if len(actions) != len(group):
+                raise RuntimeError(f"Policy returned {len(actions)} actions for {len(group)} requests")
+            results = [int(action) for action in actions]
+        except Exception as exc:  # deliver failures to the callers instead of killing the worker
+            for request in group:
+                _fail(request.future, exc)
+            return
+        self.batches += 1
+        self.requests += len(group)
+        for request, action in zip(group, results):
+            if not request.future.done():
+                try:
+                    request.future.set_result(action)
+                except InvalidStateError:  # resolved concurrently
+                    pass
+
+
+__all__ = ["BatchPolicy", "InferenceServer"]
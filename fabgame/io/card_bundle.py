@@ -0,0 +1,238 @@
+"""Precompiled card library bundle.
+
+``build_bundle`` parses every YAML file under the card, hero and weapon
+directories once and stores the raw documents and the normalized card records
+returned by ``load_card_from_yaml`` in a single JSON file together with a
+SHA-256 hash of the YAML sources. Vocabularies (e.g. the RL encoder's keyword
+and hero lists) are derived from the documents by their consumers.
+
+At runtime ``active_bundle`` loads that file once and only uses it while the
+hash still matches the files on disk (hashing is much cheaper than parsing);
+otherwise every loader falls back to reading YAML as before.
+
+Build it with ``python -m scripts.build_card_bundle``.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+try:  # pragma: no cover - optional dependency
+    import yaml  # type: ignore
+except Exception:  # pragma: no cover
+    yaml = None  # type: ignore
+
+BUNDLE_FORMAT = "fabgame-card-bundle"
+BUNDLE_VERSION = 1
+BUNDLE_PATH = os.environ.get("FAB_CARD_BUNDLE", "data/card_bundle.json")
+_COLORS = ("red", "yellow", "blue")
+
+
+def _directories() -> Dict[str, str]:
+    # Read the loaders' module globals at call time so overrides are respected.
+    from . import card_yaml, hero_yaml, weapon_yaml
+
+    return {
+        "cards": os.path.normpath(card_yaml.CARDS_DIR),
+        "heroes": os.path.normpath(hero_yaml.HERO_DIR),
+        "weapons": os.path.normpath(weapon_yaml.WEAPONS_DIR),
+    }
+
+
+def _yaml_files(directories: Dict[str, str]) -> List[str]:
+    paths = set()
+    for directory in directories.values():
+        if os.path.isdir(directory):
+            for filename in os.listdir(directory):
+                if filename.endswith(".yaml"):
+                    paths.add(os.path.join(directory, filename))
+    return sorted(paths)
+
+
+def content_hash(directories: Optional[Dict[str, str]] = None) -> str:
+    """Hash the names and bytes of every YAML source file."""
+    digest = hashlib.sha256()
+    for path in _yaml_files(directories or _directories()):
+        digest.update(path.replace(os.sep, "/").encode("utf-8"))
+        digest.update(b"\0")
+        with open(path, "rb") as handle:
+            digest.update(handle.read())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def build_bundle(directories: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Parse every YAML source into a JSON-serializable bundle.
+
+    Args:
+        directories: ``cards``/``heroes``/``weapons`` directories (loader defaults when omitted)
+
+    Returns:
+        Bundle dictionary
+
+    Raises:
+        RuntimeError: If PyYAML is not installed
+    """
+    if yaml is None:
+        raise RuntimeError("Building a card bundle requires pyyaml to be installed")
+    from .card_yaml import _apply_schema_defaults, normalize_abilities
+
+    directories = {kind: os.path.normpath(path) for kind, path in (directories or _directories()).items()}
+    documents: Dict[str, Dict[str, Any]] = {}
+    cards: Dict[str, Dict[str, Any]] = {}
+    for path in _yaml_files(directories):
+        with open(path, "r", encoding="utf-8") as handle:
+            data = yaml.safe_load(handle) or {}
+        key = path.replace(os.sep, "/")
+        documents[key] = data
+        if not isinstance(data, dict):
+            continue
+        stem = os.path.splitext(os.path.basename(path))[0]
+        color = stem.rsplit("_", 1)[-1]
+        if os.path.dirname(path) != directories["cards"] or color not in _COLORS:
+            continue
+        try:
+            record = _apply_schema_defaults(data, color=color)
+            if "abilities" in record:
+                record["abilities"] = normalize_abilities(record["abilities"])
+        except Exception:
+            # Leave invalid cards to the YAML path so the original error is raised there.
+            continue
+        cards[key] = record
+
+    bundle = {
+        "format": BUNDLE_FORMAT,
+        "version": BUNDLE_VERSION,
+        "content_hash": content_hash(directories),
+        "directories": {kind: path.replace(os.sep, "/") for kind, path in directories.items()},
+        "documents": documents,
+        "cards": cards,
+    }
+    # Round-trip so the in-memory bundle matches what loaders read back.
+    return json.loads(json.dumps(bundle))
+
+
+def write_bundle(path: str = BUNDLE_PATH, directories: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Build the bundle and write it to ``path``."""
+    bundle = build_bundle(directories)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(bundle, handle, ensure_ascii=False, sort_keys=True)
+    return bundle
+
+
+class CardBundle:
+    """A loaded bundle that matched the YAML sources when it was opened."""
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self.data = data
+        self.content_hash: str = data["content_hash"]
+        self.directories: Dict[str, str] = data["directories"]
+        self._documents: Dict[str, Dict[str, Any]] = data["documents"]
+        self._cards: Dict[str, Dict[str, Any]] = data["cards"]
+
+    def covers(self, path: str) -> bool:
+        """Whether ``path`` lies in one of the bundled directories."""
+        return os.path.dirname(os.path.normpath(path)).replace(os.sep, "/") in self.directories.values()
+
+    def document(self, path: str) -> Any:
+        """Return a copy of the parsed document at ``path``, or None if no such file was bundled.
+
+        Only meaningful for paths where ``covers`` is true.
+        """
+        return copy.deepcopy(self._documents.get(os.path.normpath(path).replace(os.sep, "/")))
+
+    def card_record(self, path: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the normalized card record for ``path``, if one was compiled."""
+        record = self._cards.get(os.path.normpath(path).replace(os.sep, "/"))
+        return copy.deepcopy(record) if record is not None else None
+
+    def documents_in(self, directory: str, prefix: str = "") -> Iterable[Any]:
+        """Yield copies of every document in ``directory`` whose file name starts with ``prefix``."""
+        directory = os.path.normpath(directory).replace(os.sep, "/")
+        for key, data in self._documents.items():
+            head, filename = key.rsplit("/", 1)
+            if head == directory and filename.startswith(prefix):
+                yield copy.deepcopy(data)
+
+
+_UNSET = object()
+_active: Any = _UNSET
+
+
+def load_bundle(path: str = BUNDLE_PATH) -> Optional[CardBundle]:
+    """Load the bundle at ``path`` if it exists and matches the current YAML sources."""
+    if not os.path.isfile(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            data = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    if data.get("format") != BUNDLE_FORMAT or data.get("version") != BUNDLE_VERSION:
+        return None
+    directories = _directories()
+    if data.get("directories") != {kind: path.replace(os.sep, "/") for kind, path in directories.items()}:
+        return None
+    if data.get("content_hash") != content_hash(directories):
+        return None
+    return CardBundle(data)
+
+
+def active_bundle() -> Optional[CardBundle]:
+    """Return the process-wide bundle, loading and validating it on first use."""
+    global _active
+    if _active is _UNSET:
+        _active = load_bundle()
+    return _active
+
+
+def reset_active_bundle() -> None:
+    """Forget the process-wide bundle so the next access revalidates it."""
+    global _active
+    _active = _UNSET
+
+
+def yaml_documents(directory: str, prefix: str = "") -> List[Dict[str, Any]]:
+    """Return the mapping documents of ``directory/<prefix>*.yaml``.
+
+    Served from the active bundle when it covers ``directory``; otherwise each
+    file is parsed with PyYAML (unreadable or non-mapping files are skipped).
+    """
+    bundle = active_bundle()
+    if bundle is not None and bundle.covers(os.path.join(directory, "_.yaml")):
+        return [data for data in bundle.documents_in(directory, prefix) if isinstance(data, dict)]
+    if yaml is None or not os.path.isdir(directory):
+        return []
+    documents: List[Dict[str, Any]] = []
+    for filename in sorted(os.listdir(directory)):
+        if not (filename.startswith(prefix) and filename.endswith(".yaml")):
+            continue
+        try:
+            with open(os.path.join(directory, filename), "r", encoding="utf-8") as handle:
+                data = yaml.safe_load(handle) or {}
+        except Exception:
+            continue
+        if isinstance(data, dict):
+            documents.append(data)
+    return documents
+
+
+__all__ = [
+    "BUNDLE_FORMAT",
+    "BUNDLE_PATH",
+    "BUNDLE_VERSION",
+    "CardBundle",
+    "active_bundle",
+    "build_bundle",
+    "content_hash",
+    "load_bundle",
+    "reset_active_bundle",
+    "write_bundle",
+    "yaml_documents",
+]
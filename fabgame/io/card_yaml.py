@@ -10,6 +10,7 @@ try:  # pragma: no cover - optional dependency
 except Exception:  # pragma: no cover - PyYAML not installed
     yaml = None  # type: ignore
 
+from .card_bundle import active_bundle
 
 CARDS_DIR = os.environ.get("FAB_CARDS_DIR", "data/cards")
 YAML_AVAILABLE = yaml is not None
@@ -103,15 +104,22 @@ def _apply_schema_defaults(data: Dict[str, Any], *, color: Optional[str]) -> Dic
 
 
 def load_card_from_yaml(name: str, color: Optional[str]) -> Optional[Dict[str, Any]]:
-    if not YAML_AVAILABLE:
-        return None
     if not color:
         return None
     path = card_yaml_path(name, color)
-    if not os.path.isfile(path):
-        return None
-    with open(path, "r", encoding="utf-8") as handle:
-        data = yaml.safe_load(handle) or {}
+    bundle = active_bundle()
+    if bundle is not None and bundle.covers(path):
+        record = bundle.card_record(path)
+        if record is not None:
+            return record
+        data = bundle.document(path)
+        if data is None:
+            return None
+    else:
+        if not YAML_AVAILABLE or not os.path.isfile(path):
+            return None
+        with open(path, "r", encoding="utf-8") as handle:
+            data = yaml.safe_load(handle) or {}
     if not isinstance(data, dict):
         raise ValueError(f"Card YAML at {path} must be a mapping")
     try:
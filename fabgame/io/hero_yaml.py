@@ -8,6 +8,7 @@ try:  # pragma: no cover - optional dependency
 except Exception:  # pragma: no cover
     yaml = None  # type: ignore
 
+from .card_bundle import active_bundle
 from .card_yaml import CARDS_DIR, YAML_AVAILABLE, slugify
 
 HERO_DIR = os.environ.get("FAB_HERO_DIR", "data/heroes")
@@ -23,13 +24,17 @@ def _candidate_paths(name: str) -> list[str]:
 
 
 def load_hero_from_yaml(name: str) -> Optional[Dict[str, Any]]:
-    if not YAML_AVAILABLE or yaml is None:
-        return None
+    bundle = active_bundle()
     for path in _candidate_paths(name):
-        if not os.path.isfile(path):
-            continue
-        with open(path, "r", encoding="utf-8") as handle:
-            data = yaml.safe_load(handle) or {}
+        if bundle is not None and bundle.covers(path):
+            data = bundle.document(path)
+            if data is None:
+                continue
+        else:
+            if not YAML_AVAILABLE or yaml is None or not os.path.isfile(path):
+                continue
+            with open(path, "r", encoding="utf-8") as handle:
+                data = yaml.safe_load(handle) or {}
         if not isinstance(data, dict):
             raise ValueError(f"Invalid hero YAML (expected mapping): {path}")
         return data
@@ -13,6 +13,7 @@ try:  # pragma: no cover - optional dependency
 except Exception:  # pragma: no cover
     yaml = None  # type: ignore
 
+from .card_bundle import active_bundle
 from .card_yaml import YAML_AVAILABLE, slugify
 from ..models import Weapon
 
@@ -45,14 +46,17 @@ def load_weapon_from_yaml(name: str) -> Optional[Dict[str, Any]]:
     Returns:
         Dictionary of weapon data, or None if not found or YAML unavailable
     """
-    if not YAML_AVAILABLE or yaml is None:
-        return None
-
+    bundle = active_bundle()
     for path in _candidate_paths(name):
-        if not os.path.isfile(path):
-            continue
-        with open(path, "r", encoding="utf-8") as handle:
-            data = yaml.safe_load(handle) or {}
+        if bundle is not None and bundle.covers(path):
+            data = bundle.document(path)
+            if data is None:
+                continue
+        else:
+            if not YAML_AVAILABLE or yaml is None or not os.path.isfile(path):
+                continue
+            with open(path, "r", encoding="utf-8") as handle:
+                data = yaml.safe_load(handle) or {}
         if not isinstance(data, dict):
             raise ValueError(f"Invalid weapon YAML (expected mapping): {path}")
         return data
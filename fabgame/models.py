@@ -1,24 +1,45 @@
 from __future__ import annotations
 
 import copy
+import sys
 from dataclasses import dataclass, field
 from enum import Enum, IntEnum
-from typing import Any, Dict, List, NamedTuple, Optional
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
 from .config import INTELLECT, STARTING_LIFE
 
+# ``slots=`` is only understood by dataclasses on Python 3.10+.
+_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(frozen=True, **_SLOTS)
 class Card:
+    """Immutable card definition.
+
+    Cards are shared between zones, game states and copies of a deck, so they
+    must never be mutated; ``abilities`` is treated as read-only as well.
+    Identical definitions are interned by ``fabgame.catalog.CARD_CATALOG``.
+    """
+
     name: str
     cost: int = 0
     attack: int = 0
     defense: int = 0
     pitch: int = 1
-    keywords: List[str] = field(default_factory=list)
+    keywords: Tuple[str, ...] = field(default_factory=tuple)
     text: str = ""
     abilities: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
 
+    def __post_init__(self) -> None:
+        if not isinstance(self.keywords, tuple):
+            object.__setattr__(self, "keywords", tuple(self.keywords))
+
+    def __copy__(self) -> "Card":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "Card":
+        return self
+
     def is_attack(self) -> bool:
         return self.attack > 0
 
@@ -63,6 +84,17 @@ class Weapon:
         """Convenience helper mirroring card lookup semantics."""
         return self.has_keyword("go_again")
 
+    def clone(self) -> "Weapon":
+        """Copy the per-turn usage flag while sharing keyword metadata."""
+        return Weapon(
+            name=self.name,
+            base_attack=self.base_attack,
+            cost=self.cost,
+            once_per_turn=self.once_per_turn,
+            used_this_turn=self.used_this_turn,
+            keywords=self.keywords,
+        )
+
 
 @dataclass
 class PlayerState:
@@ -86,6 +118,22 @@ class PlayerState:
         while self.pitched:
             self.deck.insert(0, self.pitched.pop())
 
+    def clone(self) -> "PlayerState":
+        """Duplicate zone lists and scalars; Card objects and hero data are shared."""
+        return PlayerState(
+            life=self.life,
+            deck=list(self.deck),
+            hand=list(self.hand),
+            grave=list(self.grave),
+            pitched=list(self.pitched),
+            arsenal=list(self.arsenal),
+            hero=self.hero,
+            weapon=self.weapon.clone() if self.weapon is not None else None,
+            attacks_this_turn=self.attacks_this_turn,
+            hero_text=self.hero_text,
+            hero_modifiers=self.hero_modifiers,
+        )
+
 
 class Phase(Enum):
     SOT = "sot"
@@ -149,6 +197,20 @@ class GameState:
     def copy(self) -> "GameState":
         return copy.deepcopy(self)
 
+    def clone(self) -> "GameState":
+        """Cheap structural copy used by the engine on every step.
+
+        Cards are never mutated after hydration, so they are shared between the
+        original and the clone; only zone lists, the weapon usage flag and the
+        per-state lists are duplicated. Use ``copy()`` for a fully independent
+        deep copy.
+        """
+        state = copy.copy(self)
+        state.players = [player.clone() for player in self.players]
+        state.floating_resources = list(self.floating_resources)
+        state.reaction_arsenal_cards = list(self.reaction_arsenal_cards)
+        return state
+
 
 @dataclass
 class Game:
@@ -9,21 +9,69 @@ Modules exposed:
     action_mask          - Action vocabulary and legal action masking helpers.
     yaml_features        - Card metadata feature extraction from YAML definitions.
     observation_builder  - Builder for constructing observation spaces.
+    vec_env              - Batched environment stepping several games together.
+    dataset              - Chunked, memory-mapped self-play dataset storage.
+
+Every export is imported on first access: importing ``fabgame.rl`` alone does
+not build the action vocabulary or scan the card YAML library.
 """
 
-from .action_mask import ACTION_VOCAB, ActionVocabulary, legal_action_mask
-from .encoding import encode_observation, EncoderConfig
-from .env import FabgameEnv, FabgameEnvState
-from .observation_builder import ObservationSpaceBuilder, build_fabgame_observation_space
+import importlib
+from typing import Any, Dict, List
+
+# Public name -> submodule that defines it.
+_LAZY_ATTRIBUTES: Dict[str, str] = {
+    "ACTION_VOCAB": ".action_mask",
+    "ActionVocabulary": ".action_mask",
+    "LegalActionSet": ".action_mask",
+    "enumerate_legal_indices": ".action_mask",
+    "legal_action_mask": ".action_mask",
+    "ChunkedDatasetWriter": ".dataset",
+    "SelfPlayDataset": ".dataset",
+    "EncoderConfig": ".encoding",
+    "ObservationEncoder": ".encoding",
+    "ObservationLayout": ".encoding",
+    "encode_flat_observation": ".encoding",
+    "encode_observation": ".encoding",
+    "observation_layout": ".encoding",
+    "FabgameEnv": ".env",
+    "FabgameEnvState": ".env",
+    "ObservationSpaceBuilder": ".observation_builder",
+    "build_fabgame_observation_space": ".observation_builder",
+    "FabgameVecEnv": ".vec_env",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 
 __all__ = [
     "ACTION_VOCAB",
     "ActionVocabulary",
+    "ChunkedDatasetWriter",
     "EncoderConfig",
     "FabgameEnv",
     "FabgameEnvState",
+    "FabgameVecEnv",
+    "LegalActionSet",
+    "ObservationEncoder",
+    "ObservationLayout",
+    "SelfPlayDataset",
+    "encode_flat_observation",
     "encode_observation",
+    "enumerate_legal_indices",
     "legal_action_mask",
+    "observation_layout",
     "ObservationSpaceBuilder",
     "build_fabgame_observation_space",
 ]
@@ -2,15 +2,16 @@ from __future__ import annotations
 
 import itertools
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 try:  # pragma: no cover - dependency guard
     import numpy as np
 except ImportError as exc:  # pragma: no cover - provide actionable message
     raise RuntimeError("fabgame.rl.action_mask requires numpy to be installed") from exc
 
+from ..action_enumeration import ActionEnumerator
 from ..config import DEFEND_MAX, INTELLECT
-from ..models import Action, ActType
+from ..models import Action, ActType, GameState
 
 _SENTINEL_PLAY_IDX = -9999
 
@@ -53,14 +54,22 @@ class ActionVocabulary:
     def __post_init__(self) -> None:
         self._index: Dict[Tuple[int, int, int, int], int] = {}
         self._actions: List[Action] = []
+        # (typ, play_idx) -> list indexed by pitch/defend mask, holding vocab indices or -1.
+        self._tables: Dict[Tuple[ActType, Optional[int]], List[int]] = {}
         self._build()
 
     def _add(self, action: Action) -> None:
         key = _normalize_key(action)
         if key in self._index:
             return
-        self._index[key] = len(self._actions)
+        index = len(self._actions)
+        self._index[key] = index
         self._actions.append(action)
+        table = self._tables.get((action.typ, action.play_idx))
+        if table is None:
+            table = [-1] * (1 << self.max_hand_size)
+            self._tables[(action.typ, action.play_idx)] = table
+        table[action.pitch_mask | action.defend_mask] = index
 
     def _build(self) -> None:
         max_hand = self.max_hand_size
@@ -120,6 +129,21 @@ class ActionVocabulary:
             )
         return self._index[key]
 
+    def index_for_parts(self, typ: ActType, play_idx: Optional[int], pitch_mask: int, defend_mask: int) -> int:
+        """Table lookup equivalent to ``index_for`` without building an Action.
+
+        Raises:
+            KeyError: If the action is outside the configured vocabulary
+        """
+        table = self._tables.get((typ, play_idx))
+        mask = pitch_mask | defend_mask
+        if table is None or mask >= len(table) or table[mask] < 0:
+            raise KeyError(
+                f"Action {Action(typ, play_idx, pitch_mask, defend_mask)} outside configured vocabulary "
+                f"(max_hand={self.max_hand_size}, max_arsenal={self.max_arsenal_size})"
+            )
+        return table[mask]
+
 
 ACTION_VOCAB = ActionVocabulary(max_hand_size=10, max_arsenal_size=4)
 
@@ -132,10 +156,94 @@ def legal_action_mask(actions: Iterable[Action], vocab: ActionVocabulary = ACTIO
     return mask
 
 
-def mask_for_state(state, vocab: ActionVocabulary = ACTION_VOCAB) -> np.ndarray:
-    from ..engine import enumerate_legal_actions
+class LegalActionSet(Sequence):
+    """Legal actions of a state held as vocabulary indices.
+
+    ``indices`` keeps the engine's enumeration order and ``mask`` is the boolean
+    policy mask; Action tuples are only materialized when the set is indexed or
+    iterated.
+    """
+
+    def __init__(self, indices: List[int], mask: np.ndarray, vocab: ActionVocabulary = ACTION_VOCAB) -> None:
+        self.indices = indices
+        self.mask = mask
+        self.vocab = vocab
+        self._actions: Optional[List[Action]] = None
 
-    return legal_action_mask(enumerate_legal_actions(state), vocab=vocab)
+    @property
+    def actions(self) -> List[Action]:
+        if self._actions is None:
+            lookup = self.vocab.action_for_index
+            self._actions = [lookup(index) for index in self.indices]
+        return self._actions
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, item):  # type: ignore[override]
+        return self.actions[item]
+
+    def __iter__(self) -> Iterator[Action]:
+        return iter(self.actions)
+
+    def __contains__(self, action: object) -> bool:
+        if isinstance(action, (int, np.integer)):
+            return 0 <= int(action) < len(self.mask) and bool(self.mask[int(action)])
+        if not isinstance(action, Action):
+            return False
+        try:
+            return bool(self.mask[self.vocab.index_for(action)])
+        except KeyError:
+            return False
+
+    def __repr__(self) -> str:
+        return f"LegalActionSet({self.actions!r})"
+
+
+def enumerate_legal_indices(
+    state: GameState,
+    vocab: ActionVocabulary = ACTION_VOCAB,
+    out: Optional[np.ndarray] = None,
+) -> LegalActionSet:
+    """Enumerate legal actions straight into vocabulary indices and a mask.
+
+    Args:
+        state: Game state to enumerate
+        vocab: Action vocabulary defining the index space
+        out: Optional preallocated boolean mask of ``len(vocab)``; cleared and filled in place
+
+    Returns:
+        LegalActionSet whose ``mask`` is ``out`` when one was given
+
+    Raises:
+        KeyError: If a legal action is outside the vocabulary
+    """
+    if out is None:
+        mask = np.zeros(len(vocab), dtype=np.bool_)
+    else:
+        mask = out
+        mask[:] = False
+    indices: List[int] = []
+    append = indices.append
+    lookup = vocab.index_for_parts
+
+    def emit(typ: ActType, play_idx: Optional[int], pitch_mask: int, defend_mask: int) -> None:
+        append(lookup(typ, play_idx, pitch_mask, defend_mask))
+
+    ActionEnumerator(state).emit_all(emit)
+    mask[indices] = True
+    return LegalActionSet(indices, mask, vocab)
+
+
+def mask_for_state(state, vocab: ActionVocabulary = ACTION_VOCAB) -> np.ndarray:
+    return enumerate_legal_indices(state, vocab=vocab).mask
 
 
-__all__ = ["ActionVocabulary", "ACTION_VOCAB", "legal_action_mask", "mask_for_state"]
+__all__ = [
+    "ActionVocabulary",
+    "ACTION_VOCAB",
+    "LegalActionSet",
+    "enumerate_legal_indices",
+    "legal_action_mask",
+    "mask_for_state",
+]
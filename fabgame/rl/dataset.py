@@ -0,0 +1,435 @@
+"""Chunked on-disk storage for self-play transitions.
+
+A dataset is a directory holding ``manifest.json`` plus one sub-directory per
+chunk. Every chunk stores one uncompressed ``.npy`` file per field, each with
+``rows`` leading entries. Legal actions are variable-length, so they are stored
+in CSR form: a flat ``legal_actions.npy`` of vocabulary indices and a
+``legal_actions_offsets.npy`` of ``rows + 1`` offsets into it. String columns
+(rules version, deck names) are stored as small integer codes whose vocabularies
+live in the manifest, so no file needs pickle to load.
+
+``ChunkedDatasetWriter`` fills preallocated chunk arrays and flushes them as
+they fill up. Steps are first staged per episode, so a rejected episode is
+dropped without touching the chunk arrays, and memory use stays bounded by one
+chunk plus one episode.
+
+``SelfPlayDataset`` memory-maps the chunk files of one dataset (or of every
+shard listed in a ``gen_selfplay_data`` index) and gathers random-access
+minibatches without loading the data into memory. Only the most recently used
+chunks stay mapped, so open file handles do not grow with the chunk count.
+"""
+from __future__ import annotations
+
+import json
+import shutil
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+try:  # pragma: no cover - dependency guard
+    import numpy as np
+except ImportError as exc:  # pragma: no cover
+    raise RuntimeError("fabgame.rl.dataset requires numpy to be installed") from exc
+
+DATASET_FORMAT = "fabgame-selfplay-chunked"
+DATASET_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+LEGAL_ACTIONS = "legal_actions"
+LEGAL_ACTION_OFFSETS = "legal_actions_offsets"
+
+
+def _chunk_name(index: int) -> str:
+    return f"chunk{index:05d}"
+
+
+class ChunkedDatasetWriter:
+    """Streams transitions into fixed-size chunks of ``.npy`` files.
+
+    Call ``stage`` for every step of an episode, ``set_last`` to fill fields
+    known only after stepping (reward, done), then ``commit_episode`` or
+    ``discard_episode``. ``close`` flushes the last partial chunk and writes
+    the manifest.
+
+    Attributes:
+        directory: Dataset directory
+        chunk_size: Rows per chunk
+        rows: Number of committed rows
+    """
+
+    def __init__(self, directory: Union[str, Path], chunk_size: int = 1024, overwrite: bool = True) -> None:
+        """Create a writer.
+
+        Args:
+            directory: Output directory; created if missing
+            chunk_size: Rows per chunk file
+            overwrite: Remove an existing dataset directory first
+
+        Raises:
+            ValueError: If ``chunk_size`` is not positive
+            FileExistsError: If the directory exists and ``overwrite`` is False
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.directory = Path(directory)
+        if self.directory.exists():
+            if not overwrite:
+                raise FileExistsError(f"Dataset directory already exists: {self.directory}")
+            shutil.rmtree(self.directory)
+        self.directory.mkdir(parents=True)
+        self.chunk_size = chunk_size
+        self.rows = 0
+        self._fields: Dict[str, Tuple[np.dtype, Tuple[int, ...]]] = {}
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._fill = 0
+        self._legal: List[np.ndarray] = []
+        self._legal_offsets = np.zeros(chunk_size + 1, dtype=np.int64)
+        self._chunks: List[Dict[str, Any]] = []
+        self._staged: List[Tuple[Dict[str, Any], np.ndarray]] = []
+        self._vocabularies: Dict[str, Dict[str, int]] = {}
+        self._closed = False
+
+    def encode_string(self, column: str, value: str) -> int:
+        """Return the integer code of ``value`` in the vocabulary of ``column``."""
+        vocab = self._vocabularies.setdefault(column, {})
+        code = vocab.get(value)
+        if code is None:
+            code = len(vocab)
+            vocab[value] = code
+        return code
+
+    def stage(self, row: Dict[str, Any], legal_actions: Sequence[int]) -> None:
+        """Stage one step of the current episode.
+
+        Array values and the legal actions are copied, so callers may reuse
+        their buffers (e.g. an observation encoder's) for the next step.
+
+        Args:
+            row: Field values; arrays must keep the same shape across rows
+            legal_actions: Vocabulary indices of the legal actions
+        """
+        staged = {
+            key: np.array(value, copy=True) if isinstance(value, np.ndarray) else value for key, value in row.items()
+        }
+        self._staged.append((staged, np.array(legal_actions, dtype=np.int32)))
+
+    def set_last(self, **fields: Any) -> None:
+        """Set fields on the most recently staged step."""
+        self._staged[-1][0].update(fields)
+
+    @property
+    def staged_steps(self) -> int:
+        return len(self._staged)
+
+    def discard_episode(self) -> None:
+        """Drop every step staged since the last commit."""
+        self._staged.clear()
+
+    def commit_episode(self) -> None:
+        """Move staged steps into the chunk arrays, flushing full chunks."""
+        for row, legal in self._staged:
+            if not self._fields:
+                self._init_fields(row)
+            fill = self._fill
+            for key, array in self._arrays.items():
+                array[fill] = row[key]
+            self._legal.append(legal)
+            self._legal_offsets[fill + 1] = self._legal_offsets[fill] + len(legal)
+            self._fill += 1
+            self.rows += 1
+            if self._fill == self.chunk_size:
+                self._flush()
+        self._staged.clear()
+
+    def _init_fields(self, row: Dict[str, Any]) -> None:
+        for key, value in row.items():
+            value = np.asarray(value)
+            self._fields[key] = (value.dtype, value.shape)
+            self._arrays[key] = np.zeros((self.chunk_size,) + value.shape, dtype=value.dtype)
+
+    def _flush(self) -> None:
+        if self._fill == 0:
+            return
+        rows = self._fill
+        name = _chunk_name(len(self._chunks))
+        chunk_dir = self.directory / name
+        chunk_dir.mkdir()
+        for key, array in self._arrays.items():
+            np.save(chunk_dir / f"{key}.npy", array[:rows])
+        legal = np.concatenate(self._legal) if self._legal else np.zeros(0, dtype=np.int32)
+        np.save(chunk_dir / f"{LEGAL_ACTIONS}.npy", legal.astype(np.int32, copy=False))
+        np.save(chunk_dir / f"{LEGAL_ACTION_OFFSETS}.npy", self._legal_offsets[: rows + 1])
+        self._chunks.append({"name": name, "rows": rows, "legal_actions": int(legal.shape[0])})
+        self._fill = 0
+        self._legal = []
+
+    def close(self, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Flush the final chunk and write the manifest.
+
+        Args:
+            metadata: Free-form JSON-serializable metadata stored in the manifest
+
+        Returns:
+            The manifest dictionary
+
+        Raises:
+            RuntimeError: If steps are still staged or the writer was closed
+        """
+        if self._closed:
+            raise RuntimeError("ChunkedDatasetWriter is already closed")
+        if self._staged:
+            raise RuntimeError("Commit or discard the staged episode before closing")
+        self._flush()
+        self._closed = True
+        manifest = {
+            "format": DATASET_FORMAT,
+            "version": DATASET_VERSION,
+            "chunk_size": self.chunk_size,
+            "rows": self.rows,
+            "fields": {
+                key: {"dtype": dtype.str, "shape": list(shape)} for key, (dtype, shape) in self._fields.items()
+            },
+            "vocabularies": {
+                column: sorted(vocab, key=vocab.__getitem__) for column, vocab in self._vocabularies.items()
+            },
+            "chunks": self._chunks,
+            "metadata": metadata or {},
+        }
+        (self.directory / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+        return manifest
+
+
+def load_manifest(directory: Union[str, Path]) -> Dict[str, Any]:
+    """Read and validate the manifest of a chunked dataset.
+
+    Raises:
+        ValueError: If the directory does not hold a supported dataset
+    """
+    manifest = json.loads((Path(directory) / MANIFEST_NAME).read_text())
+    if manifest.get("format") != DATASET_FORMAT or manifest.get("version") != DATASET_VERSION:
+        raise ValueError(f"Unsupported self-play dataset in {directory}")
+    return manifest
+
+
+class _Source:
+    """One chunked dataset directory opened for reading."""
+
+    def __init__(self, directory: Path, episode_offset: int = 0) -> None:
+        self.directory = directory
+        self.manifest = load_manifest(directory)
+        self.episode_offset = episode_offset
+        self.chunk_dirs = [directory / chunk["name"] for chunk in self.manifest["chunks"]]
+        self.chunk_rows = [int(chunk["rows"]) for chunk in self.manifest["chunks"]]
+        self.code_maps: Dict[str, np.ndarray] = {}
+
+
+class SelfPlayDataset:
+    """Random-access reader over chunked self-play datasets.
+
+    Chunk files are opened with ``np.load(mmap_mode="r")`` on first use, so only
+    the rows of requested batches are read from disk. At most
+    ``max_open_chunks`` chunks stay mapped; each mapping holds one file handle,
+    and the least recently used chunk is released first. String-coded columns are
+    remapped to one vocabulary shared by all shards, and ``episode_id`` is offset
+    per shard so ids stay unique.
+
+    Attributes:
+        fields: Field name -> ``(dtype, row shape)``
+        vocabularies: Column name -> list of strings indexed by code
+    """
+
+    def __init__(self, path: Union[str, Path], max_open_chunks: int = 4) -> None:
+        """Open a dataset directory or a shard index written by ``gen_selfplay_data``.
+
+        Args:
+            path: Directory containing ``manifest.json`` or an ``*.index.json`` file
+            max_open_chunks: Chunks whose files are kept memory-mapped between reads
+
+        Raises:
+            ValueError: If the path is not a chunked dataset, the shards disagree on
+                fields, or ``max_open_chunks`` is below 1
+        """
+        if max_open_chunks < 1:
+            raise ValueError("max_open_chunks must be at least 1")
+        self.max_open_chunks = max_open_chunks
+        path = Path(path)
+        if path.is_dir():
+            sources = [_Source(path)]
+        else:
+            index = json.loads(path.read_text())
+            if index.get("format") != "chunked":
+                raise ValueError(f"{path} does not index chunked self-play shards")
+            sources = [
+                _Source(path.with_name(entry["path"]), entry["episode_offset"])
+                for entry in index["shards"]
+                if entry.get("transitions")
+            ]
+        if not sources:
+            raise ValueError(f"No transitions found in {path}")
+        self._sources = sources
+
+        fields = [source.manifest["fields"] for source in sources if source.manifest["rows"]]
+        if any(other != fields[0] for other in fields[1:]):
+            raise ValueError("Shards were written with different fields")
+        self.fields: Dict[str, Tuple[np.dtype, Tuple[int, ...]]] = {
+            key: (np.dtype(spec["dtype"]), tuple(spec["shape"])) for key, spec in (fields[0] if fields else {}).items()
+        }
+
+        self.vocabularies: Dict[str, List[str]] = {}
+        for source in sources:
+            for column, values in source.manifest["vocabularies"].items():
+                vocab = self.vocabularies.setdefault(column, [])
+                codes = []
+                for value in values:
+                    if value not in vocab:
+                        vocab.append(value)
+                    codes.append(vocab.index(value))
+                source.code_maps[column] = np.array(codes, dtype=np.int16)
+
+        self._chunks: List[Tuple[_Source, Path]] = [
+            (source, chunk_dir) for source in sources for chunk_dir in source.chunk_dirs
+        ]
+        rows = [count for source in sources for count in source.chunk_rows]
+        self._starts = np.concatenate([[0], np.cumsum(rows, dtype=np.int64)])
+        # chunk -> field -> memmap, least recently used chunk first.
+        self._open: "OrderedDict[int, Dict[str, np.ndarray]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return int(self._starts[-1])
+
+    def _array(self, chunk: int, key: str) -> np.ndarray:
+        arrays = self._open.get(chunk)
+        if arrays is None:
+            while len(self._open) >= self.max_open_chunks:
+                # Dropping the last reference unmaps the file and closes its handle.
+                self._open.popitem(last=False)
+            arrays = self._open[chunk] = {}
+        else:
+            self._open.move_to_end(chunk)
+        array = arrays.get(key)
+        if array is None:
+            array = arrays[key] = np.load(self._chunks[chunk][1] / f"{key}.npy", mmap_mode="r")
+        return array
+
+    def close(self) -> None:
+        """Release every memory-mapped chunk file; later reads reopen them."""
+        self._open.clear()
+
+    def _locate(self, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if indices.size and (indices.min() < 0 or indices.max() >= len(self)):
+            raise IndexError("Dataset row index out of range")
+        chunks = np.searchsorted(self._starts, indices, side="right") - 1
+        return chunks, indices - self._starts[chunks]
+
+    def get(self, indices: Sequence[int], fields: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """Gather rows into dense arrays.
+
+        Args:
+            indices: Global row indices, in the order they should be returned
+            fields: Field names to read (all fields when omitted)
+
+        Returns:
+            Field name -> array with ``len(indices)`` leading entries
+
+        Raises:
+            IndexError: If an index is out of range
+            KeyError: If an unknown field is requested
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        chunks, local = self._locate(indices)
+        keys = list(self.fields) if fields is None else list(fields)
+        batch: Dict[str, np.ndarray] = {}
+        for key in keys:
+            dtype, shape = self.fields[key]
+            batch[key] = np.empty((len(indices),) + shape, dtype=dtype)
+        for chunk in np.unique(chunks):
+            selected = np.flatnonzero(chunks == chunk)
+            rows = local[selected]
+            source = self._chunks[chunk][0]
+            for key in keys:
+                values = self._array(int(chunk), key)[rows]
+                if key in source.code_maps:
+                    values = source.code_maps[key][values]
+                elif key == "episode_id" and source.episode_offset:
+                    values = values + source.episode_offset
+                batch[key][selected] = values
+        return batch
+
+    def legal_actions(self, indices: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the legal actions of the given rows in CSR form.
+
+        Returns:
+            ``(flat, offsets)`` where row ``i`` owns ``flat[offsets[i]:offsets[i + 1]]``
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        chunks, local = self._locate(indices)
+        rows: List[np.ndarray] = [np.zeros(0, dtype=np.int32)] * len(indices)
+        # Grouped by chunk, so each chunk is mapped once per call.
+        for chunk in np.unique(chunks):
+            chunk_offsets = self._array(int(chunk), LEGAL_ACTION_OFFSETS)
+            flat = self._array(int(chunk), LEGAL_ACTIONS)
+            for position in np.flatnonzero(chunks == chunk).tolist():
+                row = local[position]
+                rows[position] = np.array(flat[chunk_offsets[row]:chunk_offsets[row + 1]])
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(row) for row in rows])
+        flat = np.concatenate(rows).astype(np.int32, copy=False) if rows else np.zeros(0, dtype=np.int32)
+        return flat, offsets
+
+    def legal_action_mask(self, indices: Sequence[int], action_count: int) -> np.ndarray:
+        """Rebuild dense boolean legal action masks ``(len(indices), action_count)``."""
+        flat, offsets = self.legal_actions(indices)
+        mask = np.zeros((len(offsets) - 1, action_count), dtype=np.bool_)
+        mask[np.repeat(np.arange(len(offsets) - 1), np.diff(offsets)), flat] = True
+        return mask
+
+    def iter_batches(
+        self,
+        batch_size: int,
+        *,
+        shuffle: bool = True,
+        seed: Optional[int] = None,
+        drop_last: bool = False,
+        fields: Optional[Sequence[str]] = None,
+        action_count: Optional[int] = None,
+    ) -> Iterator[Dict[str, np.ndarray]]:
+        """Yield minibatches covering the dataset once.
+
+        Args:
+            batch_size: Rows per batch
+            shuffle: Visit rows in a random order
+            seed: Seed for the shuffle order
+            drop_last: Skip the final partial batch
+            fields: Field names to read (all fields when omitted)
+            action_count: When given, add a ``legal_action_mask`` of this width to each batch
+
+        Yields:
+            Field name -> batch array
+        """
+        order = np.arange(len(self))
+        if shuffle:
+            np.random.default_rng(seed).shuffle(order)
+        for start in range(0, len(order), batch_size):
+            indices = order[start:start + batch_size]
+            if drop_last and len(indices) < batch_size:
+                break
+            # Sorted reads keep access to each chunk sequential.
+            sorter = np.argsort(indices, kind="stable")
+            batch = self.get(indices[sorter], fields)
+            inverse = np.empty_like(sorter)
+            inverse[sorter] = np.arange(len(sorter))
+            batch = {key: value[inverse] for key, value in batch.items()}
+            if action_count is not None:
+                batch["legal_action_mask"] = self.legal_action_mask(indices, action_count)
+            yield batch
+
+
+__all__ = [
+    "ChunkedDatasetWriter",
+    "DATASET_FORMAT",
+    "DATASET_VERSION",
+    "LEGAL_ACTIONS",
+    "LEGAL_ACTION_OFFSETS",
+    "MANIFEST_NAME",
+    "SelfPlayDataset",
+    "load_manifest",
+]
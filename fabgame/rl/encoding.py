@@ -1,18 +1,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 try:  # pragma: no cover - dependency guard
     import numpy as np
 except ImportError as exc:  # pragma: no cover
     raise RuntimeError("fabgame.rl.encoding requires numpy to be installed") from exc
 
+from ..action_execution import StateChanges
 from ..engine import current_actor_index
-from ..models import Card, CombatStep, GameState, Phase
-from ..io import card_yaml as _card_yaml_module
-from ..io.card_yaml import CARDS_DIR, YAML_AVAILABLE
+from ..models import Card, CombatStep, GameState, Phase, PlayerState
+from ..io.card_bundle import yaml_documents
+from ..io.card_yaml import CARDS_DIR
 from .yaml_features import DEFAULT_YAML_EXTRACTOR, RuleFeatureData
 
 
@@ -44,42 +44,23 @@ def _normalize_keyword(value: str) -> str:
 
 def _collect_card_keywords() -> Tuple[str, ...]:
     keywords = set(_normalize_keyword(item) for item in _FALLBACK_CARD_KEYWORDS)
-    yaml_module = getattr(_card_yaml_module, "yaml", None)
-    if YAML_AVAILABLE and yaml_module:
-        for path in Path(CARDS_DIR).glob("*.yaml"):
-            try:
-                with path.open("r", encoding="utf-8") as handle:
-                    data = yaml_module.safe_load(handle) or {}
-            except Exception:
-                continue
-            if not isinstance(data, dict):
-                continue
-            for kw in _ensure_list(data.get("keywords")):
+    for data in yaml_documents(CARDS_DIR):
+        for kw in _ensure_list(data.get("keywords")):
+            keywords.add(_normalize_keyword(kw))
+        rules = data.get("rules")
+        if isinstance(rules, dict):
+            for kw in _ensure_list(rules.get("keywords")):
                 keywords.add(_normalize_keyword(kw))
-            rules = data.get("rules")
-            if isinstance(rules, dict):
-                for kw in _ensure_list(rules.get("keywords")):
-                    keywords.add(_normalize_keyword(kw))
     keywords.discard("")
     return tuple(sorted(keywords))
 
 
 def _collect_hero_vocab() -> Tuple[str, ...]:
     heroes = {"generic hero"}
-    yaml_module = getattr(_card_yaml_module, "yaml", None)
-    if YAML_AVAILABLE and yaml_module:
-        hero_paths = list(Path(CARDS_DIR).glob("hero_*.yaml"))
-        for path in hero_paths:
-            try:
-                with path.open("r", encoding="utf-8") as handle:
-                    data = yaml_module.safe_load(handle) or {}
-            except Exception:
-                continue
-            if not isinstance(data, dict):
-                continue
-            name = data.get("name") or data.get("id")
-            if isinstance(name, str) and name.strip():
-                heroes.add(name.strip().lower())
+    for data in yaml_documents(CARDS_DIR, "hero_"):
+        name = data.get("name") or data.get("id")
+        if isinstance(name, str) and name.strip():
+            heroes.add(name.strip().lower())
     return tuple(sorted(heroes))
 
 
@@ -122,14 +103,14 @@ def _card_feature_dim(config: EncoderConfig) -> int:
     )
 
 
-def _keyword_flags(card: Card, config: EncoderConfig) -> np.ndarray:
-    flags = np.zeros(len(config.keyword_vocab), dtype=np.float32)
+def _keyword_flags(card: Card, keyword_index: Dict[str, int], size: int) -> np.ndarray:
+    flags = np.zeros(size, dtype=np.float32)
     for keyword in card.keywords:
         key = _normalize_keyword(keyword)
         if not key:
             continue
         try:
-            idx = CARD_KEYWORD_INDEX[key]
+            idx = keyword_index[key]
         except KeyError:
             continue
         flags[idx] = 1.0
@@ -146,60 +127,330 @@ def _rule_arrays(rule_data: RuleFeatureData, config: EncoderConfig) -> Tuple[np.
     return trigger, duration, keywords
 
 
-def encode_card(card: Optional[Card], config: EncoderConfig = EncoderConfig()) -> np.ndarray:
-    dim = _card_feature_dim(config)
-    if card is None:
-        return np.zeros(dim, dtype=np.float32)
-
-    base = np.array(
-        [float(card.attack), float(card.defense), float(card.cost), float(card.pitch)],
-        dtype=np.float32,
-    )
-    flags = np.array(
-        [
-            1.0 if card.is_attack() else 0.0,
-            1.0 if card.is_defense() else 0.0,
-            1.0 if card.is_reaction() else 0.0,
-            1.0 if card.is_attack_reaction() else 0.0,
-        ],
-        dtype=np.float32,
-    )
-    keyword_flags = _keyword_flags(card, config)
-    rule_data = DEFAULT_YAML_EXTRACTOR.features_for_card(card.name, card.pitch)
-    rule_trigger, rule_duration, rule_keyword = _rule_arrays(rule_data, config)
-    return np.concatenate([base, flags, keyword_flags, rule_trigger, rule_duration, rule_keyword]).astype(np.float32)
+def _feature_key(card: Card) -> Tuple[object, ...]:
+    # Everything the feature vector depends on; name + pitch select the YAML rules.
+    return (card.name, card.pitch, card.cost, card.attack, card.defense, card.keywords)
+
+
+class CardFeatureTable:
+    """Feature vectors of every card seen so far, one row per distinct card.
+
+    Row 0 is the all-zero vector used for empty slots. A card's row is computed
+    once, on first sight, and afterwards encoding it is a row lookup. Rows are
+    found by object identity first (decks share interned ``Card`` instances) and
+    then by the card's feature key, so equal cards built separately share a row.
+
+    Attributes:
+        config: Encoder configuration the rows were built for
+        feature_dim: Length of each row
+    """
+
+    def __init__(self, config: EncoderConfig) -> None:
+        """Create an empty table.
+
+        Args:
+            config: Encoder configuration used to build rows
+        """
+        self.config = config
+        self.feature_dim = _card_feature_dim(config)
+        self._keyword_index = {token: idx for idx, token in enumerate(config.keyword_vocab)}
+        self._rows = np.zeros((64, self.feature_dim), dtype=np.float32)
+        self._size = 1
+        self._ids_by_key: Dict[Tuple[object, ...], int] = {}
+        self._ids_by_identity: Dict[int, int] = {}
+        # Holds every card whose id() is a key of ``_ids_by_identity`` so ids are never reused.
+        self._cards: List[Card] = []
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def rows(self) -> np.ndarray:
+        """Read-only view of the populated rows, indexed by row id."""
+        view = self._rows[: self._size]
+        view.flags.writeable = False
+        return view
+
+    def row_id(self, card: Optional[Card]) -> int:
+        """Return the row id of ``card`` (0 for None), building its row if needed."""
+        if card is None:
+            return 0
+        row = self._ids_by_identity.get(id(card))
+        if row is not None:
+            return row
+        key = _feature_key(card)
+        row = self._ids_by_key.get(key)
+        if row is None:
+            row = self._append(self._build_row(card))
+            self._ids_by_key[key] = row
+        self._ids_by_identity[id(card)] = row
+        self._cards.append(card)
+        return row
+
+    def row(self, card: Optional[Card]) -> np.ndarray:
+        """Return the (read-only) feature row of ``card``."""
+        return self.rows[self.row_id(card)]
+
+    def row_ids(self, cards: Iterable[Optional[Card]]) -> List[int]:
+        """Return the row ids of ``cards`` in order."""
+        row_id = self.row_id
+        return [row_id(card) for card in cards]
+
+    def _append(self, row: np.ndarray) -> int:
+        if self._size == len(self._rows):
+            grown = np.zeros((2 * len(self._rows), self.feature_dim), dtype=np.float32)
+            grown[: self._size] = self._rows[: self._size]
+            self._rows = grown
+        self._rows[self._size] = row
+        self._size += 1
+        return self._size - 1
+
+    def _build_row(self, card: Card) -> np.ndarray:
+        config = self.config
+        base = np.array(
+            [float(card.attack), float(card.defense), float(card.cost), float(card.pitch)],
+            dtype=np.float32,
+        )
+        flags = np.array(
+            [
+                1.0 if card.is_attack() else 0.0,
+                1.0 if card.is_defense() else 0.0,
+                1.0 if card.is_reaction() else 0.0,
+                1.0 if card.is_attack_reaction() else 0.0,
+            ],
+            dtype=np.float32,
+        )
+        keyword_flags = _keyword_flags(card, self._keyword_index, len(config.keyword_vocab))
+        rule_data = DEFAULT_YAML_EXTRACTOR.features_for_card(card.name, card.pitch)
+        rule_trigger, rule_duration, rule_keyword = _rule_arrays(rule_data, config)
+        return np.concatenate([base, flags, keyword_flags, rule_trigger, rule_duration, rule_keyword])
+
+
+_FEATURE_TABLES: Dict[EncoderConfig, CardFeatureTable] = {}
+_last_table: Optional[CardFeatureTable] = None
+
+
+def card_feature_table(config: EncoderConfig = EncoderConfig()) -> CardFeatureTable:
+    """Return the process-wide feature table for ``config``."""
+    global _last_table
+    # Hashing a config walks every vocabulary, so short-circuit the common repeat lookup.
+    if _last_table is not None and _last_table.config is config:
+        return _last_table
+    table = _FEATURE_TABLES.get(config)
+    if table is None:
+        table = _FEATURE_TABLES[config] = CardFeatureTable(config)
+    _last_table = table
+    return table
 
 
-def _pad_zone(cards: Sequence[Card], max_size: int, feature_dim: int, config: EncoderConfig) -> Tuple[np.ndarray, np.ndarray]:
-    data = np.zeros((max_size, feature_dim), dtype=np.float32)
-    mask = np.zeros((max_size,), dtype=np.float32)
-    for idx, card in enumerate(cards[:max_size]):
-        data[idx] = encode_card(card, config=config)
-        mask[idx] = 1.0
-    return data, mask
+def encode_card(card: Optional[Card], config: EncoderConfig = EncoderConfig()) -> np.ndarray:
+    return card_feature_table(config).row(card).copy()
+
+
+def _pad_zone(
+    cards: Sequence[Card],
+    table: CardFeatureTable,
+    out: np.ndarray,
+    mask: np.ndarray,
+    previous: Optional[Tuple[int, ...]] = None,
+) -> Tuple[int, ...]:
+    """Gather the rows of ``cards`` into the ``(max_size, feature_dim)`` slice ``out``.
+
+    Nothing is written when the zone's row ids equal ``previous``, the ids this
+    slice was last filled with.
+
+    Returns:
+        Row ids now held by ``out``
+    """
+    count = min(len(cards), len(out))
+    ids = tuple(table.row_ids(cards[:count]))  # may grow the table, so resolve before reading rows
+    if ids != previous:
+        np.take(table.rows, ids, axis=0, out=out[:count])
+        out[count:] = 0.0
+        mask[:count] = 1.0
+        mask[count:] = 0.0
+    return ids
+
+
+def _one_hot(out: np.ndarray, idx: Optional[int]) -> None:
+    out[:] = 0.0
+    if idx is not None:
+        out[idx] = 1.0
 
 
-def _hero_vector(name: str, config: EncoderConfig) -> np.ndarray:
-    vec = np.zeros(len(config.hero_vocab), dtype=np.float32)
-    key = name.strip().lower()
-    idx = HERO_INDEX.get(key)
+def _hero_index(name: str) -> Optional[int]:
+    idx = HERO_INDEX.get(name.strip().lower())
     if idx is None:
         idx = HERO_INDEX.get("generic hero")
-    if idx is not None:
-        vec[idx] = 1.0
-    return vec
+    return idx
+
+
+_ZONES: Tuple[str, ...] = ("hand", "arsenal", "pitched", "grave")
+# Observation entries holding one row per player (actor first).
+_PLAYER_KEYS: Tuple[str, ...] = (
+    ("life", "deck_size", "grave_size", "floating_resources", "hero")
+    + _ZONES
+    + tuple(zone + "_mask" for zone in _ZONES)
+)
+
+
+def observation_shapes(config: EncoderConfig = EncoderConfig()) -> Dict[str, Tuple[int, ...]]:
+    """Return the shape of every observation array, in ``encode_observation`` key order."""
+    feature_dim = _card_feature_dim(config)
+    return {
+        "life": (2,),
+        "deck_size": (2,),
+        "grave_size": (2,),
+        "floating_resources": (2,),
+        "hand": (2, config.max_hand_size, feature_dim),
+        "hand_mask": (2, config.max_hand_size),
+        "arsenal": (2, config.max_arsenal_size, feature_dim),
+        "arsenal_mask": (2, config.max_arsenal_size),
+        "pitched": (2, config.max_pitch_size, feature_dim),
+        "pitched_mask": (2, config.max_pitch_size),
+        "grave": (2, config.max_grave_size, feature_dim),
+        "grave_mask": (2, config.max_grave_size),
+        "hero": (2, len(config.hero_vocab)),
+        "phase": (len(PHASE_VOCAB),),
+        "combat_step": (len(COMBAT_STEP_VOCAB),),
+        "pending_attack": (1,),
+        "pending_damage": (1,),
+        "action_points": (1,),
+        "last_pitch_sum": (1,),
+        "last_attack_had_go_again": (1,),
+        "awaiting_defense": (1,),
+        "awaiting_arsenal": (1,),
+        "turn_player": (1,),
+        "last_attack_card": (feature_dim,),
+    }
+
+
+def allocate_observation(
+    config: EncoderConfig = EncoderConfig(), batch_shape: Tuple[int, ...] = ()
+) -> Dict[str, np.ndarray]:
+    """Allocate zeroed observation arrays, optionally with leading batch dimensions."""
+    return {
+        key: np.zeros(batch_shape + shape, dtype=np.float32) for key, shape in observation_shapes(config).items()
+    }
+
+
+ZoneIds = Dict[Tuple[str, int], Tuple[int, ...]]
+
+
+def _write_zone(
+    out: Dict[str, np.ndarray],
+    side: int,
+    zone: str,
+    cards: Sequence[Card],
+    table: CardFeatureTable,
+    zone_ids: Optional[ZoneIds],
+) -> None:
+    previous = zone_ids.get((zone, side)) if zone_ids is not None else None
+    ids = _pad_zone(cards, table, out[zone][side], out[zone + "_mask"][side], previous)
+    if zone_ids is not None:
+        zone_ids[(zone, side)] = ids
+    if zone == "grave":
+        out["grave_size"][side] = len(cards)
+
+
+def _write_player(
+    out: Dict[str, np.ndarray],
+    side: int,
+    player: PlayerState,
+    table: CardFeatureTable,
+    zone_ids: Optional[ZoneIds],
+) -> None:
+    for zone in _ZONES:
+        _write_zone(out, side, zone, getattr(player, zone), table, zone_ids)
+    out["life"][side] = player.life
+    out["deck_size"][side] = len(player.deck)
+    _one_hot(out["hero"][side], _hero_index(player.hero))
+
+
+def _write_floating(out: Dict[str, np.ndarray], state: GameState, actor: int, table: CardFeatureTable) -> None:
+    out["floating_resources"][0] = state.floating_resources[actor]
+    out["floating_resources"][1] = state.floating_resources[1 - actor]
 
 
-def _phase_vector(phase: Phase) -> np.ndarray:
-    vec = np.zeros(len(PHASE_VOCAB), dtype=np.float32)
-    vec[PHASE_INDEX[phase]] = 1.0
-    return vec
+FieldWriter = Callable[[Dict[str, np.ndarray], GameState, int, CardFeatureTable], None]
 
 
-def _combat_step_vector(step: CombatStep) -> np.ndarray:
-    vec = np.zeros(len(COMBAT_STEP_VOCAB), dtype=np.float32)
-    vec[COMBAT_STEP_INDEX[step]] = 1.0
-    return vec
+def _write_scalar(attr: str) -> FieldWriter:
+    def write(out: Dict[str, np.ndarray], state: GameState, actor: int, table: CardFeatureTable) -> None:
+        out[attr][0] = float(getattr(state, attr))
+
+    return write
+
+
+def _write_phase(out: Dict[str, np.ndarray], state: GameState, actor: int, table: CardFeatureTable) -> None:
+    _one_hot(out["phase"], PHASE_INDEX[state.phase])
+
+
+def _write_combat_step(out: Dict[str, np.ndarray], state: GameState, actor: int, table: CardFeatureTable) -> None:
+    _one_hot(out["combat_step"], COMBAT_STEP_INDEX[state.combat_step])
+
+
+def _write_turn(out: Dict[str, np.ndarray], state: GameState, actor: int, table: CardFeatureTable) -> None:
+    out["turn_player"][0] = 1.0 if state.turn == actor else 0.0
+
+
+def _write_last_attack(out: Dict[str, np.ndarray], state: GameState, actor: int, table: CardFeatureTable) -> None:
+    out["last_attack_card"][:] = table.row(state.last_attack_card)
+
+
+# GameState attribute -> writer of the observation entries derived from it.
+_FIELD_WRITERS: Dict[str, FieldWriter] = {
+    "floating_resources": _write_floating,
+    "phase": _write_phase,
+    "combat_step": _write_combat_step,
+    "pending_attack": _write_scalar("pending_attack"),
+    "pending_damage": _write_scalar("pending_damage"),
+    "action_points": _write_scalar("action_points"),
+    "last_pitch_sum": _write_scalar("last_pitch_sum"),
+    "last_attack_had_go_again": _write_scalar("last_attack_had_go_again"),
+    "awaiting_defense": _write_scalar("awaiting_defense"),
+    "awaiting_arsenal": _write_scalar("awaiting_arsenal"),
+    "turn": _write_turn,
+    "last_attack_card": _write_last_attack,
+}
+
+
+def _fill_observation(
+    state: GameState,
+    actor: int,
+    config: EncoderConfig,
+    out: Dict[str, np.ndarray],
+    zone_ids: Optional[ZoneIds] = None,
+) -> None:
+    table = card_feature_table(config)
+    _write_player(out, 0, state.players[actor], table, zone_ids)
+    _write_player(out, 1, state.players[1 - actor], table, zone_ids)
+    for write in _FIELD_WRITERS.values():
+        write(out, state, actor, table)
+
+
+def _apply_changes(
+    state: GameState,
+    actor: int,
+    config: EncoderConfig,
+    out: Dict[str, np.ndarray],
+    zone_ids: ZoneIds,
+    changes: StateChanges,
+) -> None:
+    table = card_feature_table(config)
+    for player_idx, zone in changes.zones:
+        side = 0 if player_idx == actor else 1
+        player = state.players[player_idx]
+        if zone == "deck":
+            out["deck_size"][side] = len(player.deck)
+        else:
+            _write_zone(out, side, zone, getattr(player, zone), table, zone_ids)
+    for player_idx in changes.players:
+        out["life"][0 if player_idx == actor else 1] = state.players[player_idx].life
+    for name in changes.fields:
+        write = _FIELD_WRITERS.get(name)
+        if write is not None:
+            write(out, state, actor, table)
 
 
 def encode_observation(
@@ -207,69 +458,223 @@ def encode_observation(
     *,
     acting_player: Optional[int] = None,
     config: EncoderConfig = EncoderConfig(),
+    out: Optional[Dict[str, np.ndarray]] = None,
 ) -> Dict[str, np.ndarray]:
+    """Encode ``state`` from the point of view of ``acting_player``.
+
+    Args:
+        state: Game state to encode
+        acting_player: Perspective player (defaults to the current actor)
+        config: Encoder configuration
+        out: Arrays to overwrite, shaped as ``observation_shapes(config)``;
+            fresh arrays are allocated when omitted
+
+    Returns:
+        Observation dict (``out`` itself when given)
+    """
     actor = acting_player if acting_player is not None else current_actor_index(state)
-    opponent = 1 - actor
-    players = (state.players[actor], state.players[opponent])
-    feature_dim = _card_feature_dim(config)
-
-    hand = np.zeros((2, config.max_hand_size, feature_dim), dtype=np.float32)
-    hand_mask = np.zeros((2, config.max_hand_size), dtype=np.float32)
-    arsenal = np.zeros((2, config.max_arsenal_size, feature_dim), dtype=np.float32)
-    arsenal_mask = np.zeros((2, config.max_arsenal_size), dtype=np.float32)
-    pitched = np.zeros((2, config.max_pitch_size, feature_dim), dtype=np.float32)
-    pitched_mask = np.zeros((2, config.max_pitch_size), dtype=np.float32)
-    grave = np.zeros((2, config.max_grave_size, feature_dim), dtype=np.float32)
-    grave_mask = np.zeros((2, config.max_grave_size), dtype=np.float32)
-
-    for idx, player in enumerate(players):
-        hand[idx], hand_mask[idx] = _pad_zone(player.hand, config.max_hand_size, feature_dim, config)
-        arsenal[idx], arsenal_mask[idx] = _pad_zone(player.arsenal, config.max_arsenal_size, feature_dim, config)
-        pitched[idx], pitched_mask[idx] = _pad_zone(player.pitched, config.max_pitch_size, feature_dim, config)
-        grave[idx], grave_mask[idx] = _pad_zone(player.grave, config.max_grave_size, feature_dim, config)
-
-    life = np.array([float(player.life) for player in players], dtype=np.float32)
-    deck_size = np.array([float(len(player.deck)) for player in players], dtype=np.float32)
-    grave_size = np.array([float(len(player.grave)) for player in players], dtype=np.float32)
-    floating = np.array(
-        [
-            float(state.floating_resources[actor]),
-            float(state.floating_resources[opponent]),
-        ],
-        dtype=np.float32,
-    )
-    hero = np.stack([_hero_vector(player.hero, config) for player in players], axis=0)
-    phase_vec = _phase_vector(state.phase)
-    combat_vec = _combat_step_vector(state.combat_step)
-    last_attack = encode_card(state.last_attack_card, config=config)
-
-    observation: Dict[str, np.ndarray] = {
-        "life": life,
-        "deck_size": deck_size,
-        "grave_size": grave_size,
-        "floating_resources": floating,
-        "hand": hand,
-        "hand_mask": hand_mask,
-        "arsenal": arsenal,
-        "arsenal_mask": arsenal_mask,
-        "pitched": pitched,
-        "pitched_mask": pitched_mask,
-        "grave": grave,
-        "grave_mask": grave_mask,
-        "hero": hero,
-        "phase": phase_vec,
-        "combat_step": combat_vec,
-        "pending_attack": np.array([float(state.pending_attack)], dtype=np.float32),
-        "pending_damage": np.array([float(state.pending_damage)], dtype=np.float32),
-        "action_points": np.array([float(state.action_points)], dtype=np.float32),
-        "last_pitch_sum": np.array([float(state.last_pitch_sum)], dtype=np.float32),
-        "last_attack_had_go_again": np.array([1.0 if state.last_attack_had_go_again else 0.0], dtype=np.float32),
-        "awaiting_defense": np.array([1.0 if state.awaiting_defense else 0.0], dtype=np.float32),
-        "awaiting_arsenal": np.array([1.0 if state.awaiting_arsenal else 0.0], dtype=np.float32),
-        "turn_player": np.array([1.0 if state.turn == actor else 0.0], dtype=np.float32),
-        "last_attack_card": last_attack,
-    }
-    return observation
-
-
-__all__ = ["EncoderConfig", "encode_card", "encode_observation", "CARD_KEYWORD_VOCAB"]
+    if out is None:
+        out = allocate_observation(config)
+    _fill_observation(state, actor, config, out)
+    return out
+
+
+class ObservationLayout:
+    """Field layout of the flat observation vector.
+
+    Fields are stored in sorted key order, each raveled in C order, which is the
+    order ``flatten_observation`` has always concatenated the dict form in, so
+    networks trained on either form see the same input.
+
+    Attributes:
+        size: Length of the flat vector
+        fields: Observation key -> (offset, shape)
+    """
+
+    def __init__(self, config: EncoderConfig = EncoderConfig()) -> None:
+        """Compute the layout for ``config``.
+
+        Args:
+            config: Encoder configuration
+        """
+        self._shapes = observation_shapes(config)
+        self.fields: Dict[str, Tuple[int, Tuple[int, ...]]] = {}
+        offset = 0
+        for key in sorted(self._shapes):
+            shape = self._shapes[key]
+            self.fields[key] = (offset, shape)
+            offset += int(np.prod(shape))
+        self.size = offset
+
+    def slice(self, key: str) -> slice:
+        """Return the slice of ``key`` in the flat vector."""
+        offset, shape = self.fields[key]
+        return slice(offset, offset + int(np.prod(shape)))
+
+    def allocate(self, batch_shape: Tuple[int, ...] = ()) -> np.ndarray:
+        """Allocate a zeroed flat observation, optionally with leading batch dimensions."""
+        return np.zeros(batch_shape + (self.size,), dtype=np.float32)
+
+    def views(self, flat: np.ndarray) -> Dict[str, np.ndarray]:
+        """Return the structured form of ``flat`` as views sharing its memory.
+
+        Args:
+            flat: ``(..., size)`` float32 array, contiguous along its last axis
+
+        Returns:
+            Observation dict whose arrays have shape ``batch_shape + field shape``
+
+        Raises:
+            ValueError: If ``flat`` has the wrong length or cannot be viewed
+        """
+        if flat.shape[-1:] != (self.size,):
+            raise ValueError(f"Flat observation must have {self.size} features, got shape {flat.shape}")
+        batch = flat.shape[:-1]
+        views: Dict[str, np.ndarray] = {}
+        for key, shape in self._shapes.items():
+            view = flat[..., self.slice(key)].reshape(batch + shape)
+            if view.size and not np.shares_memory(view, flat):
+                raise ValueError("Flat observation must be contiguous along its last axis")
+            views[key] = view
+        return views
+
+    def flatten(self, obs: Dict[str, np.ndarray]) -> np.ndarray:
+        """Pack a structured observation (or a space bound per field) into a flat vector."""
+        return np.concatenate(
+            [np.asarray(obs[key], dtype=np.float32).reshape(-1) for key in self.fields]
+        )
+
+
+_LAYOUTS: Dict[EncoderConfig, ObservationLayout] = {}
+
+
+def observation_layout(config: EncoderConfig = EncoderConfig()) -> ObservationLayout:
+    """Return the shared flat observation layout for ``config``."""
+    layout = _LAYOUTS.get(config)
+    if layout is None:
+        layout = _LAYOUTS[config] = ObservationLayout(config)
+    return layout
+
+
+def encode_flat_observation(
+    state: GameState,
+    *,
+    acting_player: Optional[int] = None,
+    config: EncoderConfig = EncoderConfig(),
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Encode ``state`` into one contiguous float32 vector laid out by ``observation_layout``.
+
+    Args:
+        state: Game state to encode
+        acting_player: Perspective player (defaults to the current actor)
+        config: Encoder configuration
+        out: Flat vector to overwrite; allocated when omitted
+
+    Returns:
+        The flat observation (``out`` itself when given)
+    """
+    layout = observation_layout(config)
+    if out is None:
+        out = layout.allocate()
+    encode_observation(state, acting_player=acting_player, config=config, out=layout.views(out))
+    return out
+
+
+class ObservationEncoder:
+    """Encodes successive states into one set of caller-owned arrays.
+
+    The encoder remembers which cards each zone slice holds and skips zones
+    whose contents did not change since the previous ``encode``. When given the
+    ``StateChanges`` of the step, it only rewrites the entries derived from the
+    changed zones, players and state fields. Call ``invalidate`` if anything
+    else writes into the buffers.
+
+    Attributes:
+        config: Encoder configuration
+        buffers: Observation arrays overwritten by every ``encode``
+    """
+
+    def __init__(
+        self,
+        config: EncoderConfig = EncoderConfig(),
+        buffers: Optional[Dict[str, np.ndarray]] = None,
+    ) -> None:
+        """Create the encoder.
+
+        Args:
+            config: Encoder configuration
+            buffers: Arrays to write into, e.g. one row of a batched buffer;
+                allocated when omitted
+
+        Raises:
+            ValueError: If ``buffers`` do not match ``observation_shapes(config)``
+        """
+        self.config = config
+        if buffers is None:
+            buffers = allocate_observation(config)
+        else:
+            expected = observation_shapes(config)
+            actual = {key: tuple(buffers[key].shape) for key in expected if key in buffers}
+            if actual != expected:
+                raise ValueError("Observation buffers do not match the encoder configuration")
+        self.buffers = buffers
+        self._zone_ids: ZoneIds = {}
+        self._actor: Optional[int] = None
+
+    def encode(
+        self,
+        state: GameState,
+        acting_player: Optional[int] = None,
+        changes: Optional[StateChanges] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Encode ``state`` into ``buffers`` and return them.
+
+        Args:
+            state: Game state to encode
+            acting_player: Perspective player (defaults to the current actor)
+            changes: How ``state`` differs from the state of the previous ``encode``
+                (see ``UndoRecord.changes``); only those parts are rewritten, after
+                swapping the two players' rows if the perspective player changed
+
+        Returns:
+            ``buffers``
+        """
+        actor = acting_player if acting_player is not None else current_actor_index(state)
+        if changes is not None and self._actor is not None:
+            if actor != self._actor:
+                self._swap_sides()
+                changes = changes._replace(fields=changes.fields | {"floating_resources", "turn"})
+            _apply_changes(state, actor, self.config, self.buffers, self._zone_ids, changes)
+        else:
+            _fill_observation(state, actor, self.config, self.buffers, self._zone_ids)
+        self._actor = actor
+        return self.buffers
+
+    def _swap_sides(self) -> None:
+        # The perspective player changed: move each player's entries to the other side.
+        for key in _PLAYER_KEYS:
+            buf = self.buffers[key]
+            buf[:] = buf[::-1].copy()
+        self._zone_ids = {(zone, 1 - side): ids for (zone, side), ids in self._zone_ids.items()}
+
+    def invalidate(self) -> None:
+        """Forget the buffer contents so the next ``encode`` rewrites everything."""
+        self._zone_ids.clear()
+        self._actor = None
+
+
+__all__ = [
+    "CARD_KEYWORD_VOCAB",
+    "CardFeatureTable",
+    "EncoderConfig",
+    "ObservationEncoder",
+    "ObservationLayout",
+    "allocate_observation",
+    "card_feature_table",
+    "encode_card",
+    "encode_flat_observation",
+    "encode_observation",
+    "observation_layout",
+    "observation_shapes",
+]
@@ -15,10 +15,19 @@ try:  # pragma: no cover - optional dependency
 except ImportError as exc:  # pragma: no cover
     raise RuntimeError("fabgame.rl.env requires gymnasium to be installed") from exc
 
-from ..engine import apply_action, enumerate_legal_actions, new_game, current_actor_index
+from ..action_execution import UndoRecord
+from ..engine import apply_action, apply_action_inplace, new_game, current_actor_index
 from ..models import Action, GameState
-from .action_mask import ACTION_VOCAB, ActionVocabulary, legal_action_mask
-from .encoding import EncoderConfig, encode_observation
+from .action_mask import ACTION_VOCAB, ActionVocabulary, LegalActionSet, enumerate_legal_indices
+from .encoding import (
+    EncoderConfig,
+    ObservationEncoder,
+    encode_flat_observation,
+    encode_observation,
+    observation_layout,
+)
+
+Observation = Union[np.ndarray, Dict[str, np.ndarray]]
 
 
 @dataclass
@@ -32,7 +41,7 @@ class FabgameEnvState:
 
     def clone(self) -> "FabgameEnvState":
         return FabgameEnvState(
-            state=self.state.copy(),
+            state=self.state.clone(),
             seed=self.seed,
             rules_version=self.rules_version,
             step_count=self.step_count,
@@ -63,6 +72,8 @@ class FabgameEnv(gym.Env):
         hero1: Optional[Any] = None,
         arena0: Optional[Any] = None,
         arena1: Optional[Any] = None,
+        reuse_obs_buffers: bool = False,
+        flat_observation: bool = False,
     ) -> None:
         super().__init__()
         self.rules_version = rules_version
@@ -76,6 +87,8 @@ class FabgameEnv(gym.Env):
         self.reward_good_block = reward_good_block
         self.reward_overpitch = reward_overpitch
         self.max_episode_steps = max_episode_steps  # NEW: Store max steps
+        self.flat_observation = flat_observation
+        self.observation_layout = observation_layout(self.encoder_config)
         self._deck0 = deck0
         self._deck1 = deck1
         self._hero0 = hero0
@@ -87,6 +100,15 @@ class FabgameEnv(gym.Env):
         self._state: Optional[GameState] = None
         self._done = False
         self._step_count = 0
+        # Bumped on every state change; legal-action enumeration is memoized per version.
+        self._state_version = 0
+        self._legal_cache: Optional[Tuple[int, LegalActionSet]] = None
+        self._obs_encoder: Optional[ObservationEncoder] = None
+        self._obs_buffer: Optional[Observation] = None
+        # State version currently held by the encoder's buffers (-1: none).
+        self._encoded_version = -1
+        if reuse_obs_buffers:
+            self.use_observation_buffers()
 
         # Define Gymnasium spaces
         self.action_space = spaces.Discrete(len(self.action_vocab))
@@ -123,7 +145,15 @@ class FabgameEnv(gym.Env):
             "turn_player": spaces.Box(low=0, high=1, shape=(1,), dtype=np.float32),
             "last_attack_card": spaces.Box(low=-1, high=10, shape=(card_feature_dim,), dtype=np.float32),
         }
-        self.observation_space = spaces.Dict(obs_spaces)
+        if flat_observation:
+            # One float32 vector laid out by ``observation_layout``; see ``observation_views``.
+            self.observation_space = spaces.Box(
+                low=self.observation_layout.flatten({key: space.low for key, space in obs_spaces.items()}),
+                high=self.observation_layout.flatten({key: space.high for key, space in obs_spaces.items()}),
+                dtype=np.float32,
+            )
+        else:
+            self.observation_space = spaces.Dict(obs_spaces)
 
     def _get_card_feature_dim(self) -> int:
         """Calculate the dimension of card feature vectors."""
@@ -141,6 +171,59 @@ class FabgameEnv(gym.Env):
             raise RuntimeError("Environment has not been reset yet.")
         return self._state
 
+    def _set_state(self, state: GameState) -> None:
+        self._state = state
+        self._state_version += 1
+
+    def use_observation_buffers(
+        self, buffers: Optional[Observation] = None
+    ) -> Observation:
+        """Encode every later observation into the same arrays instead of fresh ones.
+
+        ``reset`` and ``step`` then return ``buffers`` itself, overwritten in place, so
+        callers that keep observations across steps must copy them.
+
+        Args:
+            buffers: A flat vector when ``flat_observation`` is set, otherwise arrays
+                shaped like the observation space (either may be one row of a
+                batched buffer); allocated when omitted
+
+        Returns:
+            The buffer observations are written into
+        """
+        if self.flat_observation:
+            flat = self.observation_layout.allocate() if buffers is None else buffers
+            self._obs_encoder = ObservationEncoder(self.encoder_config, self.observation_layout.views(flat))
+            self._obs_buffer = flat
+        else:
+            self._obs_encoder = ObservationEncoder(self.encoder_config, buffers)
+            self._obs_buffer = self._obs_encoder.buffers
+        self._encoded_version = -1
+        return self._obs_buffer
+
+    def observation_views(self, obs: np.ndarray) -> Dict[str, np.ndarray]:
+        """Return the structured form of a flat observation as views into it."""
+        return self.observation_layout.views(obs)
+
+    def _encode(self, undo: Optional[UndoRecord] = None) -> Observation:
+        """Encode the current state; ``undo`` records the step from the previous version."""
+        if self._obs_encoder is None:
+            if self.flat_observation:
+                return encode_flat_observation(self.state, config=self.encoder_config)
+            return encode_observation(self.state, config=self.encoder_config)
+        changes = None
+        # Incremental updates are only valid while the buffers hold the previous state.
+        if undo is not None and self._encoded_version == self._state_version - 1:
+            changes = undo.changes(self.state)
+        self._obs_encoder.encode(self.state, changes=changes)
+        self._encoded_version = self._state_version
+        return self._obs_buffer
+
+    def invalidate_legal_cache(self) -> None:
+        """Drop memoized legal actions; call after mutating ``env.state`` in place."""
+        self._state_version += 1
+        self._legal_cache = None
+
     def reset(
         self,
         *,
@@ -152,7 +235,7 @@ class FabgameEnv(gym.Env):
         hero1: Optional[Any] = None,
         arena0: Optional[Any] = None,
         arena1: Optional[Any] = None,
-    ) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    ) -> Tuple[Observation, Dict[str, Any]]:
         # Handle SB3-style reset parameters
         if options is not None:
             seed = options.get("seed", seed)
@@ -174,14 +257,14 @@ class FabgameEnv(gym.Env):
             arena0=arena0 or self._arena0,
             arena1=arena1 or self._arena1,
         )
-        self._state = game.state
+        self._set_state(game.state)
         self._done = False
         self._step_count = 0
-        obs = encode_observation(self.state, config=self.encoder_config)
-        actions = self.legal_actions()
+        obs = self._encode()
+        legal = self.legal_action_set()
         info = {
-            "legal_actions": actions,
-            "legal_action_mask": legal_action_mask(actions, self.action_vocab),
+            "legal_actions": legal.actions,
+            "legal_action_mask": legal.mask,
             "actor": current_actor_index(self.state),
             "rules_version": self.rules_version,
             "seed": self._seed,
@@ -191,12 +274,25 @@ class FabgameEnv(gym.Env):
         return obs, info
 
     def legal_actions(self) -> List[Action]:
-        return list(enumerate_legal_actions(self.state))
+        return list(self.legal_action_set().actions)
+
+    def legal_action_set(self) -> LegalActionSet:
+        """Return the legal actions of the current state as vocabulary indices plus mask.
+
+        The result is memoized per state version, so step validation, the ``info`` dict
+        and ``action_masks()`` share one enumeration. Treat the returned mask as read-only.
+        """
+        cached = self._legal_cache
+        if cached is not None and cached[0] == self._state_version:
+            return cached[1]
+        legal = enumerate_legal_indices(self.state, self.action_vocab)
+        self._legal_cache = (self._state_version, legal)
+        return legal
 
     @property
     def legal_action_mask(self) -> np.ndarray:
         """Return action mask for SB3 action masking."""
-        return legal_action_mask(self.legal_actions(), self.action_vocab)
+        return self.legal_action_set().mask
 
     def action_masks(self) -> np.ndarray:
         """Return action mask for SB3 action masking."""
@@ -219,17 +315,23 @@ class FabgameEnv(gym.Env):
     def step(
         self,
         action: Union[int, Action, Dict[str, Any]],
-    ) -> Tuple[Dict[str, np.ndarray], float, bool, bool, Dict[str, Any]]:
+    ) -> Tuple[Observation, float, bool, bool, Dict[str, Any]]:
         if self._done:
             raise RuntimeError("Cannot call step() once the episode has finished. Call reset().")
 
         actor = current_actor_index(self.state)
         resolved = self._resolve_action(action)
-        legal = self.legal_actions()
-        if resolved not in legal:
+        legal = self.legal_action_set()
+        if (action if isinstance(action, (int, np.integer)) else resolved) not in legal:
             raise ValueError(f"Illegal action attempted: {resolved!r}")
-        next_state, done, events = apply_action(self.state, resolved)
-        self._state = next_state
+        undo: Optional[UndoRecord] = None
+        if self._obs_encoder is None:
+            next_state, done, events = apply_action(self.state, resolved)
+        else:
+            # Journal the step so the reused buffers can be updated incrementally.
+            next_state = self.state.clone()
+            done, events, undo = apply_action_inplace(next_state, resolved)
+        self._set_state(next_state)
         self._step_count += 1
 
         # Check if episode should be truncated due to max steps
@@ -269,18 +371,21 @@ class FabgameEnv(gym.Env):
             else:
                 reward = self.reward_draw
 
-        obs = encode_observation(self.state, config=self.encoder_config)
+        obs = self._encode(undo)
         if truncated and not done:
             # Game ran too long without natural termination
             # Give small negative reward to discourage infinite games
             reward += -0.5
 
-        next_actions = self.legal_actions() if not (done or truncated) else []
+        if done or truncated:
+            next_actions: List[Action] = []
+            next_mask = np.zeros(len(self.action_vocab), dtype=np.bool_)
+        else:
+            next_legal = self.legal_action_set()
+            next_actions, next_mask = next_legal.actions, next_legal.mask
         info = {
             "legal_actions": next_actions,
-            "legal_action_mask": legal_action_mask(next_actions, self.action_vocab) if not (done or truncated) else np.zeros(
-                len(self.action_vocab), dtype=np.bool_
-            ),
+            "legal_action_mask": next_mask,
             "actor": current_actor_index(self.state) if not (done or truncated) else None,
             "prev_actor": actor,
             "rules_version": self.rules_version,
@@ -294,18 +399,18 @@ class FabgameEnv(gym.Env):
         return obs, float(reward), done, truncated, info
 
     def clone(self) -> GameState:
-        return self.state.copy()
+        return self.state.clone()
 
     def get_env_state(self) -> FabgameEnvState:
         return FabgameEnvState(
-            state=self.state.copy(),
+            state=self.state.clone(),
             seed=self._seed,
             rules_version=self.rules_version,
             step_count=self._step_count,
         )
 
     def restore(self, env_state: FabgameEnvState) -> None:
-        self._state = env_state.state.copy()
+        self._set_state(env_state.state.clone())
         self._seed = env_state.seed
         self.rules_version = env_state.rules_version
         self._step_count = env_state.step_count
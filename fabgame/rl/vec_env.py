@@ -0,0 +1,213 @@
+"""Batched environment stepping several ``FabgameEnv`` games together.
+
+``FabgameVecEnv`` follows the Stable-Baselines3 ``VecEnv`` protocol (``reset``,
+``step_async``/``step_wait``, ``env_method``, ...) and subclasses it when
+stable-baselines3 is installed, so ``MaskablePPO`` can use it directly instead of
+wrapping single environments in ``DummyVecEnv``. Observations and action masks
+live in preallocated ``(N, ...)`` arrays that are overwritten on every step; each
+game encodes its observation directly into its row of the batch.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+try:  # pragma: no cover - dependency guard
+    import numpy as np
+except ImportError as exc:  # pragma: no cover
+    raise RuntimeError("fabgame.rl.vec_env requires numpy to be installed") from exc
+
+try:  # pragma: no cover - optional dependency
+    from stable_baselines3.common.vec_env import VecEnv as _VecEnvBase
+except ImportError:  # pragma: no cover
+    _VecEnvBase = object  # type: ignore[assignment,misc]
+
+try:  # pragma: no cover - dependency guard
+    from gymnasium import spaces
+except ImportError as exc:  # pragma: no cover
+    raise RuntimeError("fabgame.rl.vec_env requires gymnasium to be installed") from exc
+
+from .env import FabgameEnv
+
+EnvFactory = Callable[[], FabgameEnv]
+VecObs = Union[np.ndarray, Dict[str, np.ndarray]]
+
+
+class FabgameVecEnv(_VecEnvBase):  # type: ignore[misc,valid-type]
+    """Steps ``N`` Fabgame games in lockstep with batched observations and masks.
+
+    Finished games are reset automatically; as in SB3, the final observation of a
+    finished game is reported in ``infos[i]["terminal_observation"]`` while the
+    batch row already holds the first observation of the next game.
+
+    Attributes:
+        envs: Underlying single-game environments
+        reset_infos: Info dicts produced by the latest reset of each game
+        num_envs: Number of games stepped together
+        observation_space: Per-game observation space (shared by all games)
+        action_space: Per-game action space
+    """
+
+    def __init__(
+        self,
+        env_fns: Union[int, Sequence[EnvFactory]],
+        *,
+        seed: Optional[int] = None,
+        **env_kwargs: Any,
+    ) -> None:
+        """Create the batched environment.
+
+        Args:
+            env_fns: Either the number of games, in which case each game is a
+                ``FabgameEnv(**env_kwargs)``, or a sequence of factories
+            seed: Base seed; game ``i`` is seeded with ``seed + i``
+            **env_kwargs: Keyword arguments for ``FabgameEnv`` when ``env_fns`` is an int
+
+        Raises:
+            ValueError: If no environments are requested
+        """
+        if isinstance(env_fns, int):
+            envs = [FabgameEnv(**env_kwargs) for _ in range(env_fns)]
+        else:
+            envs = [fn() for fn in env_fns]
+        if not envs:
+            raise ValueError("FabgameVecEnv requires at least one environment")
+        self.envs: List[FabgameEnv] = envs
+        first = envs[0]
+        if _VecEnvBase is object:
+            self.num_envs = len(envs)
+            self.observation_space = first.observation_space
+            self.action_space = first.action_space
+        else:  # pragma: no cover - exercised only with stable-baselines3 installed
+            super().__init__(len(envs), first.observation_space, first.action_space)
+
+        self._obs: VecObs
+        if isinstance(first.observation_space, spaces.Dict):
+            self._obs = {
+                key: np.zeros((len(envs),) + space.shape, dtype=space.dtype)
+                for key, space in first.observation_space.spaces.items()
+            }
+        else:
+            self._obs = np.zeros((len(envs),) + first.observation_space.shape, dtype=np.float32)
+        for idx, env in enumerate(envs):
+            env.use_observation_buffers(self._row(idx))
+        self._masks = np.zeros((len(envs), len(first.action_vocab)), dtype=np.bool_)
+        self._rewards = np.zeros(len(envs), dtype=np.float32)
+        self._dones = np.zeros(len(envs), dtype=np.bool_)
+        self._actions: Optional[np.ndarray] = None
+        self._seeds: List[Optional[int]] = [None if seed is None else seed + idx for idx in range(len(envs))]
+        self.reset_infos: List[Dict[str, Any]] = [{} for _ in envs]
+
+    def _row(self, idx: int) -> VecObs:
+        if isinstance(self._obs, dict):
+            return {key: buf[idx] for key, buf in self._obs.items()}
+        return self._obs[idx]
+
+    def _reset_env(self, idx: int) -> Tuple[VecObs, Dict[str, Any]]:
+        seed, self._seeds[idx] = self._seeds[idx], None
+        obs, info = self.envs[idx].reset(seed=seed)
+        self._masks[idx] = info["legal_action_mask"]
+        self.reset_infos[idx] = info
+        return obs, info
+
+    def reset(self) -> VecObs:
+        """Reset every game.
+
+        Returns:
+            Batched observations; arrays are reused by later calls
+        """
+        for idx in range(self.num_envs):
+            self._reset_env(idx)
+        return self._obs
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self._actions = np.asarray(actions)
+
+    def step_wait(self) -> Tuple[VecObs, np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        """Apply the pending actions to every game.
+
+        Returns:
+            Tuple of (observations, rewards, dones, infos); observation, reward and
+            done arrays are reused by later calls
+
+        Raises:
+            RuntimeError: If ``step_async`` was not called first
+        """
+        if self._actions is None:
+            raise RuntimeError("step_async() must be called before step_wait()")
+        actions, self._actions = self._actions, None
+        infos: List[Dict[str, Any]] = []
+        for idx, env in enumerate(self.envs):
+            obs, reward, terminated, truncated, info = env.step(int(actions[idx]))
+            done = terminated or truncated
+            self._rewards[idx] = reward
+            self._dones[idx] = done
+            info["TimeLimit.truncated"] = truncated and not terminated
+            if done:
+                # ``obs`` is this game's row of the batch, which the reset overwrites.
+                if isinstance(obs, dict):
+                    info["terminal_observation"] = {key: value.copy() for key, value in obs.items()}
+                else:
+                    info["terminal_observation"] = obs.copy()
+                self._reset_env(idx)
+            else:
+                self._masks[idx] = info["legal_action_mask"]
+            infos.append(info)
+        return self._obs, self._rewards, self._dones, infos
+
+    def step(
+        self, actions: np.ndarray
+    ) -> Tuple[VecObs, np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        self.step_async(actions)
+        return self.step_wait()
+
+    def action_masks(self) -> np.ndarray:
+        """Return the stacked ``(N, len(action_vocab))`` legal action masks."""
+        return self._masks
+
+    def seed(self, seed: Optional[int] = None) -> List[Optional[int]]:
+        """Seed the next reset of every game with ``seed + i``."""
+        self._seeds = [None if seed is None else seed + idx for idx in range(self.num_envs)]
+        return list(self._seeds)
+
+    def _indices(self, indices: Union[None, int, Sequence[int]]) -> Sequence[int]:
+        if indices is None:
+            return range(self.num_envs)
+        if isinstance(indices, int):
+            return [indices]
+        return indices
+
+    def get_attr(self, attr_name: str, indices: Union[None, int, Sequence[int]] = None) -> List[Any]:
+        return [getattr(self.envs[idx], attr_name) for idx in self._indices(indices)]
+
+    def set_attr(self, attr_name: str, value: Any, indices: Union[None, int, Sequence[int]] = None) -> None:
+        for idx in self._indices(indices):
+            setattr(self.envs[idx], attr_name, value)
+
+    def env_method(
+        self,
+        method_name: str,
+        *method_args: Any,
+        indices: Union[None, int, Sequence[int]] = None,
+        **method_kwargs: Any,
+    ) -> List[Any]:
+        if method_name == "action_masks" and not method_args and not method_kwargs:
+            return [self._masks[idx] for idx in self._indices(indices)]
+        return [
+            getattr(self.envs[idx], method_name)(*method_args, **method_kwargs) for idx in self._indices(indices)
+        ]
+
+    def has_attr(self, attr_name: str) -> bool:
+        return hasattr(self.envs[0], attr_name)
+
+    def env_is_wrapped(self, wrapper_class: type, indices: Union[None, int, Sequence[int]] = None) -> List[bool]:
+        return [False for _ in self._indices(indices)]
+
+    def get_images(self) -> Sequence[Optional[np.ndarray]]:
+        return [None for _ in self.envs]
+
+    def close(self) -> None:
+        for env in self.envs:
+            env.close()
+
+
+__all__ = ["FabgameVecEnv"]
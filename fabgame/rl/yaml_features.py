@@ -4,12 +4,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from ..io.card_yaml import CARDS_DIR, YAML_AVAILABLE, load_card_from_yaml, pitch_to_color
-
-try:  # pragma: no cover - optional dependency
-    from ..io import card_yaml as _card_yaml_module
-except Exception:  # pragma: no cover
-    _card_yaml_module = None  # type: ignore
+from ..io.card_bundle import yaml_documents
+from ..io.card_yaml import CARDS_DIR, load_card_from_yaml, pitch_to_color
 
 
 _BASE_TRIGGERS: Tuple[str, ...] = ("on_declare", "on_hit", "on_block", "on_graveyard")
@@ -66,31 +62,21 @@ class YamlFeatureExtractor:
         durations = set(_normalize_token(item) for item in _FALLBACK_DURATIONS if item is not None)
         keywords = set(_normalize_token(item) for item in _FALLBACK_KEYWORDS if item is not None)
 
-        yaml_module = getattr(_card_yaml_module, "yaml", None)
-        if YAML_AVAILABLE and yaml_module:
-            raw_paths = list(self.cards_dir.glob("*.yaml"))
-            for path in raw_paths:
-                try:
-                    with path.open("r", encoding="utf-8") as handle:
-                        data = yaml_module.safe_load(handle) or {}
-                except Exception:
-                    continue
-                if not isinstance(data, dict):
-                    continue
-                rules = data.get("rules")
-                if isinstance(rules, dict):
-                    durations.update(_normalize_token(rules.get("duration")))
-                    for kw in _ensure_list(rules.get("keywords")):
+        for data in yaml_documents(str(self.cards_dir)):
+            rules = data.get("rules")
+            if isinstance(rules, dict):
+                durations.update(_normalize_token(rules.get("duration")))
+                for kw in _ensure_list(rules.get("keywords")):
+                    keywords.add(_normalize_token(kw))
+                for effect in _ensure_list(rules.get("effects")):
+                    if not isinstance(effect, dict):
+                        continue
+                    when = _normalize_token(effect.get("when"))
+                    if when:
+                        triggers.append(when)
+                    durations.add(_normalize_token(effect.get("duration")))
+                    for kw in _ensure_list(effect.get("keywords")):
                         keywords.add(_normalize_token(kw))
-                    for effect in _ensure_list(rules.get("effects")):
-                        if not isinstance(effect, dict):
-                            continue
-                        when = _normalize_token(effect.get("when"))
-                        if when:
-                            triggers.append(when)
-                        durations.add(_normalize_token(effect.get("duration")))
-                        for kw in _ensure_list(effect.get("keywords")):
-                            keywords.add(_normalize_token(kw))
         triggers = [token for token in triggers if token]
         durations = {token for token in durations if token}
         keywords = {token for token in keywords if token}
@@ -172,11 +158,7 @@ class YamlFeatureExtractor:
         key = (card_name.lower(), int(pitch))
         if key in self._cache:
             return self._cache[key]
-        if YAML_AVAILABLE:
-            color = pitch_to_color(pitch)
-            data = load_card_from_yaml(card_name, color)
-        else:
-            data = None
+        data = load_card_from_yaml(card_name, pitch_to_color(pitch))
         features = self._features_from_yaml(data)
         self._cache[key] = features
         return features
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import ast
-from typing import Optional
+from functools import lru_cache
+from types import CodeType
+from typing import Any, Dict, Optional, Tuple
 
 from ..io.card_yaml import load_card_from_yaml, pitch_to_color
 from ..models import Card, GameState
@@ -26,15 +28,37 @@ _ALLOWED_NODES = (
     ast.Not,
 )
 
+# Upper bound on distinct (name, color) printings whose modifier rules are memoized.
+CARD_RULES_CACHE_SIZE = 1024
+# Upper bound on distinct condition strings kept as validated code objects.
+CONDITION_CACHE_SIZE = 1024
 
-def safe_eval_cond(expr: str, ctx: dict) -> bool:
+
+@lru_cache(maxsize=CONDITION_CACHE_SIZE)
+def compile_condition(expr: str) -> Tuple[CodeType, Tuple[str, ...]]:
+    """Parse, validate and compile a condition string once.
+
+    Returns:
+        The compiled code object and the names it references, in walk order
+
+    Raises:
+        ValueError: If the expression uses a node outside the allowed set
+    """
     tree = ast.parse(expr, mode="eval")
+    names: Dict[str, None] = {}
     for node in ast.walk(tree):
         if not isinstance(node, _ALLOWED_NODES):
             raise ValueError(f"Disallowed node in condition: {type(node).__name__}")
-        if isinstance(node, ast.Name) and node.id not in ctx:
-            raise NameError(f"Unknown name in condition: {node.id}")
-    compiled = compile(tree, "<cond>", "eval")
+        if isinstance(node, ast.Name):
+            names[node.id] = None
+    return compile(tree, "<cond>", "eval"), tuple(names)
+
+
+def safe_eval_cond(expr: str, ctx: dict) -> bool:
+    compiled, names = compile_condition(expr)
+    for name in names:
+        if name not in ctx:
+            raise NameError(f"Unknown name in condition: {name}")
     return bool(eval(compiled, {"__builtins__": {}}, ctx))
 
 
@@ -64,18 +88,25 @@ def _apply_card_modifiers(
     if not source_card:
         return attack_value
 
-    color = pitch_to_color(getattr(source_card, "pitch", 0))
-    yaml_data = load_card_from_yaml(source_card.name, color)
-    if not yaml_data:
-        return attack_value
-
-    rules = ((yaml_data.get("modifiers") or {}).get("on_declare") or [])
+    rules = card_on_declare_rules(source_card.name, pitch_to_color(getattr(source_card, "pitch", 0)))
     if not rules:
         return attack_value
 
     return _apply_rules(attack_value, rules, ctx=ctx)
 
 
+@lru_cache(maxsize=CARD_RULES_CACHE_SIZE)
+def card_on_declare_rules(name: str, color: Optional[str]) -> Tuple[Dict[str, Any], ...]:
+    """Return the card's ``modifiers.on_declare`` rules, reading its YAML only once.
+
+    Call ``card_on_declare_rules.cache_clear()`` after editing card YAML at runtime.
+    """
+    yaml_data = load_card_from_yaml(name, color)
+    if not yaml_data:
+        return ()
+    return tuple((yaml_data.get("modifiers") or {}).get("on_declare") or [])
+
+
 def _apply_hero_modifiers(gs: GameState, attack_value: int, *, ctx: dict) -> int:
     you = gs.players[gs.turn]
     rules = ((you.hero_modifiers or {}).get("on_declare") or [])
@@ -128,4 +159,4 @@ def _make_condition_context(gs: GameState, *, is_weapon: bool, source_card: Opti
     return ctx
 
 
-__all__ = ["apply_on_declare_attack_modifiers", "safe_eval_cond"]
+__all__ = ["apply_on_declare_attack_modifiers", "card_on_declare_rules", "compile_condition", "safe_eval_cond"]
@@ -0,0 +1,365 @@
+"""Zobrist-style 64-bit hashing of game states and a bounded transposition table.
+
+A state's hash is the sum (mod 2**64) of independent components: one per
+``GameState`` attribute, one per player's scalars (life, attack count, weapon
+usage) and one per card in each zone. Zones are hashed as multisets. Card order
+within a zone either does not matter to the rules or (for decks) is hidden
+information, so pitching the same cards in a different order, for example,
+reaches the same hash.
+
+Because the hash is additive, ``update_state_hash`` refreshes it after
+``apply_action_inplace`` from the ``UndoRecord`` the executor already keeps. It
+only touches the players and fields that the step changed and, in each changed
+zone, only the cards that entered or left it. Keys are
+derived from card definitions, not catalog ids, so hashes are stable across
+processes and can be used to deduplicate datasets.
+
+``StateHasher(hidden_player=p)`` hashes what p's opponent can see instead: p's
+hand and deck count as one pool of unseen cards plus the hand size. Every
+determinization of an information set then shares one hash.
+"""
+from __future__ import annotations
+
+import hashlib
+from enum import Enum
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .action_execution import ZONE_NAMES, UndoRecord
+from .catalog import CARD_CATALOG, CardCatalog
+from .catalog import card_key as definition_key
+from .models import Card, GameState
+
+MASK = (1 << 64) - 1
+_NONE_CODE = 0x6A09E667F3BCC908
+_HAND_SIZE_KEY = 0xBB67AE8584CAA73B
+
+
+def _mix(value: int) -> int:
+    """SplitMix64 finalizer: scramble ``value`` into a well-distributed 64-bit key."""
+    value = (value + 0x9E3779B97F4A7C15) & MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK
+    return value ^ (value >> 31)
+
+
+def _stable_key(*parts: Any) -> int:
+    """Derive a process-independent 64-bit key from ``repr(parts)``."""
+    return int.from_bytes(hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class StateHasher:
+    """Computes and incrementally updates Zobrist-style state hashes.
+
+    Per-card keys are cached by catalog id, so hashing a zone is one lookup and
+    one addition per card.
+    """
+
+    def __init__(self, catalog: CardCatalog = CARD_CATALOG, hidden_player: Optional[int] = None) -> None:
+        """Create a hasher.
+
+        Args:
+            catalog: Catalog used to cache per-card keys by id
+            hidden_player: Player whose hand and deck are hashed as one unseen pool
+        """
+        self.catalog = catalog
+        self.hidden_player = hidden_player
+        self._zone_salts = {
+            (player, zone): _stable_key("zone", player, zone) for player in range(2) for zone in ZONE_NAMES
+        }
+        if hidden_player is not None:
+            self._zone_salts[(hidden_player, "hand")] = self._zone_salts[(hidden_player, "deck")]
+        # (player, zone) -> per-card-id contribution of one copy of that card.
+        self._zone_keys: Dict[Tuple[int, str], List[int]] = {key: [] for key in self._zone_salts}
+        self._card_keys: List[int] = []
+        self._player_salts = (_stable_key("player", 0), _stable_key("player", 1))
+        self._field_salts: Dict[str, int] = {}
+        self._strings: Dict[str, int] = {}
+        # Memoized component hashes; game states reuse a small set of scalar values.
+        self._memo: Dict[Tuple[Any, ...], int] = {}
+
+    def card_key(self, card: Card) -> int:
+        """Return the 64-bit key of a card definition."""
+        card_id = self.catalog.card_id(card)
+        keys = self._card_keys
+        while len(keys) <= card_id:
+            keys.append(_stable_key("card", definition_key(self.catalog.card(len(keys)))))
+        return keys[card_id]
+
+    def _extend_zone_keys(self, player: int, zone: str, index: int) -> None:
+        keys = self._zone_keys[(player, zone)]
+        salt = self._zone_salts[(player, zone)]
+        # A hidden hand shares the deck's keys; the offset makes the hand size count.
+        offset = _HAND_SIZE_KEY if zone == "hand" and player == self.hidden_player else 0
+        while len(keys) <= index:
+            keys.append((_mix(salt ^ self.card_key(self.catalog.card(len(keys)))) + offset) & MASK)
+
+    def zone_hash(self, player: int, zone: str, cards: Sequence[Card]) -> int:
+        """Hash the multiset of ``cards`` held in ``player``'s ``zone``."""
+        keys = self._zone_keys[(player, zone)]
+        card_id = self.catalog.card_id
+        total = 0
+        for card in cards:
+            index = card_id(card)
+            if index >= len(keys):
+                self._extend_zone_keys(player, zone, index)
+            total += keys[index]
+        return total & MASK
+
+    def zone_delta(self, player: int, zone: str, before: Sequence[Card], after: Sequence[Card]) -> int:
+        """Return ``zone_hash(after) - zone_hash(before)`` from the cards that moved.
+
+        The unchanged prefix and suffix are skipped by identity, so only the
+        cards in between are hashed; the multiset hash is additive, so cards
+        that merely changed places there cancel out.
+        """
+        start, end_before, end_after = 0, len(before), len(after)
+        limit = min(end_before, end_after)
+        while start < limit and before[start] is after[start]:
+            start += 1
+        while end_before > start and end_after > start and before[end_before - 1] is after[end_after - 1]:
+            end_before -= 1
+            end_after -= 1
+        if end_before == end_after == start:
+            return 0
+        return self.zone_hash(player, zone, after[start:end_after]) - self.zone_hash(
+            player, zone, before[start:end_before]
+        )
+
+    def _code(self, value: Any) -> int:
+        if value is None:
+            return _NONE_CODE
+        if isinstance(value, (bool, int)):
+            return int(value) & MASK
+        if isinstance(value, Card):
+            return self.card_key(value)
+        if isinstance(value, str):
+            code = self._strings.get(value)
+            if code is None:
+                code = self._strings[value] = _stable_key("str", value)
+            return code
+        if isinstance(value, Enum):
+            return self._code(value.value)
+        if isinstance(value, (list, tuple)):
+            code = _stable_key("seq", len(value))
+            for item in value:
+                code = _mix(code ^ self._code(item))
+            return code
+        raise TypeError(f"Cannot hash state value of type {type(value).__name__}")
+
+    def field_hash(self, name: str, value: Any) -> int:
+        """Hash one ``GameState`` attribute value."""
+        memo_key = (name, tuple(value) if isinstance(value, list) else value)
+        try:
+            return self._memo[memo_key]
+        except KeyError:
+            pass
+        except TypeError:  # unhashable value, e.g. a Card with abilities
+            memo_key = None
+        salt = self._field_salts.get(name)
+        if salt is None:
+            salt = self._field_salts[name] = _stable_key("field", name)
+        code = _mix(salt ^ self._code(value))
+        if memo_key is not None and len(self._memo) < 1 << 16:
+            self._memo[memo_key] = code
+        return code
+
+    def player_hash(self, player: int, scalars: Tuple[int, int, Optional[bool]]) -> int:
+        """Hash a player's (life, attacks_this_turn, weapon used) scalars."""
+        memo_key = (player, scalars)
+        code = self._memo.get(memo_key)
+        if code is None:
+            code = _mix(self._player_salts[player] ^ self._code(scalars))
+            if len(self._memo) < 1 << 16:
+                self._memo[memo_key] = code
+        return code
+
+    def hash_state(self, state: GameState) -> int:
+        """Compute the hash of ``state`` from scratch.
+
+        Args:
+            state: Game state to hash
+
+        Returns:
+            Unsigned 64-bit hash
+        """
+        total = 0
+        for name, value in vars(state).items():
+            if name != "players":
+                total += self.field_hash(name, value)
+        for index, player in enumerate(state.players):
+            weapon = player.weapon
+            total += self.player_hash(
+                index, (player.life, player.attacks_this_turn, weapon.used_this_turn if weapon else None)
+            )
+            # Hero and weapon never change during a game, so update() can leave this term alone.
+            total += self.field_hash(f"player{index}", (player.hero, weapon.name if weapon else None))
+            for zone in ZONE_NAMES:
+                total += self.zone_hash(index, zone, getattr(player, zone))
+        return total & MASK
+
+    def update(self, value: int, state: GameState, undo: UndoRecord) -> int:
+        """Return the hash of ``state`` after an in-place action, given its hash before.
+
+        Args:
+            value: Hash of the state when ``undo`` was created
+            state: The state ``apply_action_inplace`` mutated
+            undo: Record returned by ``apply_action_inplace``
+
+        Returns:
+            Hash of the current ``state``
+        """
+        changes = undo.changes(state)
+        if changes.zones:
+            saved = {id(zone): contents for zone, contents in undo.zones}
+            for index, zone in changes.zones:
+                cards = getattr(state.players[index], zone)
+                value += self.zone_delta(index, zone, saved[id(cards)], cards)
+        for index in changes.players:
+            player = state.players[index]
+            weapon = player.weapon
+            value += self.player_hash(
+                index, (player.life, player.attacks_this_turn, weapon.used_this_turn if weapon else None)
+            ) - self.player_hash(index, undo.players[index])
+        for name in changes.fields:
+            if name == "floating_resources":
+                before: Any = undo.floating_resources
+            elif name == "reaction_arsenal_cards":
+                before = undo.reaction_arsenal_cards
+            else:
+                before = undo.state_fields[name]
+            value += self.field_hash(name, getattr(state, name)) - self.field_hash(name, before)
+        return value & MASK
+
+
+STATE_HASHER = StateHasher()
+
+
+_VIEW_HASHERS = (StateHasher(hidden_player=0), StateHasher(hidden_player=1))
+
+
+def view_hasher(observer: int) -> StateHasher:
+    """Return the shared hasher of what ``observer`` can see (the opponent's hand and deck pooled)."""
+    return _VIEW_HASHERS[1 - observer]
+
+
+def state_hash(state: GameState) -> int:
+    """Hash ``state`` with the process-wide ``STATE_HASHER``."""
+    return STATE_HASHER.hash_state(state)
+
+
+def update_state_hash(value: int, state: GameState, undo: UndoRecord) -> int:
+    """Update a hash after ``apply_action_inplace`` with the process-wide ``STATE_HASHER``."""
+    return STATE_HASHER.update(value, state, undo)
+
+
+class TranspositionEntry:
+    """Accumulated search statistics of one state.
+
+    Attributes:
+        key: Full 64-bit state hash
+        visits: Number of evaluations stored
+        value: Sum of the evaluations, from player 0's point of view
+        generation: Search generation that last touched the entry
+    """
+
+    __slots__ = ("key", "visits", "value", "generation")
+
+    def __init__(self, key: int, generation: int) -> None:
+        self.key = key
+        self.visits = 0
+        self.value = 0.0
+        self.generation = generation
+
+    @property
+    def mean(self) -> float:
+        return self.value / self.visits if self.visits else 0.0
+
+
+class TranspositionTable:
+    """Fixed-size, hash-indexed table of state statistics shared by search agents.
+
+    Each state hash maps to one slot. When two states compete for a slot, the
+    entry from the current search generation with more visits is kept, and
+    entries from older generations are always replaced. Call ``new_search()``
+    between decisions so stale statistics age out.
+
+    Attributes:
+        capacity: Number of slots
+        hits: Probes that found their state
+        misses: Probes that did not
+        replacements: Entries evicted by a different state
+    """
+
+    def __init__(self, capacity: int = 1 << 16) -> None:
+        """Create an empty table.
+
+        Args:
+            capacity: Number of slots
+
+        Raises:
+            ValueError: If ``capacity`` is below 1
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.replacements = 0
+        self._slots: List[Optional[TranspositionEntry]] = [None] * capacity
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return sum(entry is not None for entry in self._slots)
+
+    def new_search(self) -> None:
+        """Start a new generation; older entries become replaceable."""
+        self._generation += 1
+
+    def clear(self) -> None:
+        self._slots = [None] * self.capacity
+        self.hits = self.misses = self.replacements = 0
+
+    def probe(self, key: int) -> Optional[TranspositionEntry]:
+        """Return the entry stored for ``key``, if any."""
+        entry = self._slots[key % self.capacity]
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            entry.generation = self._generation
+            return entry
+        self.misses += 1
+        return None
+
+    def add(self, key: int, value: float, visits: int = 1) -> Optional[TranspositionEntry]:
+        """Accumulate ``visits`` evaluations summing to ``value`` for ``key``.
+
+        Args:
+            key: State hash
+            value: Sum of the new evaluations, from player 0's point of view
+            visits: Number of evaluations in ``value``
+
+        Returns:
+            The updated entry, or None if the slot is held by a more valuable entry
+        """
+        slot = key % self.capacity
+        entry = self._slots[slot]
+        if entry is None or entry.key != key:
+            if entry is not None and entry.generation == self._generation and entry.visits > visits:
+                return None
+            if entry is not None:
+                self.replacements += 1
+            entry = self._slots[slot] = TranspositionEntry(key, self._generation)
+        entry.visits += visits
+        entry.value += value
+        entry.generation = self._generation
+        return entry
+
+
+__all__ = [
+    "STATE_HASHER",
+    "StateHasher",
+    "TranspositionEntry",
+    "TranspositionTable",
+    "state_hash",
+    "update_state_hash",
+    "view_hasher",
+]
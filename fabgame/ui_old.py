@@ -4,7 +4,7 @@ import random
 from typing import Any, List, Optional, Tuple
 
 from .agents import bot_choose_action, current_human_action
-from .agents_ml import load_policy as load_ml_policy, load_sb3_policy, ml_bot_choose_action
+from .agents_ml import load_policy_cached as load_ml_policy, load_sb3_policy_cached as load_sb3_policy, ml_bot_choose_action
 from .deck import DeckLoadResult
 from .engine import apply_action, current_actor_index, enumerate_legal_actions, new_game
 from .models import Card, Game, GameState, Phase
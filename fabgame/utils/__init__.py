@@ -1,12 +1,13 @@
 """Utility modules for the Fabgame package.
 
 This package contains utility classes and functions used across the codebase:
-- pitch_calculator: Pitch combination calculation utilities
+- pitch_calculator: Pitch combination calculation utilities and per-hand pitch tables
 """
 from __future__ import annotations
 
 from .pitch_calculator import (
     PitchCalculator,
+    PitchTable,
     calculate_pitch_sum,
     find_minimal_pitch_combos,
     iter_pitch_combos,
@@ -14,6 +15,7 @@ from .pitch_calculator import (
 
 __all__ = [
     "PitchCalculator",
+    "PitchTable",
     "iter_pitch_combos",
     "calculate_pitch_sum",
     "find_minimal_pitch_combos",
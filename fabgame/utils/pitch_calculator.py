@@ -6,7 +6,7 @@ playing cards, eliminating code duplication across action enumeration logic.
 from __future__ import annotations
 
 import itertools
-from typing import Iterator, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
 from ..config import MAX_PITCH_ENUM
 from ..models import PlayerState
@@ -91,6 +91,71 @@ def find_minimal_pitch_combos(
     return valid_masks
 
 
+class PitchTable:
+    """Every pitchable hand subset, built once per hand and shared by all action types.
+
+    Subsets are stored as bitmasks together with their pitch sum and their lowest
+    single-card pitch, in the same order ``iter_pitch_combos`` yields them (by size,
+    then lexicographically). A subset is a minimal cover of ``needed`` when its sum
+    reaches ``needed`` but dropping its lowest-pitch card would not; that test is
+    equivalent to the per-card check done by ``find_minimal_pitch_combos``.
+
+    Attributes:
+        entries: ``(mask, pitch_sum, lowest_pitch)`` for every subset
+    """
+
+    def __init__(self, pitches: Sequence[int], max_pitch: Optional[int] = None):
+        """Build the subset table for a hand.
+
+        Args:
+            pitches: Pitch value of each card in hand, by hand index
+            max_pitch: Maximum number of cards in a subset (None = use MAX_PITCH_ENUM)
+        """
+        self.entries: List[Tuple[int, int, int]] = []
+        for combo in iter_pitch_combos(list(range(len(pitches))), max_pitch):
+            mask = 0
+            total = 0
+            lowest = pitches[combo[0]]
+            for idx in combo:
+                mask |= 1 << idx
+                value = pitches[idx]
+                total += value
+                if value < lowest:
+                    lowest = value
+            self.entries.append((mask, total, lowest))
+        self._covers: Dict[int, List[int]] = {}
+
+    def minimal_covers(self, needed: int) -> List[int]:
+        """Return bitmasks of all minimal subsets whose pitch sum covers ``needed``.
+
+        Args:
+            needed: Resources still owed after floating resources (must be > 0)
+
+        Returns:
+            List of bitmasks, memoized per ``needed`` value
+        """
+        covers = self._covers.get(needed)
+        if covers is None:
+            covers = [
+                mask for mask, total, lowest in self.entries if total >= needed and total - lowest < needed
+            ]
+            self._covers[needed] = covers
+        return covers
+
+    def minimal_covers_excluding(self, needed: int, index: int) -> List[int]:
+        """Return minimal covers that do not pitch the card at ``index``.
+
+        Args:
+            needed: Resources still owed after floating resources (must be > 0)
+            index: Hand index of the card being played
+
+        Returns:
+            List of bitmasks not containing ``index``
+        """
+        bit = 1 << index
+        return [mask for mask in self.minimal_covers(needed) if not mask & bit]
+
+
 class PitchCalculator:
     """Helper class for calculating pitch combinations for a player.
 
@@ -178,6 +243,7 @@ class PitchCalculator:
 
 
 __all__ = [
+    "PitchTable",
     "iter_pitch_combos",
     "calculate_pitch_sum",
     "find_minimal_pitch_combos",
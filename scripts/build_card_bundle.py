@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+"""
+Compile the card, hero and weapon YAML library into one JSON bundle.
+
+Loaders use the bundle instead of parsing YAML while its content hash matches
+the YAML files; rerun this script after editing them.
+
+Usage:
+    python -m scripts.build_card_bundle --output data/card_bundle.json
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from fabgame.io.card_bundle import BUNDLE_PATH, write_bundle
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compile card, hero and weapon YAML into one bundle.")
+    parser.add_argument("--output", type=str, default=BUNDLE_PATH, help="Bundle path to write.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    bundle = write_bundle(args.output)
+    print(
+        f"Wrote {len(bundle['documents'])} documents to {args.output} "
+        f"(content hash {bundle['content_hash'][:12]})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -23,7 +23,7 @@ except ImportError as exc:  # pragma: no cover
 
 from fabgame import deck as deck_lib
 from fabgame.agents import bot_choose_action
-from fabgame.agents_ml import load_policy as load_ml_policy, ml_bot_choose_action
+from fabgame.agents_ml import load_policy_cached, ml_bot_choose_action
 from fabgame.rl import FabgameEnv
 
 
@@ -59,11 +59,13 @@ def _load_deck_pool(path: Optional[str]) -> List[str]:
     directory = Path(path)
     if not directory.is_dir():
         raise FileNotFoundError(f"Deck pool directory not found: {path}")
-    return [str(p) for p in sorted(directory.glob("*.json"))]
+    paths = [str(p) for p in sorted(directory.glob("*.json"))]
+    deck_lib.DECK_CACHE.preload(paths)
+    return paths
 
 
 def _load_deck(path: str) -> Tuple[List, Dict[str, any]]:
-    return deck_lib.load_deck_from_json(path)
+    return deck_lib.load_deck_cached(path)
 
 
 @dataclass
@@ -71,7 +73,6 @@ class AgentSpec:
     label: str
     agent_type: str
     path: Optional[str] = None
-    policy_cache: Optional[object] = None
 
 
 class Agent:
@@ -113,9 +114,7 @@ def build_agent(spec: AgentSpec, seed: int) -> Agent:
     if spec.agent_type == "bot":
         return BotAgent(seed)
     if spec.agent_type == "ml":
-        if spec.policy_cache is None:
-            spec.policy_cache = load_ml_policy(spec.path or "", device="cpu")
-        return MLAgent(spec.policy_cache)
+        return MLAgent(load_policy_cached(spec.path or "", device="cpu"))
     raise ValueError(f"Unknown agent type: {spec.agent_type}")
 
 
@@ -4,12 +4,23 @@ Self-play data generator for fabgame.
 
 Usage:
     python -m scripts.gen_selfplay_data --games 50 --output data/selfplay_50.npz
+    python -m scripts.gen_selfplay_data --games 5000 --workers 32 --output data/selfplay_5k.npz
+    python -m scripts.gen_selfplay_data --games 5000 --format chunked --output data/selfplay_5k
+
+With ``--workers`` above 1, games are split into shards simulated by a process pool.
+Each worker writes ``<stem>.shard<k>.npz`` next to ``--output`` and the merged shard
+index is written to ``<stem>.index.json``; ``load_sharded_dataset`` concatenates them.
+
+``--format chunked`` streams transitions to a ``fabgame.rl.dataset`` directory
+instead of collecting them in memory (one directory per shard in worker mode).
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+import math
+import multiprocessing
 import random
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Sequence, Tuple
@@ -23,6 +34,7 @@ from fabgame import deck as deck_lib
 from fabgame.agents import bot_choose_action
 from fabgame.models import ActType
 from fabgame.rl import ACTION_VOCAB, FabgameEnv, legal_action_mask
+from fabgame.rl.dataset import ChunkedDatasetWriter
 
 
 def _parse_args() -> argparse.Namespace:
@@ -59,6 +71,30 @@ def _parse_args() -> argparse.Namespace:
         default="standard",
         help="Rules version label stored alongside each transition.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes; above 1, games are simulated in parallel and written as shards.",
+    )
+    parser.add_argument(
+        "--games-per-shard",
+        type=int,
+        default=None,
+        help="Games per shard in worker mode (default: games split evenly across workers).",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("npz", "chunked"),
+        default="npz",
+        help="npz collects everything in memory; chunked streams fixed-size chunks to a directory.",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=1024,
+        help="Transitions per chunk for --format chunked.",
+    )
     return parser.parse_args()
 
 
@@ -68,11 +104,14 @@ def _load_deck_pool(directory: Optional[str]) -> List[str]:
     path = Path(directory)
     if not path.is_dir():
         raise FileNotFoundError(f"Deck pool directory not found: {directory}")
-    return [str(p) for p in sorted(path.glob("*.json"))]
+    paths = [str(p) for p in sorted(path.glob("*.json"))]
+    # Hydrate once here so forked workers inherit the templates.
+    deck_lib.DECK_CACHE.preload(paths)
+    return paths
 
 
-def _load_deck(path: str) -> Tuple[List, Dict[str, Any]]:
-    cards, meta = deck_lib.load_deck_from_json(path)
+def _load_deck(path: str, rng: Optional[random.Random] = None) -> Tuple[List, Dict[str, Any]]:
+    cards, meta = deck_lib.load_deck_cached(path, rng=rng)
     return cards, meta
 
 
@@ -162,11 +201,66 @@ class EpisodeDataBuffer:
         self.deck_ids[:] = self.deck_ids[:-step_count]
         self.episode_ids[:] = self.episode_ids[:-step_count]
 
+    def commit_episode(self) -> None:
+        """Keep the steps of the current episode (already in the buffers)."""
+
     def is_empty(self) -> bool:
         """Check if no data has been collected."""
         return len(self.legal_masks) == 0
 
 
+class StreamingEpisodeSink:
+    """EpisodeDataBuffer counterpart that streams accepted episodes to disk.
+
+    Steps are staged in the writer until the episode is accepted or rolled back.
+    The dense legal action mask is not stored; it is recoverable from the CSR
+    legal action lists.
+    """
+
+    def __init__(self, writer: ChunkedDatasetWriter) -> None:
+        self.writer = writer
+
+    def append_step(
+        self,
+        obs: Dict[str, np.ndarray],
+        legal_mask: np.ndarray,
+        action_indices: List[int],
+        chosen_idx: int,
+        actor: int,
+        rules_version: str,
+        deck_pair_id: Tuple[str, str],
+        episode_id: int,
+    ) -> None:
+        """Stage a single step of the current episode."""
+        row: Dict[str, Any] = {f"obs__{key}": value for key, value in obs.items()}
+        row["chosen_action"] = np.int32(chosen_idx)
+        row["actor"] = np.int8(actor)
+        row["rules_version"] = np.int16(self.writer.encode_string("rules_version", rules_version))
+        row["deck_ids"] = np.array(
+            [self.writer.encode_string("deck_ids", deck_id) for deck_id in deck_pair_id], dtype=np.int16
+        )
+        row["episode_id"] = np.int32(episode_id)
+        row["reward"] = np.float32(0.0)
+        row["done"] = np.int8(0)
+        self.writer.stage(row, action_indices)
+
+    def append_outcome(self, reward: float, done: bool) -> None:
+        """Record reward and done flag for the last staged step."""
+        self.writer.set_last(reward=np.float32(reward), done=np.int8(1 if done else 0))
+
+    def rollback_episode(self, step_count: int) -> None:
+        """Drop the staged episode."""
+        self.writer.discard_episode()
+
+    def commit_episode(self) -> None:
+        """Write the staged episode into the current chunk."""
+        self.writer.commit_episode()
+
+    def is_empty(self) -> bool:
+        """Check if no transitions have been committed."""
+        return self.writer.rows == 0
+
+
 class EpisodeStats:
     """Tracks statistics during episode simulation."""
 
@@ -211,8 +305,8 @@ def _load_deck_configuration(
 
     deck0_path = rng.choice(deck_pool)
     deck1_path = rng.choice(deck_pool)
-    deck0, meta0 = _load_deck(deck0_path)
-    deck1, meta1 = _load_deck(deck1_path)
+    deck0, meta0 = _load_deck(deck0_path, rng)
+    deck1, meta1 = _load_deck(deck1_path, rng)
 
     hero0 = meta0.get("hero")
     hero1 = meta1.get("hero")
@@ -283,6 +377,17 @@ def _simulate_episode(
     return stats
 
 
+def _dataset_metadata(args: argparse.Namespace, accepted_episodes: int, deck_pool: List[str]) -> Dict[str, Any]:
+    return {
+        "games_requested": args.games,
+        "episodes_kept": accepted_episodes,
+        "max_pass_streak_filter": args.max_pass_streak,
+        "max_no_damage_filter": args.max_no_damage,
+        "rules_version": args.rules_version,
+        "deck_pool": deck_pool,
+    }
+
+
 def _build_dataset(buffer: EpisodeDataBuffer, args: argparse.Namespace, accepted_episodes: int, deck_pool: List[str]) -> Dict[str, np.ndarray]:
     """Construct final dataset dictionary from collected data."""
     dataset: Dict[str, np.ndarray] = {}
@@ -303,28 +408,34 @@ def _build_dataset(buffer: EpisodeDataBuffer, args: argparse.Namespace, accepted
     dataset["deck_ids"] = np.array(buffer.deck_ids, dtype=object)
     dataset["episode_id"] = np.array(buffer.episode_ids, dtype=np.int32)
 
-    metadata = {
-        "games_requested": args.games,
-        "episodes_kept": accepted_episodes,
-        "max_pass_streak_filter": args.max_pass_streak,
-        "max_no_damage_filter": args.max_no_damage,
-        "rules_version": args.rules_version,
-        "deck_pool": deck_pool,
-    }
+    metadata = _dataset_metadata(args, accepted_episodes, deck_pool)
     dataset["metadata_json"] = np.array([json.dumps(metadata)], dtype=object)
 
     return dataset
 
 
-def generate_dataset(args: argparse.Namespace) -> Dict[str, np.ndarray]:
-    """Generate self-play dataset by simulating multiple episodes."""
-    rng = random.Random(args.seed)
-    deck_pool = _load_deck_pool(args.deck_pool)
+def _game_seeds(seed: int, games: int) -> List[int]:
+    """Derive one independent seed per game from the master seed."""
+    rng = random.Random(seed)
+    return [rng.randrange(1, 1 << 30) for _ in range(games)]
+
+
+def _run_games(
+    args: argparse.Namespace,
+    deck_pool: List[str],
+    game_seeds: Sequence[int],
+    buffer: Optional[Any] = None,
+) -> Tuple[Any, int]:
+    """Simulate one game per seed, keeping only episodes that pass the filters.
+
+    ``buffer`` is an ``EpisodeDataBuffer`` (the default) or a ``StreamingEpisodeSink``.
+    """
     env = FabgameEnv(rules_version=args.rules_version)
-    buffer = EpisodeDataBuffer()
+    buffer = buffer if buffer is not None else EpisodeDataBuffer()
     accepted_episodes = 0
 
-    for game_idx in range(args.games):
+    for game_seed in game_seeds:
+        rng = random.Random(game_seed)
         # Load deck configuration for this episode
         deck0, deck1, hero0, hero1, arena0, arena1, deck_pair_id = _load_deck_configuration(deck_pool, rng)
 
@@ -348,19 +459,205 @@ def generate_dataset(args: argparse.Namespace) -> Dict[str, np.ndarray]:
             buffer.rollback_episode(stats.step_count)
             continue
 
+        buffer.commit_episode()
         accepted_episodes += 1
 
+    return buffer, accepted_episodes
+
+
+def generate_dataset(args: argparse.Namespace) -> Dict[str, np.ndarray]:
+    """Generate self-play dataset by simulating multiple episodes."""
+    deck_pool = _load_deck_pool(args.deck_pool)
+    buffer, accepted_episodes = _run_games(args, deck_pool, _game_seeds(args.seed, args.games))
+
     if buffer.is_empty():
         raise RuntimeError("No valid episodes generated; try relaxing filtering thresholds.")
 
     return _build_dataset(buffer, args, accepted_episodes, deck_pool)
 
 
+def generate_chunked_dataset(
+    args: argparse.Namespace,
+    directory: Path,
+    game_seeds: Optional[Sequence[int]] = None,
+    deck_pool: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Simulate games and stream accepted episodes to a chunked dataset directory.
+
+    Args:
+        args: Parsed CLI arguments
+        directory: Dataset directory (replaced if it exists)
+        game_seeds: Per-game seeds; derived from ``args.seed`` when omitted
+        deck_pool: Deck JSON paths; loaded from ``args.deck_pool`` when omitted
+
+    Returns:
+        The dataset manifest
+    """
+    if deck_pool is None:
+        deck_pool = _load_deck_pool(args.deck_pool)
+    if game_seeds is None:
+        game_seeds = _game_seeds(args.seed, args.games)
+    writer = ChunkedDatasetWriter(directory, chunk_size=getattr(args, "chunk_size", 1024))
+    _, accepted_episodes = _run_games(args, deck_pool, game_seeds, StreamingEpisodeSink(writer))
+    return writer.close(_dataset_metadata(args, accepted_episodes, deck_pool))
+
+
+def _shard_path(output: Path, shard_idx: int, chunked: bool = False) -> Path:
+    if chunked:
+        return output.with_name(f"{output.stem}.shard{shard_idx:05d}")
+    return output.with_name(f"{output.stem}.shard{shard_idx:05d}.npz")
+
+
+def _index_path(output: Path) -> Path:
+    return output.with_name(f"{output.stem}.index.json")
+
+
+def _generate_shard(task: Tuple[argparse.Namespace, List[str], int, int, List[int], str]) -> Dict[str, Any]:
+    """Worker entry point: simulate one shard of games and write it to disk."""
+    args, deck_pool, shard_idx, first_game, game_seeds, path = task
+    entry: Dict[str, Any] = {"shard": shard_idx, "first_game": first_game, "games": len(game_seeds)}
+    if getattr(args, "format", "npz") == "chunked":
+        manifest = generate_chunked_dataset(args, Path(path), game_seeds, deck_pool)
+        entry.update(
+            episodes=manifest["metadata"]["episodes_kept"],
+            transitions=manifest["rows"],
+            path=Path(path).name,
+        )
+        return entry
+
+    buffer, accepted_episodes = _run_games(args, deck_pool, game_seeds)
+    entry.update(episodes=accepted_episodes, transitions=len(buffer.chosen_actions), path=None)
+    if not buffer.is_empty():
+        np.savez_compressed(path, **_build_dataset(buffer, args, accepted_episodes, deck_pool))
+        entry["path"] = Path(path).name
+    return entry
+
+
+def generate_sharded_dataset(args: argparse.Namespace, output: Path) -> Dict[str, Any]:
+    """Simulate games across a process pool, one shard file per task.
+
+    Per-game seeds come from ``_game_seeds``, so the merged result is identical
+    to ``generate_dataset`` for the same arguments regardless of worker count.
+
+    Args:
+        args: Parsed CLI arguments (``workers`` and ``games_per_shard`` included)
+        output: Base output path; shards and the index are written next to it
+
+    Returns:
+        The shard index that was written to ``<stem>.index.json``
+
+    Raises:
+        RuntimeError: If no shard produced any valid episode
+    """
+    deck_pool = _load_deck_pool(args.deck_pool)
+    seeds = _game_seeds(args.seed, args.games)
+    workers = max(1, args.workers)
+    per_shard = args.games_per_shard or max(1, math.ceil(args.games / workers))
+    chunked = getattr(args, "format", "npz") == "chunked"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tasks = [
+        (
+            args,
+            deck_pool,
+            shard_idx,
+            start,
+            seeds[start:start + per_shard],
+            str(_shard_path(output, shard_idx, chunked)),
+        )
+        for shard_idx, start in enumerate(range(0, args.games, per_shard))
+    ]
+
+    with multiprocessing.Pool(processes=min(workers, len(tasks))) as pool:
+        shards = pool.map(_generate_shard, tasks, chunksize=1)
+
+    episode_offset = 0
+    transition_offset = 0
+    for entry in shards:
+        entry["episode_offset"] = episode_offset
+        entry["transition_offset"] = transition_offset
+        episode_offset += entry["episodes"]
+        transition_offset += entry["transitions"]
+    if transition_offset == 0:
+        raise RuntimeError("No valid episodes generated; try relaxing filtering thresholds.")
+
+    index = {
+        "format": "chunked" if chunked else "npz",
+        "games_requested": args.games,
+        "episodes_kept": episode_offset,
+        "transitions": transition_offset,
+        "seed": args.seed,
+        "max_pass_streak_filter": args.max_pass_streak,
+        "max_no_damage_filter": args.max_no_damage,
+        "rules_version": args.rules_version,
+        "deck_pool": deck_pool,
+        "shards": shards,
+    }
+    _index_path(output).write_text(json.dumps(index, indent=2))
+    return index
+
+
+def load_sharded_dataset(index_path: str) -> Dict[str, np.ndarray]:
+    """Concatenate the shards listed in an index into one in-memory dataset.
+
+    Episode ids are offset per shard so they match a serial ``generate_dataset`` run.
+
+    Args:
+        index_path: Path to a ``<stem>.index.json`` written by ``generate_sharded_dataset``
+
+    Returns:
+        Dataset dictionary with the same keys as ``generate_dataset``
+    """
+    path = Path(index_path)
+    index = json.loads(path.read_text())
+    if index.get("format", "npz") != "npz":
+        raise ValueError(f"{index_path} indexes chunked shards; read them with fabgame.rl.dataset")
+    parts: Dict[str, List[np.ndarray]] = {}
+    for entry in index["shards"]:
+        if entry["path"] is None:
+            continue
+        with np.load(path.with_name(entry["path"]), allow_pickle=True) as shard:
+            for key in shard.files:
+                if key == "metadata_json":
+                    continue
+                value = shard[key]
+                if key == "episode_id":
+                    value = value + entry["episode_offset"]
+                parts.setdefault(key, []).append(value)
+
+    dataset = {key: np.concatenate(values, axis=0) for key, values in parts.items()}
+    metadata = {
+        "games_requested": index["games_requested"],
+        "episodes_kept": index["episodes_kept"],
+        "max_pass_streak_filter": index["max_pass_streak_filter"],
+        "max_no_damage_filter": index["max_no_damage_filter"],
+        "rules_version": index["rules_version"],
+        "deck_pool": index["deck_pool"],
+    }
+    dataset["metadata_json"] = np.array([json.dumps(metadata)], dtype=object)
+    return dataset
+
+
 def main() -> None:
     args = _parse_args()
+    output_path = Path(args.output)
+    if args.workers > 1:
+        index = generate_sharded_dataset(args, output_path)
+        print(
+            f"Wrote {index['transitions']} transitions in {len(index['shards'])} shards; "
+            f"index at {_index_path(output_path)}"
+        )
+        return
+
+    if args.format == "chunked":
+        directory = output_path.with_suffix("") if output_path.suffix == ".npz" else output_path
+        manifest = generate_chunked_dataset(args, directory)
+        if manifest["rows"] == 0:
+            raise RuntimeError("No valid episodes generated; try relaxing filtering thresholds.")
+        print(f"Wrote dataset with {manifest['rows']} transitions in {len(manifest['chunks'])} chunks to {directory}")
+        return
+
     dataset = generate_dataset(args)
 
-    output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     np.savez_compressed(output_path, **dataset)
     print(f"Wrote dataset with {dataset['chosen_action'].shape[0]} transitions to {output_path}")
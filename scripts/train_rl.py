@@ -12,7 +12,7 @@ import argparse
 import random
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
 try:  # pragma: no cover - dependency guard
     import numpy as np
@@ -61,7 +61,10 @@ def _parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def flatten_observation(obs: Dict[str, np.ndarray]) -> torch.Tensor:
+def flatten_observation(obs: Union[np.ndarray, Dict[str, np.ndarray]]) -> torch.Tensor:
+    if isinstance(obs, np.ndarray):
+        # Flat observations already use the sorted-key layout built below.
+        return torch.from_numpy(np.ascontiguousarray(obs, dtype=np.float32).reshape(-1))
     buffers: List[torch.Tensor] = []
     for key in sorted(obs.keys()):
         value = obs[key]
@@ -110,7 +113,7 @@ class Trainer:
     def __init__(self, args: argparse.Namespace) -> None:
         self.args = args
         self.device = torch.device(args.device)
-        self.env = FabgameEnv(rules_version=args.rules_version)
+        self.env = FabgameEnv(rules_version=args.rules_version, flat_observation=True)
         sample_obs, _ = self.env.reset(seed=args.seed)
         obs_tensor = flatten_observation(sample_obs).to(self.device)
         self.obs_dim = obs_tensor.numel()
@@ -189,7 +192,7 @@ class Trainer:
     def evaluate(self, episodes: int) -> Dict[str, float]:
         wins = 0
         total_turns = 0
-        evaluation_env = FabgameEnv(rules_version=self.args.rules_version)
+        evaluation_env = FabgameEnv(rules_version=self.args.rules_version, flat_observation=True)
         for _ in range(episodes):
             obs, info = evaluation_env.reset(seed=self.rng.randrange(1, 1 << 30))
             done = False
@@ -30,13 +30,14 @@ try:  # pragma: no cover - optional dependency
     from gymnasium import spaces
     from stable_baselines3.common.callbacks import EvalCallback, CheckpointCallback, CallbackList
     from stable_baselines3.common.monitor import Monitor
-    from stable_baselines3.common.vec_env import DummyVecEnv
+    from stable_baselines3.common.vec_env import DummyVecEnv, VecMonitor
     from sb3_contrib.common.wrappers import ActionMasker
     import torch
 except ImportError as exc:  # pragma: no cover
     raise RuntimeError("scripts/train_sb3_improved.py requires gymnasium, stable-baselines3, and sb3-contrib to be installed") from exc
 
 from fabgame.rl.env import FabgameEnv
+from fabgame.rl.vec_env import FabgameVecEnv
 
 
 def linear_schedule(initial_value: float, final_value: float = 0.0) -> Callable[[float], float]:
@@ -96,6 +97,12 @@ def _parse_args() -> argparse.Namespace:
     parser.add_argument("--max-episode-steps", type=int, default=500, help="Maximum steps per episode (NEW: prevents infinite games).")
     parser.add_argument("--seed", type=int, default=42, help="Random seed.")
     parser.add_argument("--rules-version", type=str, default="standard", help="Rules version label.")
+    parser.add_argument(
+        "--num-envs",
+        type=int,
+        default=1,
+        help="Games stepped together in a batched FabgameVecEnv (1 keeps the single monitored env).",
+    )
 
     # Checkpointing and evaluation
     parser.add_argument("--checkpoint-dir", type=str, default="checkpoints_sb3_improved", help="Directory for saving checkpoints.")
@@ -174,17 +181,33 @@ def main() -> None:
     print()
 
     # Create training environment
-    env = make_env(
-        args.rules_version,
-        args.seed,
-        reward_win=args.reward_win,
-        reward_loss=args.reward_loss,
-        reward_step=args.reward_step,
-        reward_on_hit=args.reward_on_hit,
-        reward_good_block=args.reward_good_block,
-        reward_overpitch=args.reward_overpitch,
-        max_episode_steps=args.max_episode_steps,
-    )()
+    if args.num_envs > 1:
+        env = VecMonitor(
+            FabgameVecEnv(
+                args.num_envs,
+                seed=args.seed,
+                rules_version=args.rules_version,
+                reward_win=args.reward_win,
+                reward_loss=args.reward_loss,
+                reward_step=args.reward_step,
+                reward_on_hit=args.reward_on_hit,
+                reward_good_block=args.reward_good_block,
+                reward_overpitch=args.reward_overpitch,
+                max_episode_steps=args.max_episode_steps,
+            )
+        )
+    else:
+        env = make_env(
+            args.rules_version,
+            args.seed,
+            reward_win=args.reward_win,
+            reward_loss=args.reward_loss,
+            reward_step=args.reward_step,
+            reward_on_hit=args.reward_on_hit,
+            reward_good_block=args.reward_good_block,
+            reward_overpitch=args.reward_overpitch,
+            max_episode_steps=args.max_episode_steps,
+        )()
 
     # Create evaluation environment
     eval_env = make_env(
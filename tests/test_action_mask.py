@@ -57,3 +57,22 @@ def test_action_mask_matches_legal_actions():
     assert ActType.DEFEND in seen_types
     assert weapon_checked, "Expected to observe a weapon attack during the rollout"
     assert pass_states >= 1
+
+
+def test_enumerate_legal_indices_matches_action_list():
+    from fabgame.engine import apply_action, enumerate_legal_actions, new_game
+    from fabgame.rl import enumerate_legal_indices
+
+    state = new_game(seed=5).state
+    rng = random.Random(5)
+    for _ in range(150):
+        legal_actions = enumerate_legal_actions(state)
+        legal_set = enumerate_legal_indices(state)
+
+        assert list(legal_set) == legal_actions
+        assert (legal_set.mask == legal_action_mask(legal_actions)).all()
+        assert all(idx in legal_set for idx in legal_set.indices)
+
+        state, done, _ = apply_action(state, rng.choice(legal_actions))
+        if done:
+            break
@@ -0,0 +1,80 @@
+"""Tests for the precompiled card library bundle (fabgame.io.card_bundle)."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from fabgame.io import card_bundle
+from fabgame.io.card_yaml import load_card_from_yaml
+from fabgame.io.hero_yaml import load_hero_from_yaml
+from fabgame.io.weapon_yaml import load_weapon_from_yaml
+
+pytest.importorskip("yaml")
+
+
+@pytest.fixture
+def no_bundle(monkeypatch):
+    monkeypatch.setattr(card_bundle, "_active", None)
+
+
+class TestCardBundle:
+    """Tests for building, validating and serving the bundle."""
+
+    def test_bundle_serves_same_data_as_yaml(self, tmp_path, monkeypatch, no_bundle):
+        """
+        Given: A bundle compiled from the YAML library
+        When: Cards, heroes and weapons are loaded through it
+        Then: The results equal the YAML loaders' output
+        """
+        from_yaml = (
+            load_card_from_yaml("Brutal Assault", "blue"),
+            load_hero_from_yaml("Ira, Crimson Haze"),
+            load_weapon_from_yaml("Edge of Autumn"),
+            card_bundle.yaml_documents("data/cards", "hero_"),
+        )
+        path = tmp_path / "bundle.json"
+        card_bundle.write_bundle(str(path))
+        bundle = card_bundle.load_bundle(str(path))
+        assert bundle is not None
+
+        monkeypatch.setattr(card_bundle, "_active", bundle)
+        from_bundle = (
+            load_card_from_yaml("Brutal Assault", "blue"),
+            load_hero_from_yaml("Ira, Crimson Haze"),
+            load_weapon_from_yaml("Edge of Autumn"),
+            card_bundle.yaml_documents("data/cards", "hero_"),
+        )
+        assert from_bundle == from_yaml
+        assert from_bundle[0] is not None
+        assert load_card_from_yaml("No Such Card", "red") is None
+
+    def test_bundle_records_are_private_copies(self, tmp_path, monkeypatch):
+        path = tmp_path / "bundle.json"
+        card_bundle.write_bundle(str(path))
+        monkeypatch.setattr(card_bundle, "_active", card_bundle.load_bundle(str(path)))
+
+        first = load_card_from_yaml("Brutal Assault", "blue")
+        first["keywords"].append("mutated")
+        assert "mutated" not in load_card_from_yaml("Brutal Assault", "blue")["keywords"]
+
+    def test_stale_bundle_is_ignored(self, tmp_path):
+        """
+        Given: A bundle whose content hash no longer matches the YAML files
+        When: It is loaded
+        Then: It is rejected so loaders fall back to YAML
+        """
+        path = tmp_path / "bundle.json"
+        data = card_bundle.write_bundle(str(path))
+        data["content_hash"] = "0" * 64
+        path.write_text(json.dumps(data))
+
+        assert card_bundle.load_bundle(str(path)) is None
+        assert card_bundle.load_bundle(str(tmp_path / "missing.json")) is None
+
+    def test_bundle_records_sources(self):
+        data = card_bundle.build_bundle()
+
+        assert data["content_hash"] == card_bundle.content_hash()
+        assert "data/cards/brutal_assault_blue.yaml" in data["cards"]
+        assert "data/cards/brutal_assault_blue.yaml" in data["documents"]
@@ -0,0 +1,130 @@
+"""Tests for the immutable, interned card catalog."""
+from __future__ import annotations
+
+import copy
+import dataclasses
+import json
+import os
+import random
+import shutil
+
+import pytest
+
+from fabgame.catalog import CardCatalog
+from fabgame.deck import DeckCache, load_deck_from_json
+from fabgame.io import card_bundle, card_yaml
+from fabgame.models import Card
+
+
+class TestCardCatalog:
+    """Tests for CardCatalog interning and integer ids."""
+
+    def test_intern_returns_shared_instance(self):
+        catalog = CardCatalog()
+        first = catalog.intern(Card(name="Strike", cost=1, attack=4, defense=3, pitch=1, keywords=["go_again"]))
+        second = catalog.intern(Card(name="Strike", cost=1, attack=4, defense=3, pitch=1, keywords=["go_again"]))
+
+        assert first is second
+        assert catalog.card_id(second) == 0
+        assert catalog.card(0) is first
+        assert len(catalog) == 1
+
+    def test_distinct_pitch_gets_distinct_id(self):
+        catalog = CardCatalog()
+        red = catalog.card_id(Card(name="Strike", cost=1, attack=4, defense=3, pitch=1))
+        blue = catalog.card_id(Card(name="Strike", cost=1, attack=4, defense=3, pitch=3))
+
+        assert red != blue
+        assert catalog.card(blue).pitch == 3
+
+    def test_cards_are_immutable_and_copy_to_self(self):
+        card = Card(name="Strike", cost=1, attack=4, defense=3, pitch=1, keywords=["go_again"])
+
+        assert card.keywords == ("go_again",)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            card.attack = 10  # type: ignore[misc]
+        assert copy.deepcopy(card) is card
+
+    def test_deck_copies_share_interned_cards(self):
+        deck, _ = load_deck_from_json("data/decks/bravo_demo_deck.json")
+        by_name = {}
+        for card in deck:
+            by_name.setdefault((card.name, card.pitch), card)
+            assert by_name[(card.name, card.pitch)] is card
+
+
+class TestDeckCache:
+    """Tests for hydrating deck files once and revalidating them by mtime."""
+
+    def test_cached_deck_matches_fresh_load(self):
+        """
+        Given: The same seeded RNG
+        When: A deck is loaded fresh and through the cache
+        Then: Both produce the same shuffled order and metadata
+        """
+        cache = DeckCache()
+        fresh, fresh_meta = load_deck_from_json("data/decks/bravo_demo_deck.json", rng=random.Random(4))
+        cached, cached_meta = cache.load("data/decks/bravo_demo_deck.json", rng=random.Random(4))
+
+        assert cached == fresh
+        assert cached_meta == fresh_meta
+        assert cache.template("data/decks/bravo_demo_deck.json") is cache.template("data/decks/bravo_demo_deck.json")
+
+    def test_instances_are_independent(self):
+        cache = DeckCache()
+        deck, meta = cache.load("data/decks/bravo_demo_deck.json")
+        deck.pop()
+        meta["arena"].append("extra")
+
+        again, again_meta = cache.load("data/decks/bravo_demo_deck.json")
+        assert len(again) == len(deck) + 1
+        assert "extra" not in again_meta["arena"]
+
+    def test_modified_file_is_rehydrated(self, tmp_path):
+        """
+        Given: A cached deck file
+        When: The file is rewritten with a new mtime
+        Then: The cache hydrates the new contents
+        """
+        path = tmp_path / "deck.json"
+        shutil.copy("data/decks/bravo_demo_deck.json", path)
+        cache = DeckCache()
+        before = cache.template(str(path))
+
+        data = json.loads(path.read_text())
+        data["name"] = "Renamed"
+        path.write_text(json.dumps(data))
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, before.mtime_ns + 1_000_000_000))
+
+        after = cache.template(str(path))
+        assert after is not before
+        assert after.meta["name"] == "Renamed"
+
+    def test_modified_card_yaml_is_rehydrated(self, tmp_path, monkeypatch):
+        """
+        Given: A cached deck whose card stats come from a card YAML file
+        When: Only that YAML file is rewritten
+        Then: The cache hydrates the card again with the new stats
+        """
+        pytest.importorskip("yaml")
+        cards_dir = tmp_path / "cards"
+        cards_dir.mkdir()
+        yaml_path = cards_dir / "crash_down_red.yaml"
+        shutil.copy("data/cards/crash_down_red.yaml", yaml_path)
+        monkeypatch.setattr(card_yaml, "CARDS_DIR", str(cards_dir))
+        monkeypatch.setattr(card_bundle, "_active", None)
+        deck_path = tmp_path / "deck.json"
+        deck_path.write_text(json.dumps({"cards": [{"name": "Crash Down", "color": "red"}]}))
+        cache = DeckCache()
+        before = cache.template(str(deck_path))
+        assert before.cards[0].defense == 3
+
+        yaml_path.write_text(yaml_path.read_text().replace("defense: 3", "defense: 5"))
+        stat = os.stat(yaml_path)
+        os.utime(yaml_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        after = cache.template(str(deck_path))
+        assert after is not before
+        assert after.cards[0].defense == 5
+        assert cache.template(str(deck_path)) is after
@@ -0,0 +1,65 @@
+"""Tests for the array-backed compact game state."""
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from fabgame.compact_state import CompactGameState, CompactLayout
+from fabgame.deck import load_deck_from_json
+from fabgame.engine import apply_action, enumerate_legal_actions, new_game
+from fabgame.models import Card
+
+
+def test_round_trip_through_rollout():
+    deck0, meta0 = load_deck_from_json("data/decks/ira_welcome.json")
+    deck1, meta1 = load_deck_from_json("data/decks/bravo_demo_deck.json")
+    gs = new_game(
+        seed=3,
+        deck0=deck0,
+        deck1=deck1,
+        hero0=meta0.get("hero"),
+        hero1=meta1.get("hero"),
+        arena0=meta0.get("arena"),
+        arena1=meta1.get("arena"),
+    ).state
+    rng = random.Random(4)
+    for _ in range(150):
+        compact = CompactGameState.from_state(gs)
+        assert compact.to_state() == gs
+        legal = enumerate_legal_actions(gs)
+        if not legal:
+            break
+        gs, done, _ = apply_action(gs, rng.choice(legal))
+        if done:
+            break
+
+
+def test_copy_is_independent_buffer():
+    gs = new_game(seed=1).state
+    compact = CompactGameState.from_state(gs)
+    clone = compact.copy()
+
+    clone.buffer[:] = 0
+    assert compact.to_state() == gs
+    assert compact.player_scalar(0, "life") == gs.players[0].life
+    assert [compact.catalog.card(int(i)) for i in compact.zone_ids(0, "hand")] == gs.players[0].hand
+
+
+def test_zone_over_capacity_raises():
+    gs = new_game(seed=1).state
+    with pytest.raises(ValueError):
+        CompactGameState.from_state(gs, layout=CompactLayout(deck_capacity=2))
+
+
+def test_reaction_arsenal_card_new_to_catalog():
+    gs = new_game(seed=2).state
+    card = Card(name="Compact Arsenal Reaction", cost=0, defense=4, pitch=1, keywords=["defense_reaction"])
+    gs.players[1].grave.append(card)
+    gs.reaction_arsenal_cards.append(card.name)
+
+    assert CompactGameState.from_state(gs).to_state() == gs
+
+    gs.reaction_arsenal_cards.append("Compact Unknown Reaction")
+    with pytest.raises(ValueError):
+        CompactGameState.from_state(gs)
@@ -1,6 +1,15 @@
+import os
 from types import SimpleNamespace
 
-from scripts.gen_selfplay_data import generate_dataset
+import numpy as np
+import pytest
+
+from scripts.gen_selfplay_data import (
+    generate_chunked_dataset,
+    generate_dataset,
+    generate_sharded_dataset,
+    load_sharded_dataset,
+)
 
 
 def test_generate_dataset_single_game(tmp_path):
@@ -19,3 +28,160 @@ def test_generate_dataset_single_game(tmp_path):
     for key, value in dataset.items():
         if key.startswith("obs__"):
             assert value.shape[0] == transition_count
+
+
+def test_sharded_generation_matches_serial(tmp_path):
+    args = SimpleNamespace(
+        games=3,
+        seed=11,
+        deck_pool=None,
+        rules_version="standard",
+        max_pass_streak=12,
+        max_no_damage=2000,
+        workers=2,
+        games_per_shard=2,
+    )
+    output = tmp_path / "selfplay.npz"
+    index = generate_sharded_dataset(args, output)
+    assert [entry["games"] for entry in index["shards"]] == [2, 1]
+
+    merged = load_sharded_dataset(str(tmp_path / "selfplay.index.json"))
+    serial = generate_dataset(args)
+    assert merged.keys() == serial.keys()
+    for key in serial:
+        if key in {"metadata_json", "legal_actions"}:
+            continue
+        assert np.array_equal(merged[key], serial[key]), key
+    assert all(np.array_equal(a, b) for a, b in zip(merged["legal_actions"], serial["legal_actions"]))
+
+
+def test_chunked_generation_streams_same_transitions(tmp_path):
+    args = SimpleNamespace(
+        games=2,
+        seed=7,
+        deck_pool=None,
+        rules_version="standard",
+        max_pass_streak=12,
+        max_no_damage=2000,
+        chunk_size=64,
+    )
+    manifest = generate_chunked_dataset(args, tmp_path / "chunked")
+    serial = generate_dataset(args)
+
+    assert manifest["rows"] == serial["chosen_action"].shape[0]
+    assert all(chunk["rows"] <= 64 for chunk in manifest["chunks"])
+
+    def column(key):
+        return np.concatenate(
+            [np.load(tmp_path / "chunked" / chunk["name"] / f"{key}.npy") for chunk in manifest["chunks"]]
+        )
+
+    for key in ("chosen_action", "reward", "done", "actor", "episode_id", "obs__life", "obs__hand"):
+        assert np.array_equal(column(key), serial[key]), key
+
+    legal = []
+    for chunk in manifest["chunks"]:
+        chunk_dir = tmp_path / "chunked" / chunk["name"]
+        flat = np.load(chunk_dir / "legal_actions.npy")
+        offsets = np.load(chunk_dir / "legal_actions_offsets.npy")
+        legal.extend(flat[start:end] for start, end in zip(offsets[:-1], offsets[1:]))
+    assert all(np.array_equal(a, b) for a, b in zip(legal, serial["legal_actions"]))
+    assert manifest["vocabularies"]["rules_version"] == ["standard"]
+
+
+def test_chunked_writer_discards_rejected_episodes(tmp_path):
+    from fabgame.rl.dataset import ChunkedDatasetWriter
+
+    writer = ChunkedDatasetWriter(tmp_path / "data", chunk_size=2)
+    for step in range(3):
+        writer.stage({"value": np.float32(step)}, [step])
+    writer.discard_episode()
+    for step in range(3):
+        writer.stage({"value": np.float32(10 + step)}, [step, step + 1])
+    writer.commit_episode()
+    manifest = writer.close()
+
+    assert manifest["rows"] == 3
+    assert [chunk["rows"] for chunk in manifest["chunks"]] == [2, 1]
+    values = np.concatenate([np.load(tmp_path / "data" / c["name"] / "value.npy") for c in manifest["chunks"]])
+    assert values.tolist() == [10.0, 11.0, 12.0]
+
+
+def test_chunked_writer_copies_staged_arrays(tmp_path):
+    from fabgame.rl.dataset import ChunkedDatasetWriter
+
+    writer = ChunkedDatasetWriter(tmp_path / "data", chunk_size=4)
+    obs = np.zeros(3, dtype=np.float32)
+    legal = np.array([1, 2], dtype=np.int32)
+    for step in range(2):
+        obs[:] = step
+        legal[0] = step
+        writer.stage({"obs": obs}, legal)
+    writer.commit_episode()
+    manifest = writer.close()
+
+    chunk = tmp_path / "data" / manifest["chunks"][0]["name"]
+    assert np.load(chunk / "obs.npy").tolist() == [[0.0] * 3, [1.0] * 3]
+    assert np.load(chunk / "legal_actions.npy").tolist() == [0, 2, 1, 2]
+
+
+def test_selfplay_dataset_reads_sharded_chunks(tmp_path):
+    from fabgame.rl import ACTION_VOCAB, SelfPlayDataset
+
+    args = SimpleNamespace(
+        games=3,
+        seed=11,
+        deck_pool=None,
+        rules_version="standard",
+        max_pass_streak=12,
+        max_no_damage=2000,
+        workers=2,
+        games_per_shard=2,
+        format="chunked",
+        chunk_size=50,
+    )
+    generate_sharded_dataset(args, tmp_path / "selfplay")
+    serial = generate_dataset(args)
+    dataset = SelfPlayDataset(tmp_path / "selfplay.index.json")
+    assert len(dataset) == serial["chosen_action"].shape[0]
+
+    rows = [7, 0, len(dataset) - 1, 3]
+    batch = dataset.get(rows, fields=["chosen_action", "episode_id", "obs__hand"])
+    for key in batch:
+        assert np.array_equal(batch[key], serial[key][rows]), key
+    assert np.array_equal(dataset.legal_action_mask(rows, len(ACTION_VOCAB)), serial["legal_action_mask"][rows] == 1)
+    assert dataset.vocabularies["deck_ids"] == ["random"]
+
+    seen = []
+    for batch in dataset.iter_batches(64, seed=0, fields=["chosen_action"], action_count=len(ACTION_VOCAB)):
+        assert batch["legal_action_mask"][np.arange(len(batch["chosen_action"])), batch["chosen_action"]].all()
+        seen.append(batch["chosen_action"])
+    assert sorted(np.concatenate(seen).tolist()) == sorted(serial["chosen_action"].tolist())
+
+
+def test_selfplay_dataset_bounds_open_files(tmp_path):
+    from fabgame.rl.dataset import ChunkedDatasetWriter, SelfPlayDataset
+
+    resource = pytest.importorskip("resource")
+    if not os.path.isdir("/proc/self/fd"):
+        pytest.skip("needs /proc/self/fd to count open files")
+
+    writer = ChunkedDatasetWriter(tmp_path / "data", chunk_size=8)
+    for step in range(2000):
+        writer.stage({"value": np.int32(step), "obs": np.full(2, step, dtype=np.float32)}, [step % 5])
+    writer.commit_episode()
+    writer.close()
+
+    dataset = SelfPlayDataset(tmp_path / "data", max_open_chunks=4)
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    # 250 chunks x 4 files would need about 1000 handles without the bound.
+    resource.setrlimit(resource.RLIMIT_NOFILE, (len(os.listdir("/proc/self/fd")) + 64, hard))
+    try:
+        seen = []
+        for batch in dataset.iter_batches(64, seed=0, action_count=5):
+            assert batch["legal_action_mask"][np.arange(len(batch["value"])), batch["value"] % 5].all()
+            seen.append(batch["value"])
+    finally:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+    assert sorted(np.concatenate(seen).tolist()) == list(range(2000))
+    assert len(dataset._open) <= 4
@@ -446,3 +446,22 @@ class TestBoundaryConditions:
         assert state4.players[1].life == defender_life
         # Damage should be 0
         assert state4.pending_damage == 0
+
+    def test_large_hand_pitch_options_are_minimal(self):
+        """
+        Given: A 10-card hand (the vocabulary maximum) with mixed pitch values
+        When: Enumerating attacks
+        Then: Every pitch mask is a minimal cover matching find_minimal_pitch_combos
+        """
+        from fabgame.utils.pitch_calculator import find_minimal_pitch_combos
+
+        gs = create_test_game(phase=Phase.ACTION, turn=0, action_points=1)
+        hand = [Card(name="Big Attack", cost=4, attack=7, defense=2, pitch=1)]
+        hand += [Card(name=f"Pitch {i}", cost=0, attack=0, defense=2, pitch=1 + i % 3) for i in range(9)]
+        gs.players[0].hand = hand
+
+        legal = enumerate_legal_actions(gs)
+        masks = [a.pitch_mask for a in legal if a.typ == ActType.PLAY_ATTACK and a.play_idx == 0]
+
+        expected = find_minimal_pitch_combos(gs.players[0], list(range(1, 10)), 4)
+        assert masks == expected
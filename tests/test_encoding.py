@@ -0,0 +1,82 @@
+import numpy as np
+
+from fabgame.engine import current_actor_index
+from fabgame.models import Card
+from fabgame.rl.encoding import (
+    CARD_KEYWORD_VOCAB,
+    EncoderConfig,
+    card_feature_table,
+    encode_card,
+    encode_observation,
+)
+from fabgame.rl.env import FabgameEnv
+
+
+def test_card_feature_table_shares_rows_between_equal_cards():
+    config = EncoderConfig()
+    table = card_feature_table(config)
+    first = Card(name="Table Test Strike", cost=1, attack=4, defense=2, pitch=2, keywords=("go_again",))
+    twin = Card(name="Table Test Strike", cost=1, attack=4, defense=2, pitch=2, keywords=("go_again",))
+    other = Card(name="Table Test Strike", cost=1, attack=4, defense=2, pitch=3)
+
+    assert table.row_id(None) == 0
+    assert table.row_id(first) == table.row_id(twin) != table.row_id(other)
+
+    vec = encode_card(first, config)
+    assert vec.shape == (table.feature_dim,)
+    assert list(vec[:8]) == [4.0, 2.0, 1.0, 2.0, 1.0, 1.0, 0.0, 0.0]
+    assert vec[8 + CARD_KEYWORD_VOCAB.index("go_again")] == 1.0
+
+    vec[:] = -1.0  # callers get a private copy
+    assert np.array_equal(encode_card(first, config)[:4], [4.0, 2.0, 1.0, 2.0])
+    assert not encode_card(None, config).any()
+
+
+def test_observation_zones_are_gathered_from_card_rows():
+    env = FabgameEnv(seed=3)
+    obs, _ = env.reset(seed=3)
+    actor = current_actor_index(env.state)
+    hand = env.state.players[actor].hand
+    table = card_feature_table(env.encoder_config)
+
+    assert obs["hand_mask"][0].sum() == len(hand)
+    assert np.array_equal(obs["hand"][0, : len(hand)], table.rows[table.row_ids(hand)])
+    assert not obs["hand"][0, len(hand) :].any()
+
+
+def test_reused_buffers_match_fresh_encoding():
+    env = FabgameEnv(seed=5, reuse_obs_buffers=True, max_episode_steps=80)
+    obs, info = env.reset(seed=5)
+    buffers = obs
+    rng = np.random.default_rng(5)
+    done = False
+    while not done:
+        fresh = encode_observation(env.state, config=env.encoder_config)
+        assert obs is buffers
+        for key, value in fresh.items():
+            assert np.array_equal(obs[key], value), key
+        action = int(rng.choice(np.flatnonzero(info["legal_action_mask"])))
+        obs, _, terminated, truncated, info = env.step(action)
+        done = terminated or truncated
+
+
+def test_flat_observation_matches_sorted_concatenation():
+    dict_env = FabgameEnv(seed=11)
+    flat_env = FabgameEnv(seed=11, flat_observation=True, reuse_obs_buffers=True)
+    obs, info = dict_env.reset(seed=11)
+    flat, _ = flat_env.reset(seed=11)
+    layout = flat_env.observation_layout
+    assert flat.shape == flat_env.observation_space.shape == (layout.size,)
+
+    for _ in range(20):
+        expected = np.concatenate([np.asarray(obs[key], dtype=np.float32).ravel() for key in sorted(obs)])
+        assert np.array_equal(flat, expected)
+        views = flat_env.observation_views(flat)
+        assert np.shares_memory(views["hand"], flat)
+        assert np.array_equal(views["hand"], obs["hand"])
+        action = int(np.flatnonzero(info["legal_action_mask"])[0])
+        obs, _, terminated, truncated, info = dict_env.step(action)
+        flat, *_ = flat_env.step(action)
+        if terminated or truncated:
+            break
+    assert flat_env.observation_space.contains(flat)
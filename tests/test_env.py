@@ -27,3 +27,102 @@ def test_env_reset_step_and_restore():
         assert env.state.turn == snapshot.state.turn
         assert env.state.phase == snapshot.state.phase
 
+
+
+def test_env_enumerates_legal_actions_once_per_state(monkeypatch):
+    import fabgame.rl.env as env_module
+
+    calls = []
+    original = env_module.enumerate_legal_indices
+
+    def counting(state, vocab):
+        calls.append(state)
+        return original(state, vocab)
+
+    monkeypatch.setattr(env_module, "enumerate_legal_indices", counting)
+    env = FabgameEnv(rules_version="standard")
+    _, info = env.reset(seed=21)
+    assert (env.action_masks() == info["legal_action_mask"]).all()
+    assert len(calls) == 1
+
+    _, _, terminated, truncated, next_info = env.step(info["legal_actions"][0])
+    if not (terminated or truncated):
+        assert (env.action_masks() == next_info["legal_action_mask"]).all()
+        assert env.legal_actions() == next_info["legal_actions"]
+    assert len(calls) == 2
+
+    env.restore(env.get_env_state())
+    env.action_masks()
+    assert len(calls) == 3
+
+
+def test_only_reused_buffers_compute_state_changes(monkeypatch):
+    from fabgame.action_execution import UndoRecord
+
+    calls = []
+    original = UndoRecord.changes
+
+    def counting(self, state):
+        calls.append(state)
+        return original(self, state)
+
+    monkeypatch.setattr(UndoRecord, "changes", counting)
+    for reuse, expected in ((False, 0), (True, 3)):
+        env = FabgameEnv(seed=9, reuse_obs_buffers=reuse)
+        _, info = env.reset(seed=9)
+        for _ in range(3):
+            _, _, terminated, truncated, info = env.step(info["legal_actions"][0])
+            assert not (terminated or truncated)
+        assert len(calls) == expected
+        calls.clear()
+
+
+def test_vec_env_steps_batch_and_auto_resets():
+    import numpy as np
+
+    from fabgame.rl import FabgameVecEnv
+
+    vec_env = FabgameVecEnv(3, seed=7, max_episode_steps=20)
+    obs = vec_env.reset()
+    assert obs["life"].shape == (3, 2)
+    assert set(obs) == set(vec_env.observation_space.spaces)
+
+    rng = np.random.default_rng(0)
+    finished = 0
+    for _ in range(60):
+        masks = vec_env.action_masks()
+        assert masks.shape == (3, len(vec_env.envs[0].action_vocab))
+        actions = np.array([rng.choice(np.flatnonzero(row)) for row in masks])
+        obs, rewards, dones, infos = vec_env.step(actions)
+        assert rewards.shape == (3,) and dones.shape == (3,)
+        for idx, info in enumerate(infos):
+            if dones[idx]:
+                finished += 1
+                assert "terminal_observation" in info
+            assert (masks[idx] == vec_env.envs[idx].action_masks()).all()
+            assert sorted(obs["life"][idx].tolist()) == sorted(
+                float(player.life) for player in vec_env.envs[idx].state.players
+            )
+    assert finished >= 3
+
+
+def test_vec_env_batches_flat_observations():
+    import numpy as np
+
+    from fabgame.rl import FabgameVecEnv
+    from fabgame.rl.encoding import encode_flat_observation
+
+    vec_env = FabgameVecEnv(2, seed=3, flat_observation=True, max_episode_steps=10)
+    obs = vec_env.reset()
+    size = vec_env.envs[0].observation_layout.size
+    assert obs.shape == (2, size)
+
+    for _ in range(25):
+        actions = np.array([np.flatnonzero(row)[0] for row in vec_env.action_masks()])
+        obs, _, dones, infos = vec_env.step(actions)
+        for idx, info in enumerate(infos):
+            env = vec_env.envs[idx]
+            assert np.array_equal(obs[idx], encode_flat_observation(env.state, config=env.encoder_config))
+            if dones[idx]:
+                assert info["terminal_observation"].shape == (size,)
+                assert not np.shares_memory(info["terminal_observation"], obs)
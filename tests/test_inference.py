@@ -0,0 +1,200 @@
+"""Tests for the batched inference server (fabgame.inference)."""
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from fabgame.agents import MLAgent  # noqa: E402
+from fabgame.agents_ml import PolicyNetwork, TorchPolicy  # noqa: E402
+from fabgame.engine import enumerate_legal_actions  # noqa: E402
+from fabgame.inference import InferenceServer  # noqa: E402
+from fabgame.rl import ACTION_VOCAB, FabgameEnv  # noqa: E402
+
+
+@pytest.fixture
+def policy():
+    torch.manual_seed(0)
+    env = FabgameEnv(flat_observation=True)
+    network = PolicyNetwork(env.observation_layout.size, len(ACTION_VOCAB), hidden=32)
+    network.eval()
+    return TorchPolicy(network=network, device=torch.device("cpu"))
+
+
+def _requests(count):
+    requests = []
+    for seed in range(count):
+        env = FabgameEnv(seed=seed, flat_observation=True)
+        obs, info = env.reset(seed=seed)
+        requests.append((obs, info["legal_action_mask"]))
+    return requests
+
+
+class TestInferenceServer:
+    def test_concurrent_requests_are_batched(self, policy):
+        """
+        Given: A server and many games asking for actions from separate threads
+        When: The requests arrive within the latency bound
+        Then: They share forward passes and get the same actions as direct calls
+        """
+        requests = _requests(12)
+        expected = [policy.select_action(obs, mask) for obs, mask in requests]
+        results = [None] * len(requests)
+        barrier = threading.Barrier(len(requests))
+
+        with InferenceServer(policy, max_batch_size=8, max_latency=0.05) as server:
+
+            def play(idx):
+                barrier.wait()
+                results[idx] = server.select_action(*requests[idx])
+
+            threads = [threading.Thread(target=play, args=(idx,)) for idx in range(len(requests))]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert results == expected
+        assert server.requests == len(requests)
+        assert server.batches < len(requests)
+        for (_obs, mask), action in zip(requests, results):
+            assert mask[action]
+
+    def test_asyncio_requests_and_close(self, policy):
+        requests = _requests(4)
+        server = InferenceServer(policy, max_latency=0.01)
+
+        async def play():
+            return await asyncio.gather(*(server.select_action_async(obs, mask) for obs, mask in requests))
+
+        actions = asyncio.run(play())
+        server.close()
+
+        assert actions == [policy.select_action(obs, mask) for obs, mask in requests]
+        with pytest.raises(RuntimeError):
+            server.submit(*requests[0])
+
+    def test_ml_agent_uses_shared_server(self, policy):
+        env = FabgameEnv(seed=2)
+        env.reset(seed=2)
+        with InferenceServer(policy) as server:
+            agent = MLAgent(policy=server, use_fallback=False, timeout_seconds=5.0)
+            action = agent.choose_action(env.state)
+        assert action in enumerate_legal_actions(env.state)
+
+    def test_policy_errors_resolve_every_future(self):
+        """
+        Given: A policy that returns too few actions, then actions that are not integers
+        When: Requests are served
+        Then: Every caller gets an exception and the worker keeps serving
+        """
+        policy = _ScriptedPolicy()
+        mask = np.array([False, True, True])
+        with InferenceServer(policy) as server:
+            policy.mode = "short"
+            with pytest.raises(RuntimeError):
+                server.submit(None, mask).result(timeout=5)
+            policy.mode = "bad"
+            with pytest.raises(TypeError):
+                server.submit(None, mask).result(timeout=5)
+            policy.mode = "ok"
+            assert server.submit(None, mask).result(timeout=5) == 1
+
+    def test_worker_failure_closes_server_and_fails_queued_requests(self, monkeypatch):
+        server = InferenceServer(_ScriptedPolicy())
+        release = threading.Event()
+
+        def broken_serve(batch):
+            release.wait(5)
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(server, "_serve", broken_serve)
+        mask = np.array([True])
+        first = server.submit(None, mask)
+        queued = server.submit(None, mask)
+        release.set()
+
+        for future in (first, queued):
+            with pytest.raises(RuntimeError):
+                future.result(timeout=5)
+        with pytest.raises(RuntimeError):
+            server.submit(None, mask)
+
+
+class _ScriptedPolicy:
+    mode = "ok"
+
+    def select_actions(self, observations, masks, deterministic=True):
+        actions = masks.argmax(axis=1)
+        if self.mode == "short":
+            return actions[:-1]
+        if self.mode == "bad":
+            return [object()] * len(actions)
+        return actions
+
+
+@pytest.fixture
+def registry(monkeypatch, policy):
+    from fabgame import agents_ml
+
+    loads = []
+    registry = agents_ml.PolicyRegistry(max_entries=2)
+    monkeypatch.setattr(agents_ml, "POLICY_REGISTRY", registry)
+    monkeypatch.setattr(agents_ml, "load_policy", lambda path, device="cpu": loads.append(path) or policy)
+    registry.loads = loads
+    return registry
+
+
+def test_default_policy_is_loaded_once(monkeypatch, tmp_path, registry):
+    from fabgame import agents_ml
+
+    checkpoint = tmp_path / "test.pt"
+    checkpoint.write_bytes(b"weights")
+    monkeypatch.setattr(agents_ml, "_default_policy_path", lambda: str(checkpoint))
+
+    env = FabgameEnv(seed=4)
+    env.reset(seed=4)
+    for _ in range(3):
+        agents_ml.ml_bot_choose_action(env.state, timeout_seconds=5.0)
+    MLAgent(policy_path=checkpoint, use_fallback=False).choose_action(env.state)
+    assert registry.loads == [str(checkpoint)]
+
+
+class TestPolicyRegistry:
+    """Tests for the shared path+mtime policy cache."""
+
+    def test_reloads_changed_files_and_evicts_least_recent(self, tmp_path, registry):
+        """
+        Given: A registry holding at most two policies
+        When: Checkpoints are rewritten and a third path is loaded
+        Then: Changed files are reloaded and the least recently used entry is dropped
+        """
+        paths = [tmp_path / f"p{index}.pt" for index in range(3)]
+        for path in paths:
+            path.write_bytes(b"v1")
+        a, b, c = (str(path) for path in paths)
+
+        assert registry.get(a) is registry.get(a)
+        assert registry.loads == [a]
+
+        paths[0].write_bytes(b"v2-longer")
+        registry.get(a)
+        assert registry.loads == [a, a]
+
+        registry.get(b)
+        registry.get(a)
+        registry.get(c)  # evicts b, the least recently used
+        assert len(registry) == 2
+        registry.get(a)
+        registry.get(b)
+        assert registry.loads == [a, a, b, c, b]
+
+    def test_missing_file_is_not_loaded(self, tmp_path, registry):
+        assert registry.get(str(tmp_path / "missing.pt")) is None
+        assert registry.loads == [] and len(registry) == 0
+        with pytest.raises(ValueError):
+            registry.get(str(tmp_path / "missing.pt"), kind="onnx")
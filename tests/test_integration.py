@@ -1,6 +1,9 @@
 """Integration tests for end-to-end game scenarios."""
 from __future__ import annotations
 
+import subprocess
+import sys
+
 import pytest
 
 from fabgame.engine import apply_action, enumerate_legal_actions
@@ -433,3 +436,24 @@ class TestComplexScenarios:
         legal = enumerate_legal_actions(state1)
         action_types = {act.typ for act in legal}
         assert ActType.PLAY_ARSENAL_ATTACK in action_types
+
+
+class TestPackageImports:
+    """Importing the engine must not pull in the UI, agent or RL stacks."""
+
+    def test_engine_import_is_lazy(self):
+        """
+        Given: A fresh interpreter
+        When: fabgame is imported and a game is created
+        Then: UI, agents, RL and torch stay unloaded until accessed
+        """
+        code = (
+            "import sys, fabgame\n"
+            "fabgame.new_game(seed=1)\n"
+            "heavy = ('fabgame.ui', 'fabgame.agents', 'fabgame.rl', 'fabgame.legacy_agents', 'torch')\n"
+            "print(sorted(name for name in heavy if name in sys.modules))\n"
+            "from fabgame.agents import bot_choose_action\n"
+            "print('fabgame.legacy_agents' in sys.modules)\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert result.stdout.split() == ["[]", "True"]
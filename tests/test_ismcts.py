@@ -0,0 +1,123 @@
+"""Tests for the information-set MCTS agent (fabgame.agents.ismcts)."""
+from __future__ import annotations
+
+import random
+from collections import Counter
+
+import pytest
+
+from fabgame.agents import HeuristicAgent, ISMCTSAgent, ParallelISMCTSAgent
+from fabgame.agents.ismcts import determinize
+from fabgame.compact_state import CompactLayout
+from fabgame.engine import apply_action, current_actor_index, enumerate_legal_actions, new_game
+from fabgame.exceptions import AgentError
+from fabgame.models import Card
+
+
+def _names(cards):
+    return Counter(card.name for card in cards)
+
+
+def _decision_state(seed):
+    state = new_game(seed=seed).state
+    while len(enumerate_legal_actions(state)) < 2:
+        state, _, _ = apply_action(state, enumerate_legal_actions(state)[0])
+    return state
+
+
+class TestISMCTSAgent:
+    """Tests for determinization, search budgets and tree reuse."""
+
+    def test_determinize_resamples_only_hidden_cards(self):
+        """
+        Given: A game state seen by player 0
+        When: It is determinized
+        Then: Visible zones are untouched and the opponent's unseen cards are re-dealt
+        """
+        state = new_game(seed=1).state
+        sample = determinize(state, 0, random.Random(0))
+        own, opponent = state.players
+        own_sample, opponent_sample = sample.players
+
+        assert own_sample.hand == own.hand
+        assert _names(own_sample.deck) == _names(own.deck)
+        assert len(opponent_sample.hand) == len(opponent.hand)
+        assert _names(opponent_sample.hand + opponent_sample.deck) == _names(opponent.hand + opponent.deck)
+        assert opponent_sample.hand + opponent_sample.deck != opponent.hand + opponent.deck
+        assert state.players[1] is opponent and opponent.hand is not opponent_sample.hand
+
+    def test_search_returns_legal_action_and_reuses_subtree(self):
+        """
+        Given: An agent with a fixed iteration budget playing against the heuristic bot
+        When: It makes several decisions in one game
+        Then: Every action is legal, the budget is respected and later searches start from the kept subtree
+        """
+        agent = ISMCTSAgent(iterations=60, seed=3)
+        opponent = HeuristicAgent(seed=3)
+        state = new_game(seed=3).state
+        searches = []
+        for _ in range(150):
+            if current_actor_index(state) == 0:
+                action = agent.choose_action(state)
+                assert action in enumerate_legal_actions(state)
+                searches.append((agent.last_iterations, agent.last_reused))
+            else:
+                action = opponent.choose_action(state)
+            state, done, _ = apply_action(state, action)
+            if done:
+                break
+        assert {iterations for iterations, _ in searches} <= {0, 60}
+        assert any(reused for _, reused in searches)
+
+    def test_rollout_policies_are_pluggable(self):
+        state = new_game(seed=5).state
+        for policy in ("heuristic", HeuristicAgent(seed=1)):
+            agent = ISMCTSAgent(iterations=10, rollout_policy=policy, rollout_depth=10, seed=5)
+            assert agent.choose_action(state) in enumerate_legal_actions(state)
+
+        timed = ISMCTSAgent(iterations=None, time_limit=0.01, seed=5)
+        assert timed.choose_action(state) in enumerate_legal_actions(state)
+
+        with pytest.raises(ValueError):
+            ISMCTSAgent(rollout_policy="alphabeta")
+        with pytest.raises(ValueError):
+            ISMCTSAgent(iterations=None)
+
+
+class TestParallelISMCTSAgent:
+    """Tests for root-parallel search in worker processes."""
+
+    def test_workers_merge_root_visits(self):
+        """
+        Given: Two workers with a fixed per-worker iteration budget
+        When: A state holding a card interned after the pool started is searched
+        Then: Both searches are merged and the chosen action is legal
+        """
+        state = _decision_state(7)
+        with ParallelISMCTSAgent(workers=2, iterations=15, timeout_seconds=30.0, seed=7) as agent:
+            actor = state.players[current_actor_index(state)]
+            actor.hand.append(Card(name="Parallel Search Strike", cost=0, attack=3, defense=2, pitch=1))
+            action = agent.choose_action(state)
+
+        assert action in enumerate_legal_actions(state)
+        assert agent.last_results == 2
+        assert sum(agent.last_visits.values()) == 30
+        assert agent.last_visits[action] == max(agent.last_visits.values())
+
+    def test_deadline_falls_back_or_raises(self):
+        state = _decision_state(8)
+        with ParallelISMCTSAgent(workers=1, timeout_seconds=1e-6) as agent:
+            assert agent.choose_action(state) in enumerate_legal_actions(state)
+            assert agent.last_results == 0
+            agent.use_fallback = False
+            with pytest.raises(AgentError):
+                agent.choose_action(state)
+
+    def test_unpackable_state_falls_back_without_workers(self):
+        state = _decision_state(9)
+        agent = ParallelISMCTSAgent(workers=1, layout=CompactLayout(deck_capacity=1))
+        assert agent.choose_action(state) in enumerate_legal_actions(state)
+        assert agent._pool is None
+        agent.use_fallback = False
+        with pytest.raises(AgentError):
+            agent.choose_action(state)
@@ -0,0 +1,54 @@
+"""Tests for the rules engine helpers (fabgame.rules.abilities)."""
+from __future__ import annotations
+
+import pytest
+
+from fabgame.models import Card
+from fabgame.rules import abilities
+from tests.conftest import create_test_game
+
+
+class TestCardModifierRules:
+    """Tests for memoized on-declare card modifiers."""
+
+    def test_card_yaml_read_once_per_printing(self, monkeypatch):
+        calls = []
+
+        def fake_load(name, color):
+            calls.append((name, color))
+            return {"modifiers": {"on_declare": [{"when": "is_first_attack", "add_attack": 2}]}}
+
+        monkeypatch.setattr(abilities, "load_card_from_yaml", fake_load)
+        abilities.card_on_declare_rules.cache_clear()
+        try:
+            gs = create_test_game()
+            card = Card(name="Modified Strike", cost=0, attack=3, defense=2, pitch=1)
+            for _ in range(5):
+                value = abilities.apply_on_declare_attack_modifiers(gs, card.attack, source_card=card, is_weapon=False)
+                assert value == 5
+        finally:
+            abilities.card_on_declare_rules.cache_clear()
+
+        assert calls == [("Modified Strike", "red")]
+
+
+class TestConditionEvaluation:
+    """Tests for compiled condition expressions."""
+
+    def test_condition_compiled_once(self):
+        abilities.compile_condition.cache_clear()
+        for attacks in range(4):
+            ctx = {"attacks_this_turn": attacks, "is_weapon": False}
+            assert abilities.safe_eval_cond("attacks_this_turn >= 2 and not is_weapon", ctx) == (attacks >= 2)
+        info = abilities.compile_condition.cache_info()
+        assert info.misses == 1
+        assert info.hits == 3
+
+    def test_disallowed_node_rejected(self):
+        with pytest.raises(ValueError):
+            abilities.safe_eval_cond("__import__('os')", {})
+
+    def test_unknown_name_rejected_per_context(self):
+        assert abilities.safe_eval_cond("card_name == 'Strike'", {"card_name": "Strike"})
+        with pytest.raises(NameError):
+            abilities.safe_eval_cond("card_name == 'Strike'", {})
@@ -0,0 +1,105 @@
+"""Tests for Zobrist-style state hashing and the transposition table."""
+from __future__ import annotations
+
+import random
+
+from fabgame.agents import ISMCTSAgent
+from fabgame.agents.ismcts import determinize
+from fabgame.engine import apply_action_inplace, enumerate_legal_actions, new_game
+from fabgame.state_hash import MASK, StateHasher, TranspositionTable, state_hash, update_state_hash, view_hasher
+
+
+class TestStateHash:
+    """Tests for full and incremental state hashes."""
+
+    def test_incremental_hash_matches_full_hash(self):
+        """
+        Given: Random in-place rollouts
+        When: The hash is updated from each step's undo record
+        Then: It always equals the hash computed from scratch
+        """
+        rng = random.Random(0)
+        hidden = StateHasher(hidden_player=1)
+        for seed in range(3):
+            state = new_game(seed=seed).state
+            key, view_key = state_hash(state), hidden.hash_state(state)
+            for _ in range(200):
+                done, _, undo = apply_action_inplace(state, rng.choice(enumerate_legal_actions(state)))
+                key = update_state_hash(key, state, undo)
+                view_key = hidden.update(view_key, state, undo)
+                assert key == state_hash(state)
+                assert view_key == hidden.hash_state(state)
+                if done:
+                    break
+
+    def test_zone_delta_matches_rehash(self):
+        hasher = StateHasher()
+        deck = new_game(seed=5).state.players[0].deck
+        cases = [
+            (deck, deck[:-1]),
+            (deck, deck + deck[:2]),
+            (deck, deck[:3] + deck[4:]),
+            (deck, deck[::-1]),
+            (deck, list(deck)),
+            ([], deck[:2]),
+        ]
+        for before, after in cases:
+            full = hasher.zone_hash(0, "deck", after) - hasher.zone_hash(0, "deck", before)
+            assert hasher.zone_delta(0, "deck", before, after) & MASK == full & MASK
+        assert hasher.zone_delta(0, "deck", deck, deck[::-1]) == 0
+
+    def test_transpositions_share_a_hash(self):
+        state = new_game(seed=4).state
+        permuted = state.clone()
+        permuted.players[0].hand.reverse()
+        permuted.players[1].grave.extend(permuted.players[1].hand[:2])
+        del permuted.players[1].hand[:2]
+        reordered = permuted.clone()
+        reordered.players[1].grave.reverse()
+
+        assert state_hash(permuted) != state_hash(state)
+        assert state_hash(reordered) == state_hash(permuted)
+        assert state_hash(state.clone()) == state_hash(state)
+        permuted.players[0].life -= 1
+        assert state_hash(permuted) != state_hash(reordered)
+
+    def test_view_hash_ignores_hidden_split(self):
+        """
+        Given: A state and determinizations of it for player 0
+        When: They are hashed with player 0's view hasher
+        Then: They share one hash, while the full hash tells them apart
+        """
+        state = new_game(seed=6).state
+        sample = determinize(state, 0, random.Random(1))
+        assert view_hasher(0).hash_state(sample) == view_hasher(0).hash_state(state)
+        assert state_hash(sample) != state_hash(state)
+
+        moved = state.clone()
+        moved.players[1].hand.append(moved.players[1].deck.pop())
+        assert view_hasher(0).hash_state(moved) != view_hasher(0).hash_state(state)
+
+
+class TestTranspositionTable:
+    """Tests for the bounded transposition table."""
+
+    def test_replacement_prefers_current_well_visited_entries(self):
+        table = TranspositionTable(capacity=1)
+        assert table.add(1, 1.5, visits=3).mean == 0.5
+        assert table.add(2, 1.0) is None  # same slot, fewer visits in the same search
+        assert table.probe(2) is None and table.probe(1).visits == 3
+
+        table.new_search()
+        assert table.add(2, 1.0).visits == 1
+        assert table.probe(1) is None
+        assert (table.hits, table.misses, table.replacements, len(table)) == (1, 2, 1, 1)
+
+    def test_search_agent_shares_table(self):
+        state = new_game(seed=2).state
+        while len(enumerate_legal_actions(state)) < 2:
+            apply_action_inplace(state, enumerate_legal_actions(state)[0])
+        table = TranspositionTable()
+        agents = [ISMCTSAgent(iterations=40, transposition_table=table, seed=seed) for seed in range(2)]
+
+        for agent in agents:
+            assert agent.choose_action(state) in enumerate_legal_actions(state)
+        assert len(table) > 0 and table.hits + table.misses == 80
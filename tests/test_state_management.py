@@ -1,9 +1,12 @@
 """Tests for state field management (COMBAT_FLOW.md: Key State Fields)."""
 from __future__ import annotations
 
+import random
+
 import pytest
 
-from fabgame.engine import apply_action, enumerate_legal_actions
+from fabgame.action_execution import ZONE_NAMES
+from fabgame.engine import apply_action, apply_action_inplace, enumerate_legal_actions, new_game, undo_action
 from fabgame.models import Action, ActType, Card, CombatStep, Phase
 from tests.conftest import create_test_game
 
@@ -459,3 +462,123 @@ class TestLastAttackTracking:
 
         # Attack counter should increment
         assert final_state.players[0].attacks_this_turn >= initial_attacks + 1
+
+
+class TestStateCloning:
+    """Tests for the structural-sharing clone used by apply_action."""
+
+    def test_clone_shares_cards_but_not_zones(self, simple_weapon):
+        """
+        Given: A game state with cards in hand and a weapon
+        When: Cloning the state
+        Then: Cards are shared, zone lists and mutable fields are independent
+        """
+        gs = create_test_game(phase=Phase.ACTION, turn=0, action_points=1, player0_weapon=simple_weapon)
+        gs.players[0].hand = [Card(name="Attack", cost=0, attack=5, defense=3, pitch=1)]
+
+        clone = gs.clone()
+
+        assert clone.players[0].hand[0] is gs.players[0].hand[0]
+        assert clone.players[0].hand is not gs.players[0].hand
+        assert clone.floating_resources is not gs.floating_resources
+        assert clone.reaction_arsenal_cards is not gs.reaction_arsenal_cards
+
+        clone.players[0].weapon.used_this_turn = True
+        clone.players[0].hand.pop()
+        clone.floating_resources[0] = 3
+        clone.players[1].life -= 5
+
+        assert gs.players[0].weapon.used_this_turn is False
+        assert len(gs.players[0].hand) == 1
+        assert gs.floating_resources[0] == 0
+        assert clone.players[1].life == gs.players[1].life - 5
+
+    def test_apply_action_leaves_input_untouched(self):
+        """
+        Given: A state in the action phase
+        When: Applying an attack
+        Then: The original state's zones are unchanged
+        """
+        gs = create_test_game(phase=Phase.ACTION, turn=0, action_points=1)
+        gs.players[0].hand = [Card(name="Attack", cost=0, attack=5, defense=3, pitch=1)]
+
+        new_state, _, _ = apply_action(gs, Action(typ=ActType.PLAY_ATTACK, play_idx=0, pitch_mask=0))
+
+        assert len(gs.players[0].hand) == 1
+        assert gs.players[0].grave == []
+        assert gs.action_points == 1
+        assert new_state.players[0].grave[0] is gs.players[0].hand[0]
+
+
+class TestInPlaceApply:
+    """Tests for apply_action_inplace and its undo record."""
+
+    def test_inplace_matches_apply_and_undo_restores(self):
+        """
+        Given: A random rollout from a new game
+        When: Applying each action in place and undoing it
+        Then: The in-place result matches apply_action and undo restores the state exactly
+        """
+        gs = new_game(seed=5).state
+        rng = random.Random(11)
+        for _ in range(200):
+            legal = enumerate_legal_actions(gs)
+            if not legal:
+                break
+            action = rng.choice(legal)
+            before = gs.copy()
+            expected, expected_done, expected_events = apply_action(gs, action)
+
+            done, events, undo = apply_action_inplace(gs, action)
+            assert gs == expected
+            assert done == expected_done
+            assert events == expected_events
+
+            undo_action(gs, undo)
+            assert gs == before
+
+            gs = expected
+            if done:
+                break
+
+    def test_illegal_inplace_action_leaves_state_unchanged(self):
+        """
+        Given: A state in the action phase
+        When: Applying an out-of-range attack in place
+        Then: An illegal_action event is reported and the state is untouched
+        """
+        gs = create_test_game(phase=Phase.ACTION, turn=0, action_points=1)
+        gs.players[0].hand = [Card(name="Attack", cost=0, attack=5, defense=3, pitch=1)]
+        before = gs.copy()
+
+        _, events, _ = apply_action_inplace(gs, Action(typ=ActType.PLAY_ATTACK, play_idx=3, pitch_mask=0))
+
+        assert events["type"] == "illegal_action"
+        assert gs == before
+
+    def test_undo_record_reports_changes(self):
+        """
+        Given: A random rollout from a new game
+        When: Applying each action in place
+        Then: The reported changes cover every zone, player and field that differs
+        """
+        gs = new_game(seed=9).state
+        rng = random.Random(3)
+        for _ in range(200):
+            legal = enumerate_legal_actions(gs)
+            if not legal:
+                break
+            before = gs.copy()
+            done, _, undo = apply_action_inplace(gs, rng.choice(legal))
+            changes = undo.changes(gs)
+
+            for idx, (old, new) in enumerate(zip(before.players, gs.players)):
+                for zone in ZONE_NAMES:
+                    if getattr(old, zone) != getattr(new, zone):
+                        assert (idx, zone) in changes.zones
+                assert (old.life != new.life) <= (idx in changes.players)
+            for name, value in vars(gs).items():
+                if name != "players":
+                    assert (value != getattr(before, name)) == (name in changes.fields), name
+            if done:
+                break